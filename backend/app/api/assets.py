@@ -11,6 +11,7 @@ from app.models.issue import Issue
 from app.models.user import User  # 추가!
 from app.schemas.asset import AssetCreate, Asset as AssetSchema
 from app.core.security import get_current_user  # 추가!
+from app.core.serialization import ORJSONResponse, RowSerializer, to_date
 
 
 router = APIRouter(prefix="/api/assets", tags=["Assets"])
@@ -19,10 +20,24 @@ router = APIRouter(prefix="/api/assets", tags=["Assets"])
 class BulkDeleteRequest(BaseModel):
     asset_ids: List[int]
 
+# 목록 응답용 직렬화기 (AssetSchema와 같은 모양)
+ASSET_LIST_SERIALIZER = RowSerializer(
+    [
+        Asset.id, Asset.asset_number, Asset.name, Asset.category,
+        Asset.manufacturer, Asset.model, Asset.status, Asset.location,
+        Asset.assigned_to, Asset.purchase_date, Asset.serial_number,
+        Asset.purchase_price, Asset.warranty_end_date,
+        Asset.last_inspection_date, Asset.next_inspection_date,
+        Asset.notes, Asset.created_at, Asset.updated_at
+    ],
+    converters={"purchase_date": to_date}
+)
+
 @router.get("", response_model=List[AssetSchema])
 def get_assets(db: Session = Depends(get_db)):
-    assets = db.query(Asset).all()
-    return assets
+    # ORM 객체/Pydantic 검증 없이 컬럼 조회 → dict → orjson
+    rows = db.query(*ASSET_LIST_SERIALIZER.columns).all()
+    return ORJSONResponse(ASSET_LIST_SERIALIZER.serialize(rows))
 
 
 @router.get("/by-number/{asset_number}", response_model=AssetSchema)  # AssetResponse → AssetSchema
@@ -1,27 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Query
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime, timezone
+from starlette.concurrency import run_in_threadpool
 import os
-import uuid
 from pathlib import Path
 import logging
 
 from app.database import get_db
-from app.models.attachment import Attachment
+from app.models.attachment import Attachment, EntityType
+from app.models.asset import Asset
+from app.models.inspection import InspectionCampaign, InventoryInspection
 from app.models.user import User
-from app.schemas.attachment import Attachment as AttachmentSchema
-from app.core.security import get_current_user
+from app.schemas.attachment import (
+    Attachment as AttachmentSchema, AttachmentFromChecksum,
+    ResumableUploadCreate, ResumableUploadStatus
+)
+from app.core.security import get_current_user, get_current_active_admin
+from app.core.http_cache import IMMUTABLE_CACHE_CONTROL, make_etag, not_modified_response
+from app.core.config import settings
+from app.services.storage import blob_store, StoredFile, UploadTooLarge
+from app.services.resumable_uploads import (
+    resumable_uploads, UploadSession, UploadOffsetMismatch, UploadIncomplete
+)
+from app.services.scheduler import register_job
+from app.services.storage_gc import run_storage_gc
+from app.services.storage_usage import (
+    record_usage, uploader_usage, reconcile_storage_usage, SCOPES, SCOPE_ENTITY
+)
+from app.models.storage_usage import StorageUsage
+from app.services.storage_backends import storage
+from app.services.image_processing import image_processor, MetadataNotStripped
+from app.services.zip_stream import ZipMember, stream_zip, unique_name
+from app.services.thumbnails import (
+    thumbnail_worker, render_thumbnail, remove_thumbnails, is_thumbnailable
+)
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/attachments", tags=["Attachments"])
 
-# 파일 저장 경로 설정
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
-
 # 허용된 파일 확장자
 ALLOWED_EXTENSIONS = {
     'image': ['.jpg', '.jpeg', '.png', '.gif', '.webp'],
@@ -61,6 +82,13 @@ def is_allowed_file(filename: str) -> bool:
             return True
     return False
 
+def find_stored_file(db: Session, checksum: str) -> Optional[Attachment]:
+    """같은 내용(SHA-256)으로 이미 저장된 파일이 있는 첨부파일 행"""
+    for existing in db.query(Attachment).filter(Attachment.checksum == checksum).limit(5):
+        if storage.exists(existing.filepath):
+            return existing
+    return None
+
 @router.post("", response_model=AttachmentSchema)
 async def upload_file(
     entity_type: str,
@@ -69,57 +97,292 @@ async def upload_file(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """파일 업로드"""
-    
-    # 파일 크기 확인
-    file.file.seek(0, 2)
-    file_size = file.file.tell()
-    file.file.seek(0)
-    
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="파일 크기는 10MB를 초과할 수 없습니다.")
+    """파일 업로드 (청크 단위로 받아 내용 해시 기준으로 중복 없이 저장)"""
     
     # 파일 확장자 확인
     if not is_allowed_file(file.filename):
         raise HTTPException(status_code=400, detail="허용되지 않는 파일 형식입니다.")
     
-    # 고유한 파일명 생성 (UUID + 원본 확장자)
-    file_ext = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = UPLOAD_DIR / unique_filename
-    
-    # 파일 저장
+    # 임시 파일로 저장 (크기 제한 확인 + 체크섬 계산을 저장하면서 함께 수행)
     try:
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        stored = await blob_store.receive(file, MAX_FILE_SIZE)
+    except UploadTooLarge:
+        raise HTTPException(status_code=400, detail="파일 크기는 10MB를 초과할 수 없습니다.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 저장 실패: {str(e)}")
     
-    # 데이터베이스에 기록
-    db_attachment = Attachment(
-        entity_type=entity_type,
-        entity_id=entity_id,
-        filename=file.filename,
-        filepath=str(file_path),
-        filesize=file_size,
-        content_type=get_content_type(file.filename),
-        uploaded_by=current_user.username
+    # 사진은 회전 반영/메타데이터 제거/해상도 제한 후 다시 인코딩
+    try:
+        stored, filename = await image_processor.normalize(stored, file.filename)
+    except MetadataNotStripped:
+        raise HTTPException(status_code=500, detail="이미지 메타데이터를 제거하지 못했습니다.")
+    
+    # 잠금 대기/DB 기록은 이벤트 루프 밖에서
+    return await run_in_threadpool(
+        store_attachment, db, stored, entity_type, entity_id, filename, current_user
     )
+
+def check_quota(db: Session, current_user: User, size: int):
+    """사용자별 업로드 용량 제한 (메모리 값으로 확인, 관리자는 제외)"""
+    quota = settings.STORAGE_QUOTA_PER_USER
+    if not quota or current_user.role == "admin":
+        return
+    if uploader_usage.get(db, current_user.username) + size > quota:
+        raise HTTPException(status_code=400, detail="업로드 용량 한도를 초과했습니다.")
+
+def store_attachment(
+    db: Session,
+    stored: StoredFile,
+    entity_type: str,
+    entity_id: int,
+    filename: str,
+    current_user: User
+) -> Attachment:
+    """받은 임시 파일을 저장소에 배치하고 첨부파일 행 생성 (실패하면 임시 파일 삭제)"""
+    try:
+        check_quota(db, current_user, stored.size)
+    except HTTPException:
+        blob_store.discard(stored)
+        raise
+    
+    # 같은 내용의 파일이 이미 있으면 그 파일을 참조, 없으면 내용 해시 키로 저장
+    existing = find_stored_file(db, stored.sha256)
+    target = existing.filepath if existing else blob_store.blob_key(stored.sha256)
+    
+    try:
+        with blob_store.lock(target):
+            blob_store.place(stored, target)
+            
+            # 데이터베이스에 기록
+            db_attachment = Attachment(
+                entity_type=entity_type,
+                entity_id=entity_id,
+                filename=filename,
+                filepath=target,
+                filesize=stored.size,
+                checksum=stored.sha256,
+                content_type=get_content_type(filename),
+                uploaded_by=current_user.username
+            )
+            db.add(db_attachment)
+            usage = record_usage(db, [(entity_type, entity_id, current_user.username, stored.size, 1)])
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        blob_store.discard(stored)
+        raise HTTPException(status_code=500, detail=f"파일 저장 실패: {str(e)}")
+    
+    uploader_usage.apply(usage)
+    
+    # 이미지면 썸네일은 백그라운드에서 생성
+    if is_thumbnailable(filename):
+        thumbnail_worker.submit(target)
     
-    db.add(db_attachment)
-    db.commit()
     db.refresh(db_attachment)
+    return db_attachment
+
+def get_upload_session(upload_id: str, current_user: User) -> UploadSession:
+    session = resumable_uploads.get(upload_id)
+    if not session or session.uploaded_by != current_user.username:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+    return session
+
+def upload_status(session: UploadSession, offset: int = None) -> ResumableUploadStatus:
+    return ResumableUploadStatus(
+        upload_id=session.upload_id,
+        filename=session.filename,
+        size=session.size,
+        offset=session.offset if offset is None else offset,
+        expires_at=datetime.fromtimestamp(resumable_uploads.expires_at(session), tz=timezone.utc)
+    )
+
+@router.post("/uploads", response_model=ResumableUploadStatus)
+def create_upload_session(
+    request: ResumableUploadCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    이어받기 업로드 시작
+
+    이후 PATCH /uploads/{upload_id}?offset=N 으로 조각(요청 본문 그대로)을 보내고,
+    끊기면 GET /uploads/{upload_id} 의 offset부터 다시 보낸 뒤 POST .../complete 로 완료한다.
+    """
+    if not is_allowed_file(request.filename):
+        raise HTTPException(status_code=400, detail="허용되지 않는 파일 형식입니다.")
+    if request.size <= 0 or request.size > MAX_FILE_SIZE:
+        raise HTTPException(status_code=400, detail="파일 크기는 10MB를 초과할 수 없습니다.")
+    check_quota(db, current_user, request.size)
+    
+    session = resumable_uploads.create(
+        request.entity_type, request.entity_id, request.filename, request.size, current_user.username
+    )
+    return upload_status(session)
+
+@router.get("/uploads/{upload_id}", response_model=ResumableUploadStatus)
+def get_upload_progress(
+    upload_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """이어받기 업로드 진행 상황 (받은 바이트 수 = offset)"""
+    return upload_status(get_upload_session(upload_id, current_user))
+
+@router.patch("/uploads/{upload_id}", response_model=ResumableUploadStatus)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    조각 전송 (요청 본문 = offset 위치부터의 바이트)
+
+    offset이 서버가 받은 크기와 다르면 409와 함께 현재 offset을 돌려준다.
+    """
+    session = get_upload_session(upload_id, current_user)
+    try:
+        new_offset = await resumable_uploads.write_chunk(session, offset, request.stream())
+    except UploadOffsetMismatch as e:
+        raise HTTPException(
+            status_code=409,
+            detail=f"offset이 맞지 않습니다. {e.offset}부터 보내주세요.",
+            headers={"Upload-Offset": str(e.offset)}
+        )
+    except UploadTooLarge:
+        raise HTTPException(status_code=400, detail="선언한 파일 크기를 초과했습니다.")
     
+    return upload_status(session, new_offset)
+
+@router.post("/uploads/{upload_id}/complete", response_model=AttachmentSchema)
+async def complete_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """이어받기 업로드 완료 → 첨부파일 생성"""
+    session = get_upload_session(upload_id, current_user)
+    try:
+        stored = await run_in_threadpool(resumable_uploads.finish, session, blob_store.temp_path())
+    except UploadIncomplete:
+        raise HTTPException(status_code=409, detail="아직 모든 조각을 받지 못했습니다.")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="업로드 세션을 찾을 수 없습니다.")
+    
+    try:
+        stored, filename = await image_processor.normalize(stored, session.filename)
+    except MetadataNotStripped:
+        raise HTTPException(status_code=500, detail="이미지 메타데이터를 제거하지 못했습니다.")
+    return await run_in_threadpool(
+        store_attachment, db, stored, session.entity_type, session.entity_id, filename, current_user
+    )
+
+@router.delete("/uploads/{upload_id}")
+def abort_upload(
+    upload_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """이어받기 업로드 취소"""
+    resumable_uploads.abort(get_upload_session(upload_id, current_user))
+    return {"message": "업로드가 취소되었습니다."}
+
+@router.post("/by-checksum", response_model=AttachmentSchema)
+def attach_by_checksum(
+    request: AttachmentFromChecksum,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    이미 저장된 파일을 업로드 없이 첨부 (SHA-256 일치)
+
+    클라이언트가 먼저 호출해 보고 404면 일반 업로드로 진행한다.
+    """
+    if not is_allowed_file(request.filename):
+        raise HTTPException(status_code=400, detail="허용되지 않는 파일 형식입니다.")
+    
+    existing = find_stored_file(db, request.checksum.lower())
+    if not existing:
+        raise HTTPException(status_code=404, detail="같은 내용의 파일이 없습니다.")
+    check_quota(db, current_user, existing.filesize)
+    
+    target = existing.filepath
+    with blob_store.lock(target):
+        if not storage.exists(target):
+            raise HTTPException(status_code=404, detail="같은 내용의 파일이 없습니다.")
+        db_attachment = Attachment(
+            entity_type=request.entity_type,
+            entity_id=request.entity_id,
+            filename=request.filename,
+            filepath=existing.filepath,
+            filesize=existing.filesize,
+            checksum=existing.checksum,
+            content_type=get_content_type(request.filename),
+            uploaded_by=current_user.username
+        )
+        db.add(db_attachment)
+        usage = record_usage(
+            db, [(request.entity_type, request.entity_id, current_user.username, existing.filesize, 1)]
+        )
+        db.commit()
+    
+    uploader_usage.apply(usage)
+    db.refresh(db_attachment)
     return db_attachment
 
 
+@router.post("/gc")
+def collect_garbage(
+    dry_run: bool = Query(True, description="true면 삭제하지 않고 회수 가능한 크기만 집계"),
+    delete_missing_files: bool = Query(
+        False, description="true면 파일이 없는 첨부파일 행도 삭제 (저장소 설정을 확인한 뒤에만)"
+    ),
+    current_user: User = Depends(get_current_active_admin)
+):
+    """저장소 정리: 끊어진 첨부파일 행과 고아 파일 (관리자)"""
+    return run_storage_gc(dry_run=dry_run, delete_missing_files=delete_missing_files).to_dict()
+
+@router.get("/usage")
+def get_storage_usage(
+    scope: str = Query(SCOPE_ENTITY, description="entity(자산/장애별) 또는 uploader(사용자별)"),
+    order_by: str = "bytes",
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_admin)
+):
+    """첨부파일 사용량 상위 N (관리자)"""
+    if scope not in SCOPES:
+        raise HTTPException(status_code=400, detail="scope는 entity 또는 uploader 입니다.")
+    if order_by not in ("bytes", "files"):
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 정렬 기준입니다: {order_by}")
+    
+    order_column = StorageUsage.bytes if order_by == "bytes" else StorageUsage.files
+    rows = db.query(StorageUsage.owner, StorageUsage.bytes, StorageUsage.files).filter(
+        StorageUsage.scope == scope,
+        StorageUsage.files > 0
+    ).order_by(order_column.desc()).limit(limit).all()
+    
+    result = []
+    for owner, size, files in rows:
+        item = {"bytes": size, "files": files}
+        if scope == SCOPE_ENTITY:
+            entity_type, _, entity_id = owner.partition(":")
+            item.update(entity_type=entity_type, entity_id=int(entity_id))
+        else:
+            item.update(uploaded_by=owner, quota=settings.STORAGE_QUOTA_PER_USER or None)
+        result.append(item)
+    return result
+
 @router.get("/download/{attachment_id}")
 def download_file(
     attachment_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    """파일 다운로드"""
+    """
+    파일 다운로드
+
+    파일을 메모리에 올리지 않고 스트리밍 (서버가 지원하면 sendfile).
+    Range 요청(부분 다운로드/이어받기)과 If-None-Match(304)를 지원한다.
+    """
     
     attachment = db.query(Attachment).filter(Attachment.id == attachment_id).first()
     
@@ -127,21 +390,132 @@ def download_file(
         raise HTTPException(status_code=404, detail="첨부파일을 찾을 수 없습니다.")
     
     # 절대 경로로 변환
-    file_path = Path(attachment.filepath)
+    file_path = storage.local_path(attachment.filepath)
     if not file_path.is_absolute():
         file_path = Path.cwd() / file_path
     
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="파일이 존재하지 않습니다.")
     
-    # 파일을 바이너리로 읽기
-    with open(file_path, "rb") as f:
-        file_data = f.read()
+    # 첨부파일 내용은 바뀌지 않으므로 오래 캐시 (로그인 사용자 전용이라 private)
+    headers = {"Cache-Control": f"private, {IMMUTABLE_CACHE_CONTROL}"}
+    if attachment.checksum:
+        etag = make_etag(attachment.checksum)
+        headers["ETag"] = etag
+        not_modified = not_modified_response(request, etag, headers)
+        if not_modified:
+            return not_modified
     
-    # 단순하게 파일 데이터만 반환 (프론트엔드에서 파일명 처리)
-    return Response(
-        content=file_data,
-        media_type=attachment.content_type
+    # 파일명은 프론트엔드에서 처리 (Content-Disposition 없음)
+    # checksum이 없는 예전 파일은 FileResponse 기본 ETag(수정시각+크기) 사용
+    return FileResponse(
+        file_path,
+        media_type=attachment.content_type,
+        headers=headers
+    )
+
+@router.get("/thumbnail/{attachment_id}")
+def get_thumbnail(
+    attachment_id: int,
+    request: Request,
+    size: Optional[int] = Query(None, ge=1, description="긴 변 픽셀 (가장 가까운 준비된 크기로 맞춤)"),
+    db: Session = Depends(get_db)
+):
+    """
+    이미지 첨부파일 썸네일
+
+    업로드 때 백그라운드에서 만들어 둔 파일을 보내고, 아직 없으면 이 자리에서 만든다.
+    """
+    attachment = db.query(Attachment).filter(Attachment.id == attachment_id).first()
+    
+    if not attachment:
+        raise HTTPException(status_code=404, detail="첨부파일을 찾을 수 없습니다.")
+    if not is_thumbnailable(attachment.filename):
+        raise HTTPException(status_code=400, detail="이미지 파일만 썸네일을 제공합니다.")
+    
+    # 요청 크기 이상인 것 중 가장 작은 크기 (없으면 가장 큰 크기)
+    sizes = sorted(settings.THUMBNAIL_SIZES)
+    if size is None:
+        size = sizes[0]
+    else:
+        size = next((s for s in sizes if s >= size), sizes[-1])
+    
+    headers = {"Cache-Control": f"private, {IMMUTABLE_CACHE_CONTROL}"}
+    if attachment.checksum:
+        etag = make_etag(f"{attachment.checksum}-{size}")
+        headers["ETag"] = etag
+        not_modified = not_modified_response(request, etag, headers)
+        if not_modified:
+            return not_modified
+    
+    if not storage.exists(attachment.filepath):
+        raise HTTPException(status_code=404, detail="파일이 존재하지 않습니다.")
+    
+    try:
+        thumbnail = render_thumbnail(attachment.filepath, size)
+    except Exception as e:
+        logger.error(f"썸네일 생성 실패 ({attachment_id}): {e}")
+        raise HTTPException(status_code=500, detail="썸네일을 만들 수 없습니다.")
+    
+    return FileResponse(thumbnail, media_type="image/jpeg", headers=headers)
+
+def zip_response(rows, archive_name: str) -> StreamingResponse:
+    """(폴더, 파일명, ref) 목록을 ZIP으로 스트리밍"""
+    def members():
+        used = set()
+        for folder, filename, ref in rows:
+            filename = filename.replace("/", "_").replace("\\", "_")
+            name = f"{folder}/{filename}" if folder else filename
+            yield ZipMember(unique_name(name, used), path=storage.local_path(ref))
+    
+    return StreamingResponse(
+        stream_zip(members()),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{archive_name}"'}
+    )
+
+@router.get("/zip/campaigns/{campaign_id}")
+def download_campaign_zip(
+    campaign_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """실사 캠페인에서 점검한 자산들의 첨부파일 전체를 ZIP으로 (자산번호별 폴더)"""
+    campaign = db.query(InspectionCampaign.id).filter(InspectionCampaign.id == campaign_id).first()
+    if not campaign:
+        raise HTTPException(status_code=404, detail="캠페인을 찾을 수 없습니다.")
+    
+    inspected_assets = db.query(InventoryInspection.asset_id).filter(
+        InventoryInspection.campaign_id == campaign_id
+    ).distinct()
+    rows = db.query(Asset.asset_number, Attachment.filename, Attachment.filepath).join(
+        Asset, Asset.id == Attachment.entity_id
+    ).filter(
+        Attachment.entity_type == EntityType.asset,
+        Attachment.entity_id.in_(inspected_assets)
+    ).order_by(Asset.asset_number, Attachment.id).all()
+    
+    return zip_response(rows, f"campaign-{campaign_id}-attachments.zip")
+
+@router.get("/zip/{entity_type}/{entity_id}")
+def download_entity_zip(
+    entity_type: EntityType,
+    entity_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """특정 자산 또는 장애의 첨부파일 전체를 ZIP으로"""
+    rows = db.query(Attachment.filename, Attachment.filepath).filter(
+        Attachment.entity_type == entity_type,
+        Attachment.entity_id == entity_id
+    ).order_by(Attachment.id).all()
+    
+    if not rows:
+        raise HTTPException(status_code=404, detail="첨부파일이 없습니다.")
+    
+    return zip_response(
+        [(None, filename, ref) for filename, ref in rows],
+        f"{entity_type.value}-{entity_id}-attachments.zip"
     )
 
 @router.get("/{entity_type}/{entity_id}", response_model=List[AttachmentSchema])
@@ -175,16 +549,45 @@ def delete_attachment(
     if current_user.role != "admin" and attachment.uploaded_by != current_user.username:
         raise HTTPException(status_code=403, detail="삭제 권한이 없습니다.")
     
-    # 실제 파일 삭제
-    file_path = Path(attachment.filepath)
-    if file_path.exists():
-        try:
-            os.remove(file_path)
-        except Exception as e:
-            logger.error(f"파일 삭제 실패: {e}")
-    
-    # 데이터베이스에서 삭제
-    db.delete(attachment)
-    db.commit()
+    # 데이터베이스에서 삭제 후, 같은 파일을 참조하는 행이 더 없으면 실제 파일 삭제
+    ref = attachment.filepath
+    with blob_store.lock(ref):
+        usage = record_usage(db, [(
+            attachment.entity_type, attachment.entity_id, attachment.uploaded_by, -attachment.filesize, -1
+        )])
+        db.delete(attachment)
+        db.commit()
+        uploader_usage.apply(usage)
+        
+        references = db.query(func.count(Attachment.id)).filter(
+            Attachment.filepath == ref
+        ).scalar()
+        if references == 0 and storage.exists(ref):
+            try:
+                blob_store.remove(ref)
+                remove_thumbnails(ref)
+            except Exception as e:
+                logger.error(f"파일 삭제 실패: {e}")
     
-    return {"message": "첨부파일이 삭제되었습니다."}
\ No newline at end of file
+    return {"message": "첨부파일이 삭제되었습니다."}
+
+# 오래 활동이 없는 이어받기 업로드 세션 정리
+register_job(
+    "resumable-upload-janitor",
+    settings.UPLOAD_JANITOR_INTERVAL,
+    resumable_uploads.expire
+)
+
+# 끊어진 첨부파일 행/고아 파일 정리
+register_job(
+    "storage-gc",
+    settings.STORAGE_GC_INTERVAL,
+    run_storage_gc
+)
+
+# 사용량 집계 재계산 (동시 갱신/다른 프로세스 값 보정)
+register_job(
+    "storage-usage-reconcile",
+    settings.STORAGE_USAGE_RECONCILE_INTERVAL,
+    reconcile_storage_usage
+)
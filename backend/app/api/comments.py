@@ -1,32 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Dict, List, Optional
+from datetime import datetime
 from app.database import get_db
 from app.models.comment import Comment
 from app.schemas.comment import CommentCreate, CommentResponse, CommentUpdate
 from app.core.security import get_current_user
 from app.models.user import User
-from app.api.notifications import create_notification  # 알림 함수 import
+from app.core.unit_of_work import UnitOfWork, get_uow
+from app.core.serialization import ORJSONResponse, RowSerializer
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, keyset_after, next_cursor
 
 router = APIRouter(prefix="/api/comments", tags=["Comments"])
 
-# 특정 대상의 댓글 조회 (자산 또는 장애)
+COMMENT_SERIALIZER = RowSerializer([
+    Comment.id, Comment.content, Comment.author, Comment.author_id,
+    Comment.target_type, Comment.target_id, Comment.created_at, Comment.updated_at
+])
+
+# 한 번에 개수를 조회할 수 있는 최대 대상 수
+MAX_COUNT_IDS = 500
+
+# 여러 대상의 댓글 수 일괄 조회 (목록 화면용)
+@router.get("/counts", response_model=Dict[int, int])
+def get_comment_counts(
+    target_type: str,
+    ids: List[int] = Query(..., description="대상 ID 목록 (?ids=1&ids=2)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if target_type not in ['asset', 'issue']:
+        raise HTTPException(status_code=400, detail="Invalid target type")
+    if len(ids) > MAX_COUNT_IDS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {MAX_COUNT_IDS}개까지 조회할 수 있습니다.")
+    
+    counts = dict(
+        db.query(Comment.target_id, func.count(Comment.id))
+        .filter(Comment.target_type == target_type, Comment.target_id.in_(ids))
+        .group_by(Comment.target_id)
+        .all()
+    )
+    return {target_id: counts.get(target_id, 0) for target_id in ids}
+
+# 특정 대상의 댓글 조회 (자산 또는 장애, 최신순 커서 페이지네이션)
 @router.get("/{target_type}/{target_id}", response_model=List[CommentResponse])
 def get_comments(
     target_type: str,
     target_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     if target_type not in ['asset', 'issue']:
         raise HTTPException(status_code=400, detail="Invalid target type")
     
-    comments = db.query(Comment).filter(
+    query = db.query(*COMMENT_SERIALIZER.columns).filter(
         Comment.target_type == target_type,
         Comment.target_id == target_id
-    ).order_by(Comment.created_at.desc()).all()
+    )
+    
+    # (target_type, target_id, created_at) 인덱스 순서대로 읽고 id로 순서 고정
+    sort_columns = [Comment.created_at, Comment.id]
+    if cursor:
+        query = query.filter(keyset_after(sort_columns, decode_cursor(cursor, [datetime.fromisoformat, int])))
     
-    return comments
+    rows = query.order_by(Comment.created_at.desc(), Comment.id.desc()).limit(limit).all()
+    comments = COMMENT_SERIALIZER.serialize(rows)
+    
+    headers = {}
+    cursor_value = next_cursor(comments, limit, lambda item: [item["created_at"], item["id"]])
+    if cursor_value:
+        headers[NEXT_CURSOR_HEADER] = cursor_value
+    return ORJSONResponse(comments, headers=headers)
 
 # 댓글 작성
 @router.post("/{target_type}/{target_id}", response_model=CommentResponse)
@@ -34,12 +81,13 @@ def create_comment(
     target_type: str,
     target_id: int,
     comment: CommentCreate,
-    db: Session = Depends(get_db),
+    uow: UnitOfWork = Depends(get_uow),
     current_user: User = Depends(get_current_user)
 ):
     if target_type not in ['asset', 'issue']:
         raise HTTPException(status_code=400, detail="Invalid target type")
     
+    db = uow.db
     # 대상이 존재하는지 확인
     if target_type == 'asset':
         from app.models.asset import Asset
@@ -59,17 +107,14 @@ def create_comment(
         target_id=target_id
     )
     
-    db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
+    uow.add(db_comment)
     
-    # 알림 전송
+    # 알림 전송 (댓글과 함께 커밋된 뒤 발송)
     if target_type == 'issue':
         # 장애에 댓글이 달린 경우
         # 신고자에게 알림 (본인 제외)
         if target.reporter and target.reporter != current_user.username:
-            create_notification(
-                db=db,
+            uow.notify(
                 username=target.reporter,
                 title="새로운 댓글이 작성되었습니다",
                 message=f"{current_user.full_name}님이 '{target.title}' 장애에 댓글을 작성했습니다.",
@@ -79,8 +124,7 @@ def create_comment(
         
         # 담당자에게 알림 (본인 제외, 신고자와 다른 경우)
         if target.assignee and target.assignee != current_user.username and target.assignee != target.reporter:
-            create_notification(
-                db=db,
+            uow.notify(
                 username=target.assignee,
                 title="새로운 댓글이 작성되었습니다",
                 message=f"{current_user.full_name}님이 '{target.title}' 장애에 댓글을 작성했습니다.",
@@ -92,8 +136,7 @@ def create_comment(
         # 자산에 댓글이 달린 경우
         # 담당자에게 알림 (본인 제외)
         if target.assigned_to and target.assigned_to != current_user.username:
-            create_notification(
-                db=db,
+            uow.notify(
                 username=target.assigned_to,
                 title="새로운 댓글이 작성되었습니다",
                 message=f"{current_user.full_name}님이 '{target.name}' 자산에 댓글을 작성했습니다.",
@@ -101,6 +144,7 @@ def create_comment(
                 related_id=target_id
             )
     
+    uow.commit(db_comment)
     return db_comment
 
 # 댓글 수정
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.exc import IntegrityError
 from typing import List
 from datetime import datetime, timedelta
 
@@ -13,13 +14,35 @@ from app.schemas.inspection import (
     InventoryInspection as InventoryInspectionSchema,
     InventoryInspectionCreate,
     QRScanRequest,
+    QRScanSyncRequest,
+    QRScanSyncResponse,
     InspectionStats
 )
 from app.core.security import get_current_user
+from app.core.serialization import ORJSONResponse, RowSerializer
 from app.models.user import User
 
 router = APIRouter()
 
+# 실사 목록 응답용 직렬화기 (InventoryInspectionSchema와 같은 모양)
+INSPECTION_LIST_SERIALIZER = RowSerializer(
+    [
+        InventoryInspection.id, InventoryInspection.campaign_id,
+        InventoryInspection.asset_id, InventoryInspection.inspection_date,
+        InventoryInspection.inspector_id, InventoryInspection.inspector_name,
+        InventoryInspection.status, InventoryInspection.actual_location,
+        InventoryInspection.actual_status, InventoryInspection.condition_notes,
+        InventoryInspection.photo_url, InventoryInspection.created_at
+    ],
+    nested={"asset": RowSerializer([
+        Asset.id, Asset.asset_number, Asset.name, Asset.category,
+        Asset.manufacturer, Asset.model, Asset.status, Asset.location,
+        Asset.serial_number, Asset.purchase_price, Asset.purchase_date,
+        Asset.warranty_end_date, Asset.last_inspection_date,
+        Asset.next_inspection_date
+    ])}
+)
+
 # QR 스캔 - 자산 조회
 @router.get("/scan/{asset_number}")
 def scan_asset(
@@ -120,6 +143,165 @@ def record_inspection(
         "inspection": inspection
     }
 
+# 실사 결과 값 (status 컬럼 Enum)
+INSPECTION_STATUSES = set(InventoryInspection.__table__.c.status.type.enums)
+
+def apply_scan_batch(db: Session, scans, current_user: User) -> List[dict]:
+    """
+    단말에 쌓인 스캔을 현재 트랜잭션에 반영하고 요청 순서대로 스캔별 결과 반환 (커밋은 호출한 쪽에서)
+
+    키/자산/캠페인/자산별 최근 실사 시각을 각각 한 번에 조회한 뒤 스캔 시각 순서로 적용한다.
+    판단 규칙은 단건 스캔과 같다. (스캔한 날 이미 실사했으면 다음 실사일이 지난 경우만 가능)
+    """
+    now = datetime.now()
+    inspector_name = current_user.full_name or current_user.username
+    results: List[dict] = [None] * len(scans)
+
+    def scan_time(scan) -> datetime:
+        # 서버와 같은 로컬 시각으로, 단말 시계가 빨라 미래면 지금으로
+        scanned_at = scan.scanned_at
+        if scanned_at.tzinfo is not None:
+            scanned_at = scanned_at.astimezone().replace(tzinfo=None)
+        return min(scanned_at, now)
+
+    times = [scan_time(scan) for scan in scans]
+    numbers = [scan.asset_number.replace("ASSET:", "") for scan in scans]
+
+    recorded = dict(
+        db.query(InventoryInspection.idempotency_key, InventoryInspection.id)
+        .filter(InventoryInspection.idempotency_key.in_({scan.idempotency_key for scan in scans}))
+    )
+    assets = {
+        asset.asset_number: asset
+        for asset in db.query(Asset).filter(Asset.asset_number.in_(set(numbers)))
+    }
+    campaign_ids = {scan.campaign_id for scan in scans if scan.campaign_id is not None}
+    campaigns = {
+        campaign_id for (campaign_id,) in
+        db.query(InspectionCampaign.id).filter(InspectionCampaign.id.in_(campaign_ids))
+    } if campaign_ids else set()
+    latest = dict(
+        db.query(InventoryInspection.asset_id, func.max(InventoryInspection.inspection_date))
+        .filter(InventoryInspection.asset_id.in_([asset.id for asset in assets.values()]))
+        .group_by(InventoryInspection.asset_id)
+    ) if assets else {}
+
+    created = {}  # 이번 요청에서 만든 기록 (같은 키가 요청 안에서 반복될 때)
+    for index in sorted(range(len(scans)), key=lambda i: times[i]):
+        scan, asset_number, inspected_at = scans[index], numbers[index], times[index]
+        result = {"idempotency_key": scan.idempotency_key, "asset_number": asset_number}
+        results[index] = result
+
+        if scan.idempotency_key in recorded or scan.idempotency_key in created:
+            result.update(result="duplicate", inspection_id=recorded.get(scan.idempotency_key))
+            continue
+        asset = assets.get(asset_number)
+        if asset is None:
+            result.update(result="not_found", message="자산을 찾을 수 없습니다")
+            continue
+        if scan.status not in INSPECTION_STATUSES:
+            result.update(result="invalid", message="알 수 없는 실사 결과입니다")
+            continue
+        if scan.campaign_id is not None and scan.campaign_id not in campaigns:
+            result.update(result="invalid", message="캠페인을 찾을 수 없습니다")
+            continue
+
+        scan_day = inspected_at.date()
+        last = latest.get(asset.id)
+        if last and last >= datetime.combine(scan_day, datetime.min.time()):
+            if not (asset.next_inspection_date and scan_day >= asset.next_inspection_date):
+                result.update(result="already_inspected", message="이미 실사 완료된 자산입니다")
+                continue
+
+        inspection = InventoryInspection(
+            campaign_id=scan.campaign_id,
+            asset_id=asset.id,
+            inspection_date=inspected_at,
+            inspector_id=current_user.id,
+            inspector_name=inspector_name,
+            status=scan.status,
+            actual_location=scan.actual_location or asset.location,
+            actual_status=scan.status,
+            condition_notes=scan.condition_notes,
+            idempotency_key=scan.idempotency_key
+        )
+        db.add(inspection)
+        created[scan.idempotency_key] = inspection
+        result.update(result="created")
+        latest[asset.id] = max(last, inspected_at) if last else inspected_at
+
+        # 늦게 올라온 예전 스캔이 최근 실사일을 되돌리지 않도록
+        if asset.last_inspection_date is None or scan_day >= asset.last_inspection_date:
+            asset.last_inspection_date = scan_day
+            asset.next_inspection_date = scan_day + timedelta(days=180)  # 6개월 후
+
+    db.flush()
+    for result in results:
+        inspection = created.get(result["idempotency_key"])
+        if inspection is not None:
+            result["inspection_id"] = inspection.id
+    return results
+
+# 멱등 키 충돌(동시 동기화) 시 다시 시도하는 횟수
+SYNC_MAX_ATTEMPTS = 3
+
+# QR 스캔 - 오프라인 일괄 동기화
+@router.post("/scan/sync", response_model=QRScanSyncResponse)
+def sync_offline_scans(
+    sync_data: QRScanSyncRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    통신이 안 되는 곳에서 쌓아둔 스캔을 한 번에 기록 (트랜잭션 하나)
+
+    같은 idempotency_key는 한 번만 기록되므로 응답을 못 받았으면 그대로 다시 보내면 된다.
+    실패한 스캔이 있어도 나머지는 기록하고 스캔별 결과를 돌려준다.
+    """
+    for attempt in range(SYNC_MAX_ATTEMPTS):
+        try:
+            results = apply_scan_batch(db, sync_data.scans, current_user)
+            db.commit()
+            break
+        except IntegrityError:
+            # 같은 키를 보낸 다른 요청이 먼저 커밋함 → 다시 확인하면 duplicate로 처리된다
+            db.rollback()
+    else:
+        raise HTTPException(status_code=409, detail="다른 동기화 요청과 충돌했습니다. 잠시 후 다시 보내주세요.")
+
+    counts = {"created": 0, "duplicate": 0}
+    for result in results:
+        counts[result["result"]] = counts.get(result["result"], 0) + 1
+    return {
+        "created": counts["created"],
+        "duplicates": counts["duplicate"],
+        "rejected": len(results) - counts["created"] - counts["duplicate"],
+        "results": results
+    }
+
+# 최근 실사 결과 → 통계 항목
+STATUS_STAT_FIELDS = {
+    '정상': "normal_count",
+    '위치불일치': "location_mismatch_count",
+    '상태이상': "status_abnormal_count",
+    '분실': "missing_count",
+}
+
+def latest_inspections(campaign_id: int = None):
+    """자산별 가장 최근 실사 기록 (asset_id, status) 서브쿼리 - campaign_id가 있으면 그 캠페인 안에서"""
+    rank = func.row_number().over(
+        partition_by=InventoryInspection.asset_id,
+        order_by=(InventoryInspection.inspection_date.desc(), InventoryInspection.id.desc())
+    )
+    query = select(InventoryInspection.asset_id, InventoryInspection.status, rank.label("recency"))
+    if campaign_id is not None:
+        query = query.where(InventoryInspection.campaign_id == campaign_id)
+    ranked = query.subquery()
+    return select(ranked.c.asset_id, ranked.c.status).where(ranked.c.recency == 1).subquery()
+
+def count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
 # 실사 통계
 @router.get("/stats", response_model=InspectionStats)
 def get_inspection_stats(
@@ -127,60 +309,44 @@ def get_inspection_stats(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """실사 통계 조회 (다음 점검일 기준)"""
+    """
+    실사 통계 조회 (쿼리 한 번으로 DB에서 집계)
+
+    캠페인 미지정: 다음 점검일이 오늘 이후면 실사 완료, 결과는 자산별 최근 실사 기록 기준
+    캠페인 지정: 그 캠페인에서 실사한 자산이 실사 완료, 결과는 캠페인 안의 최근 실사 기록 기준
+    """
+    if campaign_id is not None:
+        campaign = db.query(InspectionCampaign.id).filter(InspectionCampaign.id == campaign_id).first()
+        if not campaign:
+            raise HTTPException(status_code=404, detail="캠페인을 찾을 수 없습니다.")
+
     today = datetime.now().date()
-    
-    # 🔥 전체 자산 가져오기
-    all_assets = db.query(Asset).all()
-    total_assets = len(all_assets)
-    
-    # 🔥 실사 완료 = 다음 점검일이 오늘 이후 (실사 주기 내)
-    inspected_assets = [
-        asset for asset in all_assets 
-        if asset.next_inspection_date and asset.next_inspection_date > today
-    ]
-    inspected_count = len(inspected_assets)
-    
-    # 🔥 실사 필요 = 다음 점검일이 오늘 이전 또는 null (점검 필요)
-    pending_assets = [
-        asset for asset in all_assets
-        if not asset.next_inspection_date or asset.next_inspection_date <= today
-    ]
-    pending_count = len(pending_assets)
-    
-    # 🔥 상태별 집계 (실사 완료된 자산들의 최근 실사 기록 기준)
-    normal_count = 0
-    location_mismatch_count = 0
-    status_abnormal_count = 0
-    missing_count = 0
-    
-    for asset in inspected_assets:
-        # 각 자산의 가장 최근 실사 기록 조회
-        latest_inspection = db.query(InventoryInspection).filter(
-            InventoryInspection.asset_id == asset.id
-        ).order_by(InventoryInspection.inspection_date.desc()).first()
-        
-        if latest_inspection:
-            if latest_inspection.status == '정상':
-                normal_count += 1
-            elif latest_inspection.status == '위치불일치':
-                location_mismatch_count += 1
-            elif latest_inspection.status == '상태이상':
-                status_abnormal_count += 1
-            elif latest_inspection.status == '분실':
-                missing_count += 1
-    
+    latest = latest_inspections(campaign_id)
+    if campaign_id is None:
+        inspected = Asset.next_inspection_date > today
+    else:
+        inspected = latest.c.asset_id.isnot(None)
+
+    row = db.execute(
+        select(
+            func.count(Asset.id),
+            count_if(inspected),
+            *[count_if(and_(inspected, latest.c.status == status)) for status in STATUS_STAT_FIELDS]
+        )
+        .select_from(Asset)
+        .outerjoin(latest, latest.c.asset_id == Asset.id)
+    ).one()
+
+    total_assets, inspected_count = int(row[0]), int(row[1])
+    status_counts = {field: int(count) for field, count in zip(STATUS_STAT_FIELDS.values(), row[2:])}
     inspection_rate = (inspected_count / total_assets * 100) if total_assets > 0 else 0
     
     return InspectionStats(
         total_assets=total_assets,
         inspected_count=inspected_count,
-        pending_count=pending_count,
-        normal_count=normal_count,
-        location_mismatch_count=location_mismatch_count,
-        status_abnormal_count=status_abnormal_count,
-        missing_count=missing_count,
-        inspection_rate=round(inspection_rate, 1)
+        pending_count=total_assets - inspected_count,
+        inspection_rate=round(inspection_rate, 1),
+        **status_counts
     )
 
 # 실사 기록 목록 (자산 정보 포함)
@@ -193,14 +359,15 @@ def get_inspections(
     current_user: User = Depends(get_current_user)
 ):
     """실사 기록 목록 (자산 정보 포함)"""
-    query = db.query(InventoryInspection).options(
-        joinedload(InventoryInspection.asset)  # 자산 정보 함께 로드
+    query = db.query(*INSPECTION_LIST_SERIALIZER.columns).outerjoin(
+        Asset, InventoryInspection.asset_id == Asset.id  # 자산 정보 함께 조회
     )
     
     if campaign_id:
         query = query.filter(InventoryInspection.campaign_id == campaign_id)
     
-    return query.order_by(InventoryInspection.inspection_date.desc()).offset(skip).limit(limit).all()
+    rows = query.order_by(InventoryInspection.inspection_date.desc()).offset(skip).limit(limit).all()
+    return ORJSONResponse(INSPECTION_LIST_SERIALIZER.serialize(rows))
 
 # 캠페인 생성
 @router.post("/campaigns", response_model=InspectionCampaignSchema)
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
+from sqlalchemy import case
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime
@@ -9,7 +10,9 @@ from app.models.asset import Asset
 from app.models.user import User
 from app.schemas import issue as schemas
 from app.core.security import get_current_user
-from app.api.notifications import create_notification
+from app.core.serialization import ORJSONResponse, RowSerializer
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, keyset_after, next_cursor
+from app.core.unit_of_work import UnitOfWork, get_uow
 
 router = APIRouter(prefix="/api/issues", tags=["Issues"])
 
@@ -17,8 +20,27 @@ router = APIRouter(prefix="/api/issues", tags=["Issues"])
 class BulkDeleteRequest(BaseModel):
     issue_ids: List[int]
 
+# 목록 응답용 직렬화기 (schemas.Issue와 같은 모양, asset은 outer join)
+ISSUE_LIST_COLUMNS = [
+    models.Issue.id, models.Issue.title, models.Issue.description,
+    models.Issue.status, models.Issue.priority, models.Issue.reporter,
+    models.Issue.assignee, models.Issue.asset_number, models.Issue.asset_id,
+    models.Issue.resolved_at, models.Issue.created_at, models.Issue.updated_at
+]
+ISSUE_LIST_SERIALIZER = RowSerializer(
+    ISSUE_LIST_COLUMNS,
+    nested={"asset": RowSerializer([Asset.id, Asset.asset_number, Asset.name])}
+)
+# asset 상세가 필요 없을 때 (join 없이 issues 컬럼만)
+ISSUE_LEAN_SERIALIZER = RowSerializer(ISSUE_LIST_COLUMNS)
+
+# 우선순위 정렬 순서 (높을수록 먼저)
+PRIORITY_RANK = {"긴급": 4, "높음": 3, "보통": 2, "낮음": 1}
+ISSUE_SORT_KEYS = ("created_at", "priority")
+
 @router.post("/", response_model=schemas.Issue)
-def create_issue(issue: schemas.IssueCreate, db: Session = Depends(get_db)):
+def create_issue(issue: schemas.IssueCreate, uow: UnitOfWork = Depends(get_uow)):
+    db = uow.db
     # 🔥 asset_number로 asset_id 찾기
     asset = None
     asset_id = None
@@ -38,14 +60,12 @@ def create_issue(issue: schemas.IssueCreate, db: Session = Depends(get_db)):
         asset_id=asset_id  # 🔥 추가!
     )
     
-    db.add(db_issue)
-    db.commit()
-    db.refresh(db_issue)
+    uow.add(db_issue)
+    uow.flush()  # 알림에 쓸 id 확보
     
-    # 담당자에게 알림 전송
+    # 담당자에게 알림 전송 (커밋 후 발송)
     if db_issue.assignee and db_issue.assignee != db_issue.reporter:
-        create_notification(
-            db=db,
+        uow.notify(
             username=db_issue.assignee,
             title="새로운 장애가 할당되었습니다",
             message=f"'{db_issue.title}' 장애가 할당되었습니다. (신고자: {db_issue.reporter})",
@@ -53,17 +73,78 @@ def create_issue(issue: schemas.IssueCreate, db: Session = Depends(get_db)):
             related_id=db_issue.id
         )
     
+    uow.commit(db_issue)
     return db_issue
 
 @router.get("/", response_model=List[schemas.Issue])
-def get_issues(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    # 🔥 asset 정보도 함께 로드! (joinedload 사용)
-    issues = db.query(models.Issue)\
-        .options(joinedload(models.Issue.asset))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
-    return issues
+def get_issues(
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sort: str = "created_at",
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    assignee: Optional[str] = None,
+    reporter: Optional[str] = None,
+    asset_id: Optional[int] = None,
+    include_asset: bool = True,
+    db: Session = Depends(get_db)
+):
+    """
+    장애 목록 조회 (커서 페이지네이션)
+
+    - sort: created_at (최신순) 또는 priority (우선순위 높은 순 → 최신순)
+    - cursor: 이전 응답의 X-Next-Cursor 헤더 값 (없으면 첫 페이지, skip은 하위 호환용)
+    - include_asset: false면 자산 join 없이 장애 컬럼만 조회
+    """
+    if sort not in ISSUE_SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 정렬 기준입니다: {sort}")
+    
+    serializer = ISSUE_LIST_SERIALIZER if include_asset else ISSUE_LEAN_SERIALIZER
+    query = db.query(*serializer.columns)
+    if include_asset:
+        # 🔥 asset 정보도 함께 로드! (outer join 컬럼 조회)
+        query = query.outerjoin(Asset, models.Issue.asset_id == Asset.id)
+    
+    # 서버 측 필터 (각 컬럼 인덱스 사용)
+    if status:
+        query = query.filter(models.Issue.status == status)
+    if priority:
+        query = query.filter(models.Issue.priority == priority)
+    if assignee:
+        query = query.filter(models.Issue.assignee == assignee)
+    if reporter:
+        query = query.filter(models.Issue.reporter == reporter)
+    if asset_id is not None:
+        query = query.filter(models.Issue.asset_id == asset_id)
+    
+    # 정렬 키 (id를 마지막에 두어 순서를 항상 고정)
+    sort_columns = [models.Issue.created_at, models.Issue.id]
+    parsers = [datetime.fromisoformat, int]
+    if sort == "priority":
+        priority_rank = case(PRIORITY_RANK, value=models.Issue.priority, else_=0)
+        sort_columns.insert(0, priority_rank)
+        parsers.insert(0, int)
+    
+    if cursor:
+        query = query.filter(keyset_after(sort_columns, decode_cursor(cursor, parsers)))
+    elif skip:
+        query = query.offset(skip)
+    
+    rows = query.order_by(*[column.desc() for column in sort_columns]).limit(limit).all()
+    items = serializer.serialize(rows)
+    
+    def cursor_key(item):
+        key = [item["created_at"], item["id"]]
+        if sort == "priority":
+            key.insert(0, PRIORITY_RANK.get(item["priority"], 0))
+        return key
+    
+    headers = {}
+    cursor_value = next_cursor(items, limit, cursor_key)
+    if cursor_value:
+        headers[NEXT_CURSOR_HEADER] = cursor_value
+    return ORJSONResponse(items, headers=headers)
 
 @router.delete("/bulk-delete")
 def bulk_delete_issues(
@@ -102,7 +183,8 @@ def get_issue(issue_id: int, db: Session = Depends(get_db)):
     return issue
 
 @router.put("/{issue_id}", response_model=schemas.Issue)
-def update_issue(issue_id: int, issue_update: schemas.IssueUpdate, db: Session = Depends(get_db)):
+def update_issue(issue_id: int, issue_update: schemas.IssueUpdate, uow: UnitOfWork = Depends(get_uow)):
+    db = uow.db
     db_issue = db.query(models.Issue).filter(models.Issue.id == issue_id).first()
     if not db_issue:
         raise HTTPException(status_code=404, detail="Issue not found")
@@ -131,15 +213,11 @@ def update_issue(issue_id: int, issue_update: schemas.IssueUpdate, db: Session =
     if issue_update.status == "resolved" and not db_issue.resolved_at:
         db_issue.resolved_at = datetime.now()
     
-    db.commit()
-    db.refresh(db_issue)
-    
-    # 알림 생성
+    # 알림 생성 (커밋 후 발송)
     # 1. 담당자가 변경된 경우 - 새 담당자에게 알림
     if issue_update.assignee and issue_update.assignee != old_assignee:
         if issue_update.assignee != db_issue.reporter:
-            create_notification(
-                db=db,
+            uow.notify(
                 username=issue_update.assignee,
                 title="장애가 재할당되었습니다",
                 message=f"'{db_issue.title}' 장애가 회원님에게 할당되었습니다.",
@@ -156,8 +234,7 @@ def update_issue(issue_id: int, issue_update: schemas.IssueUpdate, db: Session =
             'closed': '종료'
         }.get(issue_update.status, issue_update.status)
         
-        create_notification(
-            db=db,
+        uow.notify(
             username=db_issue.reporter,
             title="장애 상태가 변경되었습니다",
             message=f"'{db_issue.title}' 장애의 상태가 '{status_text}'(으)로 변경되었습니다.",
@@ -165,6 +242,8 @@ def update_issue(issue_id: int, issue_update: schemas.IssueUpdate, db: Session =
             related_id=db_issue.id
         )
     
+    # 변경 + 알림을 한 번에 커밋
+    uow.commit(db_issue)
     return db_issue
 
 @router.delete("/{issue_id}")
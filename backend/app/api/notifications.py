@@ -1,32 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select, union_all
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
-from app.database import get_db
-from app.models.notification import Notification
+from app.database import get_db, SessionLocal
+from app.models.notification import Notification, NotificationArchive
 from app.models.user import User
 from app.schemas.notification import Notification as NotificationSchema
-from app.core.security import get_current_user
+from app.core.security import get_current_user, get_current_user_from_stream_token, create_stream_token
+from app.core.serialization import ORJSONResponse, RowSerializer, dumps
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services.notification_hub import notification_hub
+from app.services.unread_counter import unread_counter
+from app.services.scheduler import register_job
+from app.services.notification_retention import run_notification_retention
+from app.core.config import settings
 
 router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
 
+NOTIFICATION_SERIALIZER = RowSerializer([
+    Notification.id, Notification.user_id, Notification.username,
+    Notification.title, Notification.message, Notification.type,
+    Notification.related_id, Notification.is_read, Notification.count,
+    Notification.created_at, Notification.read_at
+])
+# 보관 알림 조회용 (같은 순서의 컬럼)
+ARCHIVE_COLUMNS = [getattr(NotificationArchive, key) for key in NOTIFICATION_SERIALIZER.keys]
+
 @router.get("", response_model=List[NotificationSchema])
 def get_notifications(
     skip: int = 0,
     limit: int = 50,
     unread_only: bool = False,
+    include_archived: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """현재 사용자의 알림 목록 조회"""
-    query = db.query(Notification).filter(Notification.username == current_user.username)
+    """현재 사용자의 알림 목록 조회 (include_archived: 보관된 알림도 포함)"""
+    live = select(*NOTIFICATION_SERIALIZER.columns).where(Notification.username == current_user.username)
     
     if unread_only:
-        query = query.filter(Notification.is_read == False)
+        live = live.where(Notification.is_read == False)
+    
+    if include_archived and not unread_only:
+        # 보관 알림은 모두 읽은 알림이므로 unread_only일 때는 제외
+        archived = select(*ARCHIVE_COLUMNS).where(NotificationArchive.username == current_user.username)
+        combined = union_all(live, archived).subquery()
+        stmt = select(combined).order_by(combined.c.created_at.desc())
+    else:
+        stmt = live.order_by(Notification.created_at.desc())
     
-    notifications = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
-    return notifications
+    rows = db.execute(stmt.offset(skip).limit(limit)).all()
+    return ORJSONResponse(NOTIFICATION_SERIALIZER.serialize(rows))
 
 @router.get("/unread-count")
 def get_unread_count(
@@ -34,12 +62,54 @@ def get_unread_count(
     current_user: User = Depends(get_current_user)
 ):
     """읽지 않은 알림 개수 조회"""
-    count = db.query(Notification).filter(
-        Notification.username == current_user.username,
-        Notification.is_read == False
-    ).count()
+    return {"count": count_unread(db, current_user.username)}
+
+@router.post("/stream-token")
+def issue_stream_token(current_user: User = Depends(get_current_user)):
+    """알림 스트림 연결용 짧은 수명 토큰 발급 (연결할 때마다 새로 받음)"""
+    return {"token": create_stream_token(current_user.username), "expires_in": settings.NOTIFICATION_STREAM_TOKEN_TTL}
+
+@router.get("/stream")
+async def stream_notifications(
+    last_event_id: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user_from_stream_token)
+):
+    """
+    알림 실시간 스트림 (Server-Sent Events)
+
+    - event: notification (새 알림), unread_count (안 읽은 개수 변경), resync (목록 재조회 필요)
+    - 재연결 시 브라우저가 보내는 Last-Event-ID 이후 이벤트를 이어서 전달
+    - EventSource는 헤더를 못 보내므로 ?token= 으로 인증
+      (URL이 접근 로그에 남으므로 /stream-token 으로 받은 짧은 수명의 스트림 전용 토큰만 허용)
+    """
+    username = current_user.username
+    unread = await run_in_threadpool(count_unread, db, username)
+    # 연결이 오래 유지되므로 DB 커넥션은 바로 반납
+    db.close()
     
-    return {"count": count}
+    async def event_stream():
+        yield "retry: 5000\n\n"
+        if not last_event_id:
+            yield _format_sse("", "unread_count", {"count": unread})
+        async for item in notification_hub.subscribe(username, last_event_id):
+            if item is None:
+                yield ": ping\n\n"
+                continue
+            event_id, event, data = item
+            if event == "resync":
+                # 놓친 이벤트가 있으므로 연결 시점 값이 아니라 지금 개수를 다시 조회
+                yield _format_sse("", "unread_count", {"count": await run_in_threadpool(_count_unread_now, username)})
+            yield _format_sse(event_id, event, data)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # nginx 버퍼링 해제
+        }
+    )
 
 @router.put("/{notification_id}/read")
 def mark_as_read(
@@ -56,10 +126,15 @@ def mark_as_read(
     if not notification:
         raise HTTPException(status_code=404, detail="알림을 찾을 수 없습니다.")
     
+    was_unread = not notification.is_read
     notification.is_read = True
     notification.read_at = datetime.now()
     db.commit()
     
+    if was_unread:
+        unread_counter.add(current_user.username, -1)
+        publish_unread_count(db, current_user.username)
+    
     return {"message": "알림이 읽음으로 표시되었습니다."}
 
 @router.put("/read-all")
@@ -76,6 +151,8 @@ def mark_all_as_read(
         "read_at": datetime.now()
     })
     db.commit()
+    unread_counter.reset(current_user.username)
+    publish_unread_count(db, current_user.username)
     
     return {"message": "모든 알림이 읽음으로 표시되었습니다."}
 
@@ -94,39 +171,113 @@ def delete_notification(
     if not notification:
         raise HTTPException(status_code=404, detail="알림을 찾을 수 없습니다.")
     
+    was_unread = not notification.is_read
     db.delete(notification)
     db.commit()
     
+    if was_unread:
+        unread_counter.add(current_user.username, -1)
+        publish_unread_count(db, current_user.username)
+    
     return {"message": "알림이 삭제되었습니다."}
 
 # 헬퍼 함수: 알림 생성
 def create_notification(
-    db: Session,
     username: str,
     title: str,
     message: str,
     notification_type: str,
     related_id: int = None
 ):
-    """알림 생성 헬퍼 함수 (다른 API에서 호출용)"""
-    from app.models.user import User
-    
-    # 사용자 ID 조회
-    user = db.query(User).filter(User.username == username).first()
-    if not user:
-        return None
-    
-    notification = Notification(
-        user_id=user.id,
+    """알림 생성 헬퍼 함수 (다른 API에서 호출용)
+
+    요청 트랜잭션과 분리해 발송 저널에 기록만 하고,
+    사용자 조회와 INSERT는 백그라운드 발송기가 일괄 처리한다.
+    """
+    notification_dispatcher.enqueue(
         username=username,
         title=title,
         message=message,
-        type=notification_type,
+        notification_type=notification_type,
         related_id=related_id
     )
+
+def count_unread(db: Session, username: str) -> int:
+    """안 읽은 알림 개수 (카운터 저장소 조회, 첫 조회만 COUNT 쿼리)"""
+    return unread_counter.get(db, username)
+
+def _count_unread_now(username: str) -> int:
+    """요청 세션 없이 안 읽은 개수 조회 (스트림은 연결 직후 요청 세션을 반납함)"""
+    db = SessionLocal()
+    try:
+        return count_unread(db, username)
+    finally:
+        db.close()
+
+def publish_unread_count(db: Session, username: str):
+    """실시간 연결 중인 사용자에게 안 읽은 개수 변경 푸시"""
+    if notification_hub.is_connected(username):
+        notification_hub.publish(username, "unread_count", {"count": count_unread(db, username)})
+
+def _format_sse(event_id: str, event: str, data: dict) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {dumps(data).decode()}")
+    return "\n".join(lines) + "\n\n"
+
+def count_new_notifications(rows: List[dict]):
+    """발송기 일괄 기록 후: 수신자별 안 읽은 개수 증가 (기존 안 읽은 알림에 병합된 건 제외)"""
+    for row in rows:
+        if not row["coalesced"]:
+            unread_counter.add(row["username"], 1)
+
+def push_new_notifications(rows: List[dict]):
+    """발송기 일괄 기록 후: 연결 중인 수신자에게 새 알림 + 안 읽은 개수 푸시"""
+    connected = notification_hub.connected_users()
+    targets = [row for row in rows if row["username"] in connected]
+    if not targets:
+        return
     
-    db.add(notification)
-    db.commit()
-    db.refresh(notification)
+    for row in targets:
+        notification_hub.publish(row["username"], "notification", {
+            "title": row["title"],
+            "message": row["message"],
+            "type": row["type"],
+            "related_id": row["related_id"],
+            "count": row["count"],
+            "created_at": row["created_at"]
+        })
     
-    return notification
\ No newline at end of file
+    usernames = {row["username"] for row in targets}
+    db = SessionLocal()
+    try:
+        for username in usernames:
+            notification_hub.publish(username, "unread_count", {"count": unread_counter.get(db, username)})
+    finally:
+        db.close()
+
+notification_dispatcher.add_listener(count_new_notifications)
+notification_dispatcher.add_listener(push_new_notifications)
+
+# 카운터 주기적 재집계
+register_job(
+    "unread-counter-reconcile",
+    settings.NOTIFICATION_COUNTER_RECONCILE_INTERVAL,
+    unread_counter.reconcile
+)
+
+# 다이제스트 알림 묶음 발송 (다이제스트 type이 지정된 경우만)
+register_job(
+    "notification-digest",
+    settings.NOTIFICATION_DIGEST_INTERVAL if settings.NOTIFICATION_DIGEST_TYPES else 0,
+    notification_dispatcher.flush_digest
+)
+
+# 오래된 읽은 알림 보관/정리
+register_job(
+    "notification-retention",
+    settings.NOTIFICATION_RETENTION_INTERVAL,
+    run_notification_retention
+)
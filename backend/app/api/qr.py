@@ -1,66 +1,206 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-from io import BytesIO
-import segno
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Iterator
+
+from app.core.config import settings
+from app.core.http_cache import make_etag, not_modified_response
+from app.core.security import get_current_user
+from app.database import get_db, SessionLocal
+from app.models.asset import Asset
+from app.models.user import User
+from app.schemas.qr import LabelSheetRequest, QRExportRequest
+from app.services.label_sheets import MEDIA_TYPES, label_renderer, sheet_layout
+from app.services.qr_cache import qr_cache, asset_qr_params
+from app.services.zip_stream import ZipMember, stream_zip, unique_name
 
 router = APIRouter(prefix="/api/qr", tags=["QR Code"])
 
-@router.get("/generate/{asset_number}")
-def generate_qr_code(asset_number: str):
-    """세련된 QR 코드 생성 (이미지 표시용)"""
+def qr_response(request: Request, params, headers: dict) -> Response:
+    """캐시된 QR 이미지 응답 (같은 내용+파라미터면 ETag가 같으므로 304)"""
+    etag = make_etag(params.cache_key())
+    headers = {**headers, "ETag": etag}
+    not_modified = not_modified_response(request, etag, headers)
+    if not_modified:
+        return not_modified
+
     try:
-        data = f"ASSET:{asset_number}"
-        
-        # QR 코드 생성
-        qr = segno.make(data, error='h', micro=False)
-        
-        # 버퍼에 저장 (고품질)
-        img_io = BytesIO()
-        qr.save(
-            img_io,
-            kind='png',
-            scale=10,           # 큰 사이즈
-            border=2,           # 슬림 테두리
-            dark='#000000',     # 파란색
-            light='white',      # 흰색 배경
-        )
-        img_io.seek(0)
-        
-        return StreamingResponse(
-            img_io,
-            media_type="image/png",
-            headers={
-                "Content-Disposition": f"inline; filename=QR_{asset_number}.png",
-                "Cache-Control": "public, max-age=86400"
-            }
-        )
+        data, _ = qr_cache.get(params)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return Response(content=data, media_type=params.media_type, headers=headers)
+
+@router.get("/generate/{asset_number}")
+def generate_qr_code(
+    asset_number: str,
+    request: Request,
+    scale: int = Query(10, ge=1, le=40),
+    border: int = Query(2, ge=0, le=10)
+):
+    """세련된 QR 코드 생성 (이미지 표시용)"""
+    # 고품질, 슬림 테두리, 검정/흰색
+    params = asset_qr_params(asset_number, scale=scale, border=border)
+    return qr_response(request, params, {
+        "Content-Disposition": f"inline; filename=QR_{asset_number}.png",
+        "Cache-Control": "public, max-age=86400"
+    })
 
 @router.get("/download/{asset_number}")
-def download_qr_code(asset_number: str):
+def download_qr_code(asset_number: str, request: Request):
     """QR 코드 다운로드용"""
-    try:
-        data = f"ASSET:{asset_number}"
-        qr = segno.make(data, error='h')
-        
-        img_io = BytesIO()
-        qr.save(
-            img_io,
-            kind='png',
-            scale=10,
-            border=2,
-            dark='#000000',
-            light='white'
-        )
-        img_io.seek(0)
-        
-        return StreamingResponse(
-            img_io,
-            media_type="image/png",
-            headers={
-                "Content-Disposition": f"attachment; filename=QR_{asset_number}.png"
-            }
+    params = asset_qr_params(asset_number)
+    return qr_response(request, params, {
+        "Content-Disposition": f"attachment; filename=QR_{asset_number}.png"
+    })
+
+# 자산번호 목록 조회 시 IN 절 한 번에 넣는 개수
+LABEL_LOOKUP_BATCH = 1000
+
+def find_label_assets(db: Session, request: LabelSheetRequest):
+    """라벨 대상 (자산번호, 자산명) - 목록이면 요청 순서, 필터면 자산번호 순서"""
+    if request.asset_numbers is not None:
+        numbers = list(dict.fromkeys(request.asset_numbers))
+        if len(numbers) > settings.LABEL_MAX_ASSETS:
+            return None
+        names = {}
+        for i in range(0, len(numbers), LABEL_LOOKUP_BATCH):
+            names.update(
+                db.query(Asset.asset_number, Asset.name)
+                .filter(Asset.asset_number.in_(numbers[i:i + LABEL_LOOKUP_BATCH]))
+            )
+        return [(number, names[number]) for number in numbers if number in names]
+
+    query = db.query(Asset.asset_number, Asset.name)
+    if request.category:
+        query = query.filter(Asset.category == request.category)
+    if request.location:
+        query = query.filter(Asset.location == request.location)
+    if request.status:
+        query = query.filter(Asset.status == request.status)
+    rows = query.order_by(Asset.asset_number).limit(settings.LABEL_MAX_ASSETS + 1).all()
+    if len(rows) > settings.LABEL_MAX_ASSETS:
+        return None
+    return [(row.asset_number, row.name) for row in rows]
+
+@router.post("/labels")
+def generate_label_sheets(
+    request: LabelSheetRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    QR 라벨 시트 일괄 생성 (자산번호/자산명 포함, 페이지 단위 병렬 렌더링 후 스트리밍)
+
+    pdf는 여러 페이지 PDF 한 파일, png는 한 장이면 PNG, 여러 장이면 페이지별 PNG를 담은 ZIP
+    """
+    if request.asset_numbers is not None and not request.asset_numbers:
+        # 빈 목록을 "전체 자산"으로 해석하지 않음
+        raise HTTPException(status_code=400, detail="자산번호 목록이 비어 있습니다.")
+
+    assets = find_label_assets(db, request)
+    if assets is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.LABEL_MAX_ASSETS}개까지 생성할 수 있습니다."
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+    if not assets:
+        raise HTTPException(status_code=404, detail="라벨을 만들 자산이 없습니다.")
+
+    labels = [(asset_qr_params(number).data, number, name or "") for number, name in assets]
+    layout = sheet_layout(request.columns, request.rows, request.guides)
+
+    media_type = MEDIA_TYPES[request.format]
+    extension = request.format
+    if request.format == "png" and len(labels) > layout.per_page:
+        media_type, extension = "application/zip", "zip"
+    filename = f"qr-labels-{datetime.now():%Y%m%d-%H%M%S}.{extension}"
+
+    return StreamingResponse(
+        label_renderer.stream(labels, layout, request.format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+# ZIP 내보내기 시 한 번에 읽는 자산 수
+EXPORT_BATCH = 500
+
+def export_query(db: Session, request: QRExportRequest, ids=None):
+    """내보낼 자산 (id, 자산번호) 조회 (ids를 주면 그 일부만)"""
+    query = db.query(Asset.id, Asset.asset_number)
+    if ids is not None:
+        query = query.filter(Asset.id.in_(ids))
+    if request.category:
+        query = query.filter(Asset.category == request.category)
+    if request.location:
+        query = query.filter(Asset.location == request.location)
+    return query
+
+def iter_export_assets(request: QRExportRequest) -> Iterator[str]:
+    """
+    내보낼 자산번호를 id 순서로 배치 조회 (전체 목록을 메모리에 올리지 않음)
+
+    응답을 보내는 동안 읽으므로 요청 세션이 아닌 별도 세션을 쓴다.
+    """
+    db = SessionLocal()
+    try:
+        if request.ids is not None:
+            ids = sorted(set(request.ids))
+            for i in range(0, len(ids), EXPORT_BATCH):
+                rows = export_query(db, request, ids[i:i + EXPORT_BATCH]).order_by(Asset.id).all()
+                for row in rows:
+                    yield row.asset_number
+            return
+
+        last_id = 0
+        while True:
+            rows = (
+                export_query(db, request)
+                .filter(Asset.id > last_id)
+                .order_by(Asset.id)
+                .limit(EXPORT_BATCH)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1].id
+            for row in rows:
+                yield row.asset_number
+    finally:
+        db.close()
+
+@router.post("/export")
+def export_qr_codes(
+    request: QRExportRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    QR 코드를 자산번호별 파일로 묶은 ZIP (외부 라벨 프린터용)
+
+    svg는 벡터라 작고 래스터화 비용이 없다. 파일은 응답을 보내면서 하나씩 만들어(QR 캐시 재사용)
+    바로 압축 스트림으로 내보내므로 이미지 데이터는 한꺼번에 메모리에 올리지 않는다. (파일명 집합만 유지)
+    """
+    if request.ids is not None and not request.ids:
+        # 빈 목록을 "전체 자산"으로 해석하지 않음
+        raise HTTPException(status_code=400, detail="자산 id 목록이 비어 있습니다.")
+    if export_query(db, request, request.ids).first() is None:
+        raise HTTPException(status_code=404, detail="내보낼 자산이 없습니다.")
+
+    def members():
+        # 경로 구분자를 바꾸면 다른 자산번호가 같은 이름이 될 수 있음 (A/1, A_1)
+        used = set()
+        for asset_number in iter_export_assets(request):
+            params = asset_qr_params(
+                asset_number, kind=request.format, scale=request.scale, border=request.border
+            )
+            data, _ = qr_cache.get(params)
+            filename = asset_number.replace("/", "_").replace("\\", "_")
+            yield ZipMember(unique_name(f"QR_{filename}.{request.format}", used), data=data)
+
+    archive_name = f"qr-{request.format}-{datetime.now():%Y%m%d-%H%M%S}.zip"
+    return StreamingResponse(
+        stream_zip(members()),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{archive_name}"'}
+    )
@@ -1,33 +1,165 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Query
 from fastapi.responses import FileResponse
-import os
-import shutil
+from collections import OrderedDict
 from pathlib import Path
+from typing import Optional
+import hashlib
+import logging
+import os
+import threading
+
+from app.core.config import settings
+from app.core.http_cache import IMMUTABLE_CACHE_CONTROL, make_etag, not_modified_response
+from app.services.storage import blob_store, UploadTooLarge
+from app.services.image_processing import image_processor, render_width_variant
+from app.services.disk_cache import DiskLRUCache
+from app.services.storage_backends import storage
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/upload", tags=["Upload"])
 
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+# 저장소 도입 전 평평한 디렉터리에 저장된 자산 이미지 (재배치 전까지 읽기 지원)
+LEGACY_UPLOAD_DIR = Path(settings.UPLOAD_DIR)
+
+# 크기별 변형 이미지 캐시 (파일명 = 원본 내용 해시 + 가로 크기)
+variant_cache = DiskLRUCache(Path(settings.IMAGE_VARIANT_CACHE_DIR), settings.IMAGE_VARIANT_CACHE_MAX_BYTES)
+VARIANT_QUALITY = 80
+
+# 자산 이미지 내용 해시 (경로 → (mtime, 크기, sha256)), 파일이 바뀌면 다시 계산
+_version_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_version_lock = threading.Lock()
+VERSION_CACHE_SIZE = 2048
+
+def asset_image_key(asset_number: str) -> str:
+    return f"asset-{asset_number}.jpg"
+
+def asset_image_path(asset_number: str):
+    """저장된 자산 이미지의 로컬 경로 (없으면 None)"""
+    key = asset_image_key(asset_number)
+    if storage.exists(key):
+        return storage.local_path(key)
+    legacy_path = LEGACY_UPLOAD_DIR / f"{asset_number}.jpg"
+    if legacy_path.exists():
+        return legacy_path
+    return None
+
+def image_version(file_path: Path) -> str:
+    """이미지 내용 해시 (ETag/버전 파라미터용, 파일이 그대로면 다시 읽지 않음)"""
+    stat = file_path.stat()
+    cache_key = str(file_path)
+    with _version_lock:
+        cached = _version_cache.get(cache_key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _version_cache.move_to_end(cache_key)
+            return cached[2]
+
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    version = hasher.hexdigest()[:16]
+
+    with _version_lock:
+        _version_cache[cache_key] = (stat.st_mtime_ns, stat.st_size, version)
+        _version_cache.move_to_end(cache_key)
+        while len(_version_cache) > VERSION_CACHE_SIZE:
+            _version_cache.popitem(last=False)
+    return version
+
+def variant_width(w: int) -> int:
+    """요청 가로 크기를 준비된 크기 중 가장 가까운 큰 값으로 (없으면 가장 큰 값)"""
+    widths = sorted(settings.IMAGE_VARIANT_WIDTHS)
+    return next((width for width in widths if width >= w), widths[-1])
+
+def asset_image_variant(file_path: Path, version: str, width: int) -> Path:
+    """가로 width 변형 이미지 (한 번 만들면 캐시에서 재사용)"""
+    key = f"{version}-w{width}.jpg"
+    cached = variant_cache.get(key)
+    if cached:
+        return cached
+
+    temp_path = blob_store.temp_path()
+    try:
+        render_width_variant(file_path, temp_path, width, VARIANT_QUALITY)
+        return variant_cache.put(key, temp_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+def asset_image_url(asset_number: str, version: str) -> str:
+    return f"{router.prefix}/asset-image/{asset_number}?v={version}"
 
 @router.post("/asset-image/{asset_number}")
 async def upload_asset_image(asset_number: str, file: UploadFile = File(...)):
+    # 파일 확장자 확인
+    if not file.filename.lower().endswith(('.png', '.jpg', '.jpeg')):
+        raise HTTPException(status_code=400, detail="이미지 파일만 업로드 가능합니다.")
+
     try:
-        # 파일 확장자 확인
-        if not file.filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-            raise HTTPException(status_code=400, detail="이미지 파일만 업로드 가능합니다.")
-        
-        # 파일 저장
-        file_path = UPLOAD_DIR / f"{asset_number}.jpg"
-        with file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        return {"filename": file.filename, "asset_number": asset_number}
+        stored = await blob_store.receive(file, settings.MAX_UPLOAD_SIZE)
+    except UploadTooLarge:
+        raise HTTPException(status_code=400, detail="파일 크기가 너무 큽니다.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    # 회전 반영/메타데이터 제거/해상도 제한 후 JPEG로 (키가 .jpg 고정, 투명 배경은 흰색)
+    try:
+        stored, _ = await image_processor.normalize(stored, file.filename, image_format="JPEG")
+    except Exception as e:
+        logger.warning(f"자산 이미지 변환 실패 ({asset_number}): {e}")
+        raise HTTPException(status_code=400, detail="이미지를 처리할 수 없습니다.")
+
+    # 파일 저장 (같은 자산 번호면 교체)
+    try:
+        storage.put(stored.path, asset_image_key(asset_number))
+    except Exception as e:
+        blob_store.discard(stored)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    version = stored.sha256[:16]
+    return {
+        "filename": file.filename,
+        "asset_number": asset_number,
+        "version": version,
+        "url": asset_image_url(asset_number, version)  # 버전이 붙은 URL은 영구 캐시
+    }
+
 @router.get("/asset-image/{asset_number}")
-async def get_asset_image(asset_number: str):
-    file_path = UPLOAD_DIR / f"{asset_number}.jpg"
-    if not file_path.exists():
+def get_asset_image(
+    asset_number: str,
+    request: Request,
+    w: Optional[int] = Query(None, ge=1, description="가로 픽셀 (준비된 크기로 맞춤)"),
+    v: Optional[str] = Query(None, description="이미지 버전 (업로드 응답의 version)")
+):
+    """
+    자산 이미지 (?w= 로 작은 변형 요청 가능)
+
+    ETag는 내용 해시 기준. 현재 버전과 같은 v가 붙은 URL은 내용이 바뀌지 않으므로 영구 캐시하고,
+    v 없는 URL은 매번 재검증(304)한다.
+    """
+    file_path = asset_image_path(asset_number)
+    if file_path is None:
         raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
-    return FileResponse(file_path)
\ No newline at end of file
+
+    version = image_version(file_path)
+    width = variant_width(w) if w else None
+
+    cache_control = f"public, {IMMUTABLE_CACHE_CONTROL}" if v == version else "public, no-cache"
+    etag = make_etag(f"{version}-w{width}" if width else version)
+    headers = {"Cache-Control": cache_control, "ETag": etag}
+    not_modified = not_modified_response(request, etag, headers)
+    if not_modified:
+        return not_modified
+
+    if width:
+        try:
+            file_path = asset_image_variant(file_path, version, width)
+        except Exception as e:
+            # 변형을 만들 수 없으면 원본으로 응답
+            logger.warning(f"자산 이미지 변형 생성 실패 ({asset_number}, w={width}): {e}")
+
+    return FileResponse(file_path, media_type="image/jpeg", headers=headers)
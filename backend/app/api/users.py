@@ -5,9 +5,12 @@ from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserResponse
 from app.core.security import get_current_active_admin, get_current_user, get_password_hash  # get_current_user 추가
+from app.core.serialization import ORJSONResponse, RowSerializer
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
 
+SIMPLE_USER_SERIALIZER = RowSerializer([User.id, User.username, User.full_name])
+
 @router.get("", response_model=List[UserResponse])
 def get_users(
     db: Session = Depends(get_db),
@@ -23,15 +26,8 @@ def get_simple_user_list(
     current_user: User = Depends(get_current_user)  # 모든 로그인 사용자 접근 가능
 ):
     """모든 사용자 접근 가능: 담당자 선택용 간단한 사용자 목록"""
-    users = db.query(User).all()
-    return [
-        {
-            "id": user.id,
-            "username": user.username,
-            "full_name": user.full_name
-        }
-        for user in users
-    ]
+    rows = db.query(*SIMPLE_USER_SERIALIZER.columns).all()
+    return ORJSONResponse(SIMPLE_USER_SERIALIZER.serialize(rows))
 
 @router.delete("/{user_id}")
 def delete_user(
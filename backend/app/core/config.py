@@ -37,6 +37,104 @@ class Settings:
     MAX_UPLOAD_SIZE: int = int(
         os.getenv("MAX_UPLOAD_SIZE", "10485760")  # 10MB
     )
+    STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "local")  # local(해시 분산 디스크) | object(오브젝트 스토리지 대용)
+    STORAGE_SHARD_DEPTH: int = int(os.getenv("STORAGE_SHARD_DEPTH", "2"))  # 하위 디렉터리 단계 수
+    OBJECT_STORE_DIR: str = os.getenv("OBJECT_STORE_DIR", "./object-store")
+    OBJECT_STORE_BUCKET: str = os.getenv("OBJECT_STORE_BUCKET", "workhelper")
+    UPLOAD_SESSION_TTL: float = float(
+        os.getenv("UPLOAD_SESSION_TTL", "86400")  # 초, 이어받기 업로드 세션 유지 시간 (마지막 조각 기준)
+    )
+    UPLOAD_JANITOR_INTERVAL: float = float(
+        os.getenv("UPLOAD_JANITOR_INTERVAL", "3600")  # 초, 0이면 비활성
+    )
+    IMAGE_OUTPUT_FORMAT: str = os.getenv("IMAGE_OUTPUT_FORMAT", "jpeg")  # 업로드 사진 재인코딩 형식: jpeg | webp
+    IMAGE_MAX_DIMENSION: int = int(os.getenv("IMAGE_MAX_DIMENSION", "2560"))  # 긴 변 최대 픽셀
+    IMAGE_QUALITY: int = int(os.getenv("IMAGE_QUALITY", "82"))
+    IMAGE_WORKERS: int = int(os.getenv("IMAGE_WORKERS", "2"))
+    IMAGE_VARIANT_WIDTHS: List[int] = [
+        int(s) for s in os.getenv("IMAGE_VARIANT_WIDTHS", "64,128,256,512,1024").split(",") if s.strip()
+    ]  # ?w= 요청을 이 중 가장 가까운 큰 값으로 맞춤 (변형 종류 제한)
+    IMAGE_VARIANT_CACHE_DIR: str = os.getenv("IMAGE_VARIANT_CACHE_DIR", "./cache/image-variants")
+    IMAGE_VARIANT_CACHE_MAX_BYTES: int = int(
+        os.getenv("IMAGE_VARIANT_CACHE_MAX_BYTES", str(256 * 1024 * 1024))  # 256MB
+    )
+    STORAGE_GC_INTERVAL: float = float(
+        os.getenv("STORAGE_GC_INTERVAL", "86400")  # 초, 고아 파일/끊어진 첨부파일 정리 주기 (0이면 비활성)
+    )
+    STORAGE_GC_GRACE: float = float(
+        os.getenv("STORAGE_GC_GRACE", "3600")  # 초, 이보다 최근에 바뀐 파일은 업로드 중일 수 있어 제외
+    )
+    STORAGE_GC_BATCH_SIZE: int = int(os.getenv("STORAGE_GC_BATCH_SIZE", "500"))
+    STORAGE_GC_PAUSE: float = float(os.getenv("STORAGE_GC_PAUSE", "0.1"))  # 배치 사이 대기 (초)
+    STORAGE_QUOTA_PER_USER: int = int(
+        os.getenv("STORAGE_QUOTA_PER_USER", "0")  # bytes, 사용자별 첨부파일 용량 한도 (0이면 제한 없음)
+    )
+    STORAGE_USAGE_RECONCILE_INTERVAL: float = float(
+        os.getenv("STORAGE_USAGE_RECONCILE_INTERVAL", "86400")  # 초, 0이면 비활성
+    )
+    THUMBNAIL_SIZES: List[int] = [
+        int(s) for s in os.getenv("THUMBNAIL_SIZES", "200,800").split(",") if s.strip()
+    ]  # 긴 변 픽셀 (목록용, 미리보기용)
+    THUMBNAIL_WORKERS: int = int(os.getenv("THUMBNAIL_WORKERS", "2"))
+    
+    # QR 코드 이미지 캐시
+    QR_CACHE_MEMORY_ITEMS: int = int(os.getenv("QR_CACHE_MEMORY_ITEMS", "2048"))
+    QR_CACHE_DIR: str = os.getenv("QR_CACHE_DIR", "./cache/qr")
+    QR_CACHE_MAX_BYTES: int = int(
+        os.getenv("QR_CACHE_MAX_BYTES", str(64 * 1024 * 1024))  # 64MB
+    )
+
+    # QR 라벨 시트 일괄 생성
+    LABEL_WORKERS: int = int(os.getenv("LABEL_WORKERS", "4"))  # 프로세스 수, 0이면 요청 스레드에서 그림
+    LABEL_DPI: int = int(os.getenv("LABEL_DPI", "300"))
+    LABEL_FONT_PATH: str = os.getenv("LABEL_FONT_PATH", "")  # 한글 TTF/OTF (예: NanumGothic.ttf), 비우면 기본 글꼴
+    LABEL_MAX_ASSETS: int = int(os.getenv("LABEL_MAX_ASSETS", "10000"))  # 요청당 최대 라벨 수
+
+    # 알림 발송 (저널 → 일괄 INSERT)
+    NOTIFICATION_SPOOL_DIR: str = os.getenv("NOTIFICATION_SPOOL_DIR", "./spool/notifications")
+    NOTIFICATION_BATCH_SIZE: int = int(os.getenv("NOTIFICATION_BATCH_SIZE", "200"))
+    NOTIFICATION_FLUSH_INTERVAL: float = float(
+        os.getenv("NOTIFICATION_FLUSH_INTERVAL", "1.0")  # 초
+    )
+    NOTIFICATION_SEGMENT_MAX_ATTEMPTS: int = int(
+        os.getenv("NOTIFICATION_SEGMENT_MAX_ATTEMPTS", "5")  # 같은 저널 segment가 이만큼 실패하면 failed/ 로 격리
+    )
+    NOTIFICATION_USER_CACHE_TTL: float = float(
+        os.getenv("NOTIFICATION_USER_CACHE_TTL", "300")  # 초
+    )
+    NOTIFICATION_STREAM_TOKEN_TTL: int = int(
+        os.getenv("NOTIFICATION_STREAM_TOKEN_TTL", "60")  # 초, 알림 스트림 연결용 토큰 (URL에 실리므로 짧게)
+    )
+    NOTIFICATION_COALESCE_WINDOW: float = float(
+        os.getenv("NOTIFICATION_COALESCE_WINDOW", "600")  # 초, 같은 대상 알림 병합 시간 창 (0이면 비활성)
+    )
+    NOTIFICATION_DIGEST_TYPES: List[str] = [
+        t.strip() for t in os.getenv("NOTIFICATION_DIGEST_TYPES", "").split(",") if t.strip()
+    ]  # 예: "comment" - 다이제스트로 묶어서 보낼 알림 type
+    NOTIFICATION_DIGEST_INTERVAL: float = float(
+        os.getenv("NOTIFICATION_DIGEST_INTERVAL", "3600")  # 초
+    )
+    NOTIFICATION_COUNTER_RECONCILE_INTERVAL: float = float(
+        os.getenv("NOTIFICATION_COUNTER_RECONCILE_INTERVAL", "300")  # 초, 0이면 비활성
+    )
+    
+    # 알림 보관/정리
+    NOTIFICATION_ARCHIVE_AFTER_DAYS: int = int(
+        os.getenv("NOTIFICATION_ARCHIVE_AFTER_DAYS", "30")  # 읽은 알림 → 보관 테이블
+    )
+    NOTIFICATION_PURGE_AFTER_DAYS: int = int(
+        os.getenv("NOTIFICATION_PURGE_AFTER_DAYS", "365")  # 보관 알림 삭제
+    )
+    NOTIFICATION_RETENTION_INTERVAL: float = float(
+        os.getenv("NOTIFICATION_RETENTION_INTERVAL", "3600")  # 초, 0이면 비활성
+    )
+    NOTIFICATION_RETENTION_BATCH_SIZE: int = int(os.getenv("NOTIFICATION_RETENTION_BATCH_SIZE", "500"))
+    NOTIFICATION_RETENTION_PAUSE: float = float(
+        os.getenv("NOTIFICATION_RETENTION_PAUSE", "0.2")  # 배치 사이 대기 (초)
+    )
+    NOTIFICATION_COMPACT_THRESHOLD: int = int(
+        os.getenv("NOTIFICATION_COMPACT_THRESHOLD", "0")  # 한 번에 이만큼 정리되면 OPTIMIZE, 0이면 비활성
+    )
     
     # 로깅
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -0,0 +1,29 @@
+from typing import Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+# 내용이 바뀌지 않는 리소스 (내용 해시/ID 기준 URL)
+IMMUTABLE_CACHE_CONTROL = "max-age=31536000, immutable"
+
+
+def make_etag(value: str) -> str:
+    """강한 ETag (따옴표 포함)"""
+    return f'"{value}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 일치하는지 (W/ 약한 비교 허용, * 지원)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag == etag or tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified_response(request: Request, etag: str, headers: Dict[str, str]) -> Optional[Response]:
+    """조건부 요청이 캐시와 일치하면 304 응답, 아니면 None"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+    return None
@@ -0,0 +1,56 @@
+import base64
+from datetime import date, datetime
+from typing import Any, Callable, List, Sequence
+
+import orjson
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+# 다음 페이지 커서를 전달하는 응답 헤더
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """정렬 키 값 목록을 URL-safe 커서 문자열로 변환"""
+    payload = [
+        value.isoformat() if isinstance(value, (datetime, date)) else value
+        for value in values
+    ]
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[Any], Any]]) -> List[Any]:
+    """커서 문자열을 정렬 키 값 목록으로 복원 (값마다 parser 적용)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = orjson.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError
+        return [
+            parse(value) if value is not None else None
+            for parse, value in zip(parsers, values)
+        ]
+    except (ValueError, TypeError, orjson.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+
+def keyset_after(columns: Sequence[Any], values: Sequence[Any]):
+    """
+    내림차순 정렬 (columns 순서) 기준으로 values 다음에 오는 행 조건
+
+    (a, b, c) < (x, y, z) 를 인덱스를 탈 수 있는 OR/AND 형태로 펼친다.
+    """
+    column, value = columns[0], values[0]
+    if len(columns) == 1:
+        return column < value
+    return or_(
+        column < value,
+        and_(column == value, keyset_after(columns[1:], values[1:]))
+    )
+
+
+def next_cursor(rows: Sequence[Any], limit: int, key: Callable[[Any], Sequence[Any]]):
+    """마지막 행 기준 다음 커서 (페이지가 꽉 차지 않았으면 None)"""
+    if len(rows) < limit or not rows:
+        return None
+    return encode_cursor(key(rows[-1]))
@@ -13,8 +13,12 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
+# 알림 스트림 연결 전용 토큰 (purpose가 있는 토큰은 일반 API 인증에 쓸 수 없음)
+STREAM_TOKEN_PURPOSE = "notification-stream"
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -32,7 +36,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def create_stream_token(username: str) -> str:
+    return create_access_token(
+        {"sub": username, "purpose": STREAM_TOKEN_PURPOSE},
+        expires_delta=timedelta(seconds=settings.NOTIFICATION_STREAM_TOKEN_TTL)
+    )
+
+def _user_from_token(token: str, db: Session, purpose: Optional[str] = None):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="인증 정보를 확인할 수 없습니다.",
@@ -41,7 +51,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
-        if username is None:
+        if username is None or payload.get("purpose") != purpose:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
@@ -53,10 +63,34 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         raise HTTPException(status_code=400, detail="비활성화된 사용자입니다.")
     return user
 
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    return _user_from_token(token, db)
+
 def get_current_active_admin(current_user: User = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="관리자 권한이 필요합니다."
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def get_current_user_from_stream_token(
+    token: Optional[str] = None,
+    bearer_token: Optional[str] = Depends(oauth2_scheme_optional),
+    db: Session = Depends(get_db)
+):
+    """
+    헤더를 보낼 수 없는 클라이언트(EventSource 등)용: ?token= 으로도 인증
+
+    URL은 접근 로그에 남으므로 ?token= 에는 access token이 아니라
+    create_stream_token()으로 받은 짧은 수명의 스트림 전용 토큰만 받는다.
+    """
+    if bearer_token:
+        return _user_from_token(bearer_token, db)
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="인증 정보를 확인할 수 없습니다.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return _user_from_token(token, db, purpose=STREAM_TOKEN_PURPOSE)
@@ -0,0 +1,87 @@
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(obj: Any):
+    """orjson이 기본 지원하지 않는 타입 처리 (Pydantic JSON 출력과 동일하게 맞춤)"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+    )
+
+
+class ORJSONResponse(JSONResponse):
+    """orjson 기반 응답 클래스 (대용량 목록 응답용)"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RowSerializer:
+    """
+    미리 구성해두는 행(tuple) → dict 변환기
+
+    ORM 객체 로드 + Pydantic 검증을 건너뛰고, 컬럼 단위 조회 결과를
+    그대로 dict로 바꿔 응답 스키마와 같은 모양을 만든다.
+    - columns: 조회할 컬럼 목록 (키 이름은 컬럼 key 사용)
+    - converters: 특정 키 값 변환 (None이 아닐 때만 적용)
+    - nested: 하위 객체 (첫 번째 컬럼이 NULL이면 None으로 처리 - outer join 대응)
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[Any],
+        converters: Optional[Dict[str, Callable[[Any], Any]]] = None,
+        nested: Optional[Dict[str, "RowSerializer"]] = None
+    ):
+        self.keys = tuple(column.key for column in columns)
+        self._columns = tuple(columns)
+        self._converters = tuple((converters or {}).items())
+        self._nested = tuple((nested or {}).items())
+
+    @property
+    def columns(self) -> List[Any]:
+        """SELECT에 넘길 전체 컬럼 목록 (하위 객체 컬럼 포함)"""
+        columns = list(self._columns)
+        for _, serializer in self._nested:
+            columns.extend(serializer.columns)
+        return columns
+
+    @property
+    def width(self) -> int:
+        return len(self.keys) + sum(serializer.width for _, serializer in self._nested)
+
+    def _build(self, row: Sequence[Any], start: int) -> dict:
+        end = start + len(self.keys)
+        item = dict(zip(self.keys, row[start:end]))
+
+        for key, convert in self._converters:
+            value = item[key]
+            if value is not None:
+                item[key] = convert(value)
+
+        for name, serializer in self._nested:
+            item[name] = serializer._build(row, end) if row[end] is not None else None
+            end += serializer.width
+
+        return item
+
+    def serialize(self, rows: Iterable[Sequence[Any]]) -> List[dict]:
+        build = self._build
+        return [build(row, 0) for row in rows]
+
+
+def to_date(value: Any):
+    """DateTime 컬럼을 date 필드로 내보낼 때 사용"""
+    return value.date() if hasattr(value, "date") else value
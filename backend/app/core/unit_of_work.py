@@ -0,0 +1,90 @@
+from typing import Any, Callable, List
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services.notification_dispatcher import notification_dispatcher
+
+
+class UnitOfWork:
+    """
+    요청 단위 작업 묶음
+
+    엔티티 변경과 부수 효과(알림 등)를 모아 두었다가 commit() 한 번으로 처리한다.
+    - DB 변경은 하나의 트랜잭션으로 커밋 (중간 커밋 없음)
+    - 알림 행도 같은 트랜잭션에서 기록 (변경만 남고 알림이 빠지거나, 롤백된 변경의 알림이 남지 않음)
+    - 카운터 갱신/실시간 푸시만 커밋이 성공한 뒤에 수행
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._notifications: List[dict] = []
+        self._after_commit: List[Callable[[], Any]] = []
+
+    def add(self, entity):
+        self.db.add(entity)
+        return entity
+
+    def flush(self):
+        """커밋 없이 INSERT/UPDATE 반영 (새 엔티티의 id가 필요할 때)"""
+        self.db.flush()
+
+    def notify(
+        self,
+        username: str,
+        title: str,
+        message: str,
+        notification_type: str,
+        related_id: int = None
+    ):
+        """커밋 때 함께 기록할 알림 예약"""
+        self._notifications.append(notification_dispatcher.make_record(
+            username, title, message, notification_type, related_id
+        ))
+
+    def on_commit(self, callback: Callable[[], Any]):
+        """커밋 후 실행할 작업 예약"""
+        self._after_commit.append(callback)
+
+    def commit(self, *refresh):
+        """
+        변경 사항을 한 번에 커밋
+
+        refresh로 넘긴 엔티티는 커밋 전에 같은 트랜잭션 안에서 다시 읽어
+        (server_default 값 등) 커밋 후 추가 SELECT 없이 응답에 사용할 수 있게 한다.
+        """
+        notifications, self._notifications = self._notifications, []
+        try:
+            self.db.flush()
+            rows = notification_dispatcher.write_in_transaction(self.db, notifications) if notifications else []
+            for entity in refresh:
+                self.db.refresh(entity)
+            self.db.expire_on_commit = False
+            self.db.commit()
+        except Exception:
+            self.rollback()
+            raise
+        finally:
+            self.db.expire_on_commit = True
+
+        if rows:
+            notification_dispatcher.publish(rows)
+
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        self.db.rollback()
+        self._notifications.clear()
+        self._after_commit.clear()
+
+
+def get_uow(db: Session = Depends(get_db)):
+    uow = UnitOfWork(db)
+    try:
+        yield uow
+    except Exception:
+        uow.rollback()
+        raise
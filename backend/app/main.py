@@ -1,16 +1,41 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.database import engine, Base
 from app.api import assets, issues, qr, upload, auth, users, comments, statistics, dashboard_config, categories, locations, attachments, notifications, filter_configs, reports, inspections 
 from app.core.config import settings
+from app.services.notification_dispatcher import notification_dispatcher
+from app.services.notification_hub import notification_hub
+from app.services.scheduler import start_jobs, stop_jobs
+from app.services.thumbnails import thumbnail_worker
+from app.services.image_processing import image_processor
+from app.services.label_sheets import label_renderer
 
 # 테이블 생성
 Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 백그라운드 작업 시작/종료
+    notification_hub.bind(asyncio.get_running_loop())
+    notification_dispatcher.start()
+    image_processor.start()
+    thumbnail_worker.start()
+    label_renderer.start()
+    start_jobs()
+    yield
+    stop_jobs()
+    label_renderer.stop()
+    thumbnail_worker.stop()
+    image_processor.stop()
+    notification_dispatcher.stop()
+
 app = FastAPI(
     title="WorkHelper API",
     description="중소기업 자산 및 장애 관리 시스템",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -19,6 +44,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Upload-Offset"],  # 커서 페이지네이션, 이어받기 업로드
 )
 
 app.include_router(assets.router)
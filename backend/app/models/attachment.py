@@ -15,8 +15,9 @@ class Attachment(Base):
     entity_id = Column(Integer, nullable=False)  # 자산 ID 또는 장애 ID
     
     filename = Column(String(255), nullable=False)  # 원본 파일명
-    filepath = Column(String(500), nullable=False)  # 저장된 파일 경로
+    filepath = Column(String(500), nullable=False, index=True)  # 저장소 ref (키, 또는 예전 파일 경로) - 참조 수 확인용 인덱스
     filesize = Column(Integer, nullable=False)  # 파일 크기 (bytes)
+    checksum = Column(String(64), nullable=True, index=True)  # SHA-256 (hex)
     content_type = Column(String(100), nullable=False)  # MIME type (image/jpeg, application/pdf 등)
     
     uploaded_by = Column(String(100), nullable=False)  # 업로드한 사용자
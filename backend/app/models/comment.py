@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # 대상별 댓글 목록 (최신순 페이지네이션) / 대상별 댓글 수
+        Index("ix_comments_target_created_at", "target_type", "target_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Enum, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -22,6 +22,11 @@ class InspectionCampaign(Base):
 
 class InventoryInspection(Base):
     __tablename__ = "inventory_inspections"
+    __table_args__ = (
+        # 자산별 최근 실사 기록 (통계의 ROW_NUMBER 창 함수가 정렬 없이 인덱스만 읽도록 status까지 포함)
+        Index("ix_inspections_asset_latest", "asset_id", "inspection_date", "id", "status"),
+        Index("ix_inspections_campaign_latest", "campaign_id", "asset_id", "inspection_date", "id", "status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     campaign_id = Column(Integer, ForeignKey("inspection_campaigns.id"))
@@ -34,6 +39,7 @@ class InventoryInspection(Base):
     actual_status = Column(String(50))
     condition_notes = Column(Text)
     photo_url = Column(String(500))
+    idempotency_key = Column(String(64), unique=True)  # 오프라인 일괄 동기화 시 단말이 붙인 키 (재전송 중복 방지)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -1,18 +1,22 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
 class Issue(Base):
     __tablename__ = "issues"
+    __table_args__ = (
+        # 목록 커서 페이지네이션 (created_at DESC, id DESC)
+        Index("ix_issues_created_at_id", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200))
     description = Column(Text)
-    status = Column(String(20), default="open")
-    priority = Column(String(20))  # 낮음, 보통, 높음, 긴급
-    reporter = Column(String(100))  # 신고자
-    assignee = Column(String(100), nullable=True)  # 담당자
+    status = Column(String(20), default="open", index=True)
+    priority = Column(String(20), index=True)  # 낮음, 보통, 높음, 긴급
+    reporter = Column(String(100), index=True)  # 신고자
+    assignee = Column(String(100), nullable=True, index=True)  # 담당자
     
     # 🔥 asset_id 추가 - 외래키!
     asset_id = Column(Integer, ForeignKey('assets.id'), nullable=True, index=True)
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # 사용자별 목록/안 읽은 개수 조회 (username, is_read, created_at)
+        Index("ix_notifications_username_is_read_created_at", "username", "is_read", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, index=True)  # 알림 받을 사용자 ID
@@ -13,5 +17,26 @@ class Notification(Base):
     type = Column(String(50), nullable=False)  # issue, comment, asset 등
     related_id = Column(Integer)  # 관련 항목 ID (장애 ID, 댓글 ID 등)
     is_read = Column(Boolean, default=False)  # 읽음 여부
+    count = Column(Integer, nullable=False, default=1, server_default="1")  # 병합된 알림 수
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    read_at = Column(DateTime(timezone=True), nullable=True)  # 읽은 시간
\ No newline at end of file
+    read_at = Column(DateTime(timezone=True), nullable=True)  # 읽은 시간
+
+class NotificationArchive(Base):
+    """보관 기간이 지난 읽은 알림 (notifications와 같은 컬럼, id 유지)"""
+    __tablename__ = "notifications_archive"
+    __table_args__ = (
+        Index("ix_notifications_archive_username_created_at", "username", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=False)  # 원본 알림 ID
+    user_id = Column(Integer, nullable=False)
+    username = Column(String(100), nullable=False)
+    title = Column(String(200), nullable=False)
+    message = Column(Text, nullable=False)
+    type = Column(String(50), nullable=False)
+    related_id = Column(Integer)
+    is_read = Column(Boolean, default=True)
+    count = Column(Integer, nullable=False, default=1, server_default="1")
+    created_at = Column(DateTime(timezone=True), index=True)
+    read_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+class StorageUsage(Base):
+    """첨부파일 사용량 집계 (업로드/삭제 시 증감)"""
+    __tablename__ = "storage_usage"
+    __table_args__ = (
+        # 범위별 상위 N 조회
+        Index("ix_storage_usage_scope_bytes", "scope", "bytes"),
+    )
+    
+    scope = Column(String(20), primary_key=True)  # entity | uploader
+    owner = Column(String(150), primary_key=True)  # "asset:12" 같은 대상 또는 사용자명
+    bytes = Column(BigInteger, nullable=False, default=0, server_default="0")  # 첨부파일 크기 합 (중복 제거 전)
+    files = Column(Integer, nullable=False, default=0, server_default="0")  # 첨부파일 수
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -13,9 +13,32 @@ class AttachmentBase(BaseModel):
 class AttachmentCreate(AttachmentBase):
     filepath: str
 
+class AttachmentFromChecksum(BaseModel):
+    """이미 저장된 파일(SHA-256 일치)로 첨부파일 생성"""
+    entity_type: str
+    entity_id: int
+    filename: str
+    checksum: str
+
+class ResumableUploadCreate(BaseModel):
+    """이어받기 업로드 세션 생성"""
+    entity_type: str
+    entity_id: int
+    filename: str
+    size: int  # 전체 크기 (bytes)
+
+class ResumableUploadStatus(BaseModel):
+    """이어받기 업로드 진행 상황 (offset부터 이어서 보내면 됨)"""
+    upload_id: str
+    filename: str
+    size: int
+    offset: int
+    expires_at: datetime
+
 class Attachment(AttachmentBase):
     id: int
     filepath: str
+    checksum: Optional[str] = None  # SHA-256
     created_at: datetime
 
     class Config:
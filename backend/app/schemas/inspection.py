@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime, date
 from decimal import Decimal
 
@@ -77,6 +77,27 @@ class QRScanRequest(BaseModel):
     condition_notes: Optional[str] = None
     campaign_id: Optional[int] = None
 
+# 오프라인 일괄 동기화 (단말에 쌓아둔 스캔)
+class QRScanSyncItem(QRScanRequest):
+    idempotency_key: str = Field(..., min_length=1, max_length=64)  # 재전송해도 한 번만 기록
+    scanned_at: datetime  # 단말에서 스캔한 시각
+
+class QRScanSyncRequest(BaseModel):
+    scans: List[QRScanSyncItem] = Field(..., max_length=1000)
+
+class QRScanSyncResult(BaseModel):
+    idempotency_key: str
+    asset_number: str
+    result: str  # created / duplicate / already_inspected / not_found / invalid
+    inspection_id: Optional[int] = None
+    message: Optional[str] = None
+
+class QRScanSyncResponse(BaseModel):
+    created: int
+    duplicates: int
+    rejected: int
+    results: List[QRScanSyncResult]
+
 # Statistics Schema
 class InspectionStats(BaseModel):
     total_assets: int
@@ -16,6 +16,7 @@ class NotificationCreate(NotificationBase):
 class Notification(NotificationBase):
     id: int
     is_read: bool
+    count: int = 1  # 병합/다이제스트로 묶인 알림 수
     created_at: datetime
     read_at: Optional[datetime] = None
     
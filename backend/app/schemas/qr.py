@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+# QR 라벨 시트 일괄 생성 요청 (asset_numbers가 있으면 그 순서대로, 없으면 필터 조건의 자산 전체)
+class LabelSheetRequest(BaseModel):
+    asset_numbers: Optional[List[str]] = None
+    category: Optional[str] = None
+    location: Optional[str] = None
+    status: Optional[str] = None
+    format: Literal["pdf", "png"] = "pdf"
+    columns: int = Field(3, ge=1, le=10)
+    rows: int = Field(8, ge=1, le=20)
+    guides: bool = True  # 자르는 선
+
+# QR 코드 파일 ZIP 내보내기 요청 (ids가 있으면 그 자산만, 없으면 필터 조건의 자산 전체)
+class QRExportRequest(BaseModel):
+    ids: Optional[List[int]] = None
+    category: Optional[str] = None
+    location: Optional[str] = None
+    format: Literal["svg", "png"] = "svg"
+    scale: int = Field(10, ge=1, le=40)
+    border: int = Field(2, ge=0, le=10)
@@ -0,0 +1,101 @@
+"""
+디스크 LRU 캐시
+
+한 번 만든 결과물(이미지 변형 등)을 파일로 보관하고, 전체 크기가 max_bytes를 넘으면
+가장 오래 쓰이지 않은 파일부터 지운다. 사용 시각은 파일 수정 시각(mtime)으로 기록한다.
+"""
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+
+class DiskLRUCache:
+    """key → root/<key 앞 2자리>/<key> 파일"""
+
+    # 조회 때 사용 시각을 갱신하는 최소 간격 (매 요청마다 utime 하지 않음)
+    TOUCH_INTERVAL = 60
+    # 정리할 때 max_bytes의 이 비율까지 줄임 (넘을 때마다 정리하지 않도록)
+    EVICT_TARGET = 0.9
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._total: Optional[int] = None
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def _files(self):
+        for directory in os.scandir(self.root):
+            if directory.is_dir():
+                for entry in os.scandir(directory.path):
+                    if entry.is_file() and not entry.name.endswith(".part"):
+                        yield entry
+
+    def _ensure_total(self):
+        if self._total is None:
+            self._total = sum(entry.stat().st_size for entry in self._files())
+
+    def get(self, key: str) -> Optional[Path]:
+        path = self.path(key)
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        now = time.time()
+        if now - mtime > self.TOUCH_INTERVAL:
+            try:
+                os.utime(path, (now, now))
+            except FileNotFoundError:
+                return None
+        return path
+
+    def put(self, key: str, src: Path) -> Path:
+        """src 파일을 캐시에 넣음 (src는 옮겨짐)"""
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = src.stat().st_size
+        with self._lock:
+            self._ensure_total()
+            try:
+                self._total -= path.stat().st_size
+            except FileNotFoundError:
+                pass
+            os.replace(src, path)
+            self._total += size
+            if self._total > self.max_bytes:
+                self._evict()
+        return path
+
+    def put_bytes(self, key: str, data: bytes) -> Path:
+        temp_path = self.root / f"{uuid.uuid4().hex}.part"
+        temp_path.write_bytes(data)
+        return self.put(key, temp_path)
+
+    def _evict(self):
+        """오래 쓰이지 않은 파일부터 삭제 (잠금 안에서 호출)"""
+        entries = []
+        for entry in self._files():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * self.EVICT_TARGET
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        self._total = total
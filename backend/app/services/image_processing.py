@@ -0,0 +1,246 @@
+"""
+업로드 이미지 정규화
+
+사진을 저장하기 전에 작업 스레드 풀에서
+- EXIF 회전 정보를 픽셀에 반영하고
+- 메타데이터(EXIF, GPS, XMP, 주석 등)를 제거하고 (색 프로파일은 유지)
+- 긴 변을 IMAGE_MAX_DIMENSION 이하로 줄이고
+- JPEG 또는 WebP로 다시 인코딩한다.
+저장한 결과에 메타데이터 세그먼트가 남아 있으면 원본도 쓰지 않고 실패로 처리한다.
+이미지로 읽을 수 없거나, 원본에 지울 메타데이터/줄일 크기가 없는데 결과가 더 크면 원본을 그대로 둔다.
+투명도가 있는 이미지는 JPEG로 바꾸지 않고 원본 형식을 유지한다. (형식을 지정한 경우는 흰 배경에 합성)
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple
+
+from PIL import Image, ImageOps
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.storage import CHUNK_SIZE, StoredFile, blob_store
+
+logger = logging.getLogger(__name__)
+
+# 정규화 대상 (GIF는 애니메이션이 깨지므로 제외)
+NORMALIZABLE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+OUTPUT_EXTENSIONS = {"JPEG": ".jpg", "WEBP": ".webp"}
+
+
+def is_normalizable(filename: str) -> bool:
+    return os.path.splitext(filename)[1].lower() in NORMALIZABLE_EXTENSIONS
+
+
+def _file_sha256(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class MetadataNotStripped(Exception):
+    """다시 인코딩한 결과에 메타데이터가 남아 있음"""
+
+
+# 메타데이터를 담는 세그먼트 (JPEG 마커 / WebP 청크)
+JPEG_METADATA_MARKERS = {0xE1: "APP1", 0xFE: "COM"}
+WEBP_METADATA_CHUNKS = {b"EXIF", b"XMP "}
+
+
+def find_metadata_segments(path: Path, image_format: str) -> list:
+    """저장된 JPEG/WebP 파일에 남은 메타데이터 세그먼트 이름 목록"""
+    with open(path, "rb") as f:
+        data = f.read()
+    found = []
+    if image_format == "JPEG":
+        pos = 2  # SOI 다음
+        while pos + 4 <= len(data) and data[pos] == 0xFF:
+            marker = data[pos + 1]
+            if marker == 0xDA:  # SOS 이후는 영상 데이터
+                break
+            if marker in JPEG_METADATA_MARKERS:
+                found.append(JPEG_METADATA_MARKERS[marker])
+            pos += 2 + int.from_bytes(data[pos + 2:pos + 4], "big")
+    else:
+        pos = 12  # RIFF 헤더 다음
+        while pos + 8 <= len(data):
+            chunk, size = data[pos:pos + 4], int.from_bytes(data[pos + 4:pos + 8], "little")
+            if chunk in WEBP_METADATA_CHUNKS:
+                found.append(chunk.decode("ascii").strip())
+            pos += 8 + size + (size & 1)
+    return found
+
+
+def normalize_image(
+    src: Path,
+    dest: Path,
+    image_format: str,
+    max_dimension: int,
+    quality: int,
+    flatten_alpha: bool = False
+) -> Optional[bool]:
+    """
+    src를 정규화해서 dest에 저장
+
+    flatten_alpha: 투명도가 있어도 흰 배경에 합성해서 JPEG로 저장 (형식이 고정된 경우)
+    반환값: None = 저장하지 않음 (투명도가 있는 이미지를 JPEG로 바꿔야 하는 경우)
+            True = 원본에 메타데이터가 있거나 크기를 줄였음 (원본을 그대로 쓰면 안 됨)
+            False = 원본도 이미 깨끗함
+    """
+    with Image.open(src) as img:
+        has_alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+        if has_alpha and image_format == "JPEG":
+            if not flatten_alpha:
+                return None
+        has_metadata = bool(img.getexif()) or any(
+            key in img.info for key in ("xmp", "XML:com.adobe.xmp", "comment")
+        )
+        resized = max(img.size) > max_dimension
+        flattened = False
+        # CMYK 프로파일은 RGB로 바꾼 뒤에는 맞지 않으므로 버림
+        icc_profile = img.info.get("icc_profile") if img.mode != "CMYK" else None
+
+        # JPEG는 디코딩 단계에서 미리 축소 (전체 해상도로 풀지 않음)
+        img.draft("RGB", (max_dimension, max_dimension))
+        img = ImageOps.exif_transpose(img)
+        if resized:
+            img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        if has_alpha and image_format == "JPEG":
+            rgba = img.convert("RGBA")
+            img = Image.new("RGB", rgba.size, "white")
+            img.paste(rgba, mask=rgba.getchannel("A"))
+            has_alpha, flattened = False, True
+        img = img.convert("RGBA" if has_alpha else "RGB")
+        # 인코더가 img.info의 주석(comment) 등을 다시 써넣으므로 비움 (색 프로파일만 따로 넘김)
+        img.info.clear()
+
+        options = {"quality": quality}
+        if icc_profile:
+            options["icc_profile"] = icc_profile
+        if image_format == "JPEG":
+            options.update(optimize=True, progressive=True)
+        else:
+            options.update(method=4)
+        img.save(dest, image_format, **options)
+
+    remaining = find_metadata_segments(dest, image_format)
+    if remaining:
+        raise MetadataNotStripped(", ".join(remaining))
+    return has_metadata or resized or flattened
+
+
+def render_width_variant(src: Path, dest: Path, width: int, quality: int):
+    """가로 width 픽셀로 줄인 JPEG 변형 생성 (세로는 비율 유지, 확대하지 않음)"""
+    with Image.open(src) as img:
+        img.draft("RGB", (width, width))
+        img = ImageOps.exif_transpose(img)
+        width = min(width, img.width)
+        height = max(1, round(img.height * width / img.width))
+        img = img.convert("RGB").resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        img.save(dest, "JPEG", quality=quality, optimize=True, progressive=True)
+
+
+class ImageProcessor:
+    """업로드 요청에서 쓰는 이미지 정규화 작업 풀"""
+
+    def __init__(self, image_format: str, max_dimension: int, quality: int, max_workers: int):
+        self.image_format = image_format.upper()
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="image"
+                )
+
+    def stop(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
+
+    def _discard(self, *paths: Path):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _process(
+        self, stored: StoredFile, filename: str, image_format: str, forced: bool
+    ) -> Tuple[StoredFile, str]:
+        dest = blob_store.temp_path()
+        try:
+            required = normalize_image(
+                stored.path, dest, image_format, self.max_dimension, self.quality, flatten_alpha=forced
+            )
+        except MetadataNotStripped as e:
+            # 원본에도 메타데이터가 있으므로 어느 쪽도 저장하지 않음
+            logger.error(f"이미지 메타데이터 제거 실패 ({filename}): {e}")
+            self._discard(dest, stored.path)
+            raise
+        except Exception as e:
+            if forced:
+                # 형식이 고정된 경우(자산 이미지 .jpg) 원본을 다른 형식 그대로 저장하지 않음
+                self._discard(dest, stored.path)
+                raise
+            logger.warning(f"이미지 정규화 실패, 원본 저장 ({filename}): {e}")
+            required = None
+        if required is None:
+            self._discard(dest)
+            return stored, filename
+
+        size = dest.stat().st_size
+        # 형식이 고정된 경우 원본이 더 작아도 재인코딩한 파일을 쓴다 (확장자/Content-Type이 맞도록)
+        if not forced and not required and size >= stored.size:
+            os.remove(dest)
+            return stored, filename
+
+        os.remove(stored.path)
+        stem = os.path.splitext(filename)[0]
+        normalized = StoredFile(path=dest, size=size, sha256=_file_sha256(dest))
+        return normalized, stem + OUTPUT_EXTENSIONS[image_format]
+
+    async def normalize(
+        self,
+        stored: StoredFile,
+        filename: str,
+        image_format: Optional[str] = None
+    ) -> Tuple[StoredFile, str]:
+        """
+        받은 임시 파일을 정규화 (정규화한 임시 파일, 바뀐 확장자의 파일명)
+
+        이미지가 아니거나 원본을 그대로 써도 되면 그대로 돌려준다.
+        image_format을 지정하면 항상 그 형식으로 저장하고(투명도는 흰 배경에 합성),
+        그렇게 할 수 없으면 임시 파일을 지우고 예외를 낸다.
+        """
+        if not is_normalizable(filename):
+            return stored, filename
+        forced = image_format is not None
+        image_format = (image_format or self.image_format).upper()
+
+        with self._lock:
+            executor = self._executor
+        if executor is None:
+            return await run_in_threadpool(self._process, stored, filename, image_format, forced)
+        return await asyncio.wrap_future(executor.submit(self._process, stored, filename, image_format, forced))
+
+
+# 전역 처리기 인스턴스
+image_processor = ImageProcessor(
+    settings.IMAGE_OUTPUT_FORMAT, settings.IMAGE_MAX_DIMENSION, settings.IMAGE_QUALITY, settings.IMAGE_WORKERS
+)
@@ -0,0 +1,165 @@
+"""
+QR 라벨 시트 한 장 그리기 (프로세스 풀 작업자에서 실행)
+
+작업자 프로세스가 이 모듈만 불러오도록 설정(app.core.config)이나 DB를 import하지 않는다.
+필요한 값은 모두 SheetLayout/라벨 목록으로 넘겨받는다.
+"""
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from io import BytesIO
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import segno
+from PIL import Image, ImageDraw, ImageFont
+
+MM_PER_INCH = 25.4
+
+# 작업자 프로세스마다 기억해 두는 QR 부호화 결과 수 (마스크 선택이 렌더링 시간 대부분이라 재출력 시 재사용)
+QR_MATRIX_CACHE_SIZE = 8192
+
+# (QR 내용, 자산번호, 자산명)
+Label = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class SheetLayout:
+    columns: int = 3
+    rows: int = 8
+    page_width_mm: float = 210.0  # A4
+    page_height_mm: float = 297.0
+    margin_mm: float = 8.0
+    dpi: int = 300
+    error: str = "h"
+    border: int = 2  # QR 여백 (모듈 수)
+    font_path: str = ""
+    guides: bool = True  # 자르는 선 (가는 테두리)
+
+    @property
+    def per_page(self) -> int:
+        return self.columns * self.rows
+
+    def px(self, mm: float) -> int:
+        return round(mm / MM_PER_INCH * self.dpi)
+
+    @property
+    def page_size(self) -> Tuple[int, int]:
+        return self.px(self.page_width_mm), self.px(self.page_height_mm)
+
+    @property
+    def page_size_pt(self) -> Tuple[float, float]:
+        """PDF 페이지 크기 (1pt = 1/72인치)"""
+        return (
+            round(self.page_width_mm / MM_PER_INCH * 72, 2),
+            round(self.page_height_mm / MM_PER_INCH * 72, 2)
+        )
+
+
+# 작업자 프로세스마다 한 번만 불러오는 글꼴 ((경로, 크기) → 글꼴)
+_fonts: Dict[Tuple[str, int], ImageFont.ImageFont] = {}
+
+
+def _font(path: str, size: int):
+    key = (path, size)
+    font = _fonts.get(key)
+    if font is None:
+        if path:
+            try:
+                font = ImageFont.truetype(path, size)
+            except OSError:
+                font = None
+        if font is None:
+            # 기본 글꼴에는 한글이 없으므로 운영에서는 LABEL_FONT_PATH 지정
+            font = ImageFont.load_default(size=size)
+        _fonts[key] = font
+    return font
+
+
+@lru_cache(maxsize=QR_MATRIX_CACHE_SIZE)
+def _qr_matrix(data: str, error: str) -> Tuple[int, bytes]:
+    """(한 변 모듈 수, 모듈당 1바이트 픽셀) - 단일 QR 이미지와 같은 부호화(마스크 자동 선택)"""
+    matrix = segno.make(data, error=error, micro=False).matrix
+    return len(matrix), b"".join(bytes(0 if dark else 255 for dark in row) for row in matrix)
+
+
+def _qr_image(data: str, error: str, border: int, side: int) -> Optional[Image.Image]:
+    """모듈 경계가 픽셀에 맞도록 side 이하의 정수 배율로 그린 QR (여백 border 모듈 포함)"""
+    modules, raw = _qr_matrix(data, error)
+    scale = side // (modules + border * 2)
+    if scale < 1:
+        return None
+    code = Image.frombytes("L", (modules, modules), raw).convert("1", dither=Image.Dither.NONE)
+    image = Image.new("1", ((modules + border * 2) * scale,) * 2, 1)
+    image.paste(code.resize((modules * scale, modules * scale), Image.NEAREST), (border * scale, border * scale))
+    return image
+
+
+def _fit_text(draw: ImageDraw.ImageDraw, text: str, font, width: int) -> str:
+    """가로 폭에 맞게 자름 (넘치면 말줄임)"""
+    if draw.textlength(text, font=font) <= width:
+        return text
+    while text and draw.textlength(text + "…", font=font) > width:
+        text = text[:-1]
+    return text + "…"
+
+
+def draw_sheet(labels: Sequence[Label], layout: SheetLayout) -> Image.Image:
+    """
+    라벨 목록을 격자로 배치한 1비트 흑백 페이지 이미지
+
+    인쇄용 흑백 라벨이라 회색조 대신 1비트로 그린다. (압축 후 크기/압축 시간이 몇 분의 1)
+    """
+    width, height = layout.page_size
+    page = Image.new("1", (width, height), 1)
+    draw = ImageDraw.Draw(page)
+
+    margin = layout.px(layout.margin_mm)
+    cell_w = (width - margin * 2) // layout.columns
+    cell_h = (height - margin * 2) // layout.rows
+    padding = max(2, min(cell_w, cell_h) // 20)
+
+    font_size = max(10, cell_h // 12)
+    number_font = _font(layout.font_path, font_size)
+    name_font = _font(layout.font_path, max(9, font_size * 4 // 5))
+    line_gap = max(2, font_size // 5)
+    text_h = font_size + line_gap + font_size * 4 // 5 + line_gap
+    qr_side = min(cell_w, cell_h - text_h) - padding * 2
+
+    for index, (data, asset_number, name) in enumerate(labels[:layout.per_page]):
+        row, column = divmod(index, layout.columns)
+        left = margin + column * cell_w
+        top = margin + row * cell_h
+        if layout.guides:
+            draw.rectangle([left, top, left + cell_w - 1, top + cell_h - 1], outline=0)
+
+        qr = _qr_image(data, layout.error, layout.border, qr_side)
+        if qr is not None:
+            page.paste(qr, (left + (cell_w - qr.width) // 2, top + padding))
+            text_top = top + padding + qr.height
+        else:
+            text_top = top + padding
+
+        text_width = cell_w - padding * 2
+        center = left + cell_w // 2
+        number = _fit_text(draw, asset_number, number_font, text_width)
+        draw.text((center, text_top), number, fill=0, font=number_font, anchor="mt")
+        if name:
+            name = _fit_text(draw, name, name_font, text_width)
+            draw.text((center, text_top + font_size + line_gap), name, fill=0, font=name_font, anchor="mt")
+
+    return page
+
+
+def render_sheet(labels: List[Label], layout: SheetLayout, kind: str) -> Tuple[int, int, bytes]:
+    """
+    페이지 한 장 렌더링 (작업자 프로세스 진입점)
+
+    kind == "png": PNG 파일 바이트
+    kind == "pdf": PDF 이미지 객체에 바로 넣을 수 있는 FlateDecode 압축 1비트 픽셀 (1 = 흰색)
+    """
+    page = draw_sheet(labels, layout)
+    if kind == "png":
+        buffer = BytesIO()
+        page.save(buffer, format="PNG", optimize=False, dpi=(layout.dpi, layout.dpi))
+        return page.width, page.height, buffer.getvalue()
+    return page.width, page.height, zlib.compress(page.tobytes(), 6)
@@ -0,0 +1,163 @@
+"""
+QR 라벨 시트 일괄 생성
+
+자산 수천 개의 라벨을 한 요청으로 만든다.
+페이지 단위로 프로세스 풀에 나눠 그리고(label_render.render_sheet), 끝나는 대로가 아니라
+페이지 순서대로 바로 내보낸다. 한 번에 맡겨두는 페이지는 작업자 수의 2배까지라 메모리가 일정하다.
+    pdf: 페이지마다 이미지 한 장인 PDF를 직접 써서 스트리밍 (전체를 모았다가 저장하지 않음)
+    png: 한 장이면 PNG, 여러 장이면 페이지별 PNG를 ZIP으로 스트리밍
+"""
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.label_render import Label, SheetLayout, render_sheet
+from app.services.zip_stream import ZipMember, stream_zip
+
+MEDIA_TYPES = {"pdf": "application/pdf", "png": "image/png"}
+
+
+class PDFStreamWriter:
+    """받은 페이지를 바로 내보내는 최소 PDF 작성기 (페이지 트리와 xref는 마지막에)"""
+
+    CATALOG_ID = 1
+    PAGES_ID = 2
+
+    def __init__(self, page_size_pt: Tuple[float, float]):
+        self.page_size_pt = page_size_pt
+        self.offset = 0
+        self.offsets: Dict[int, int] = {}
+        self.page_ids: List[int] = []
+        self._next_id = 3
+
+    def _emit(self, data: bytes) -> bytes:
+        self.offset += len(data)
+        return data
+
+    def _object(self, obj_id: int, body: str, stream: Optional[bytes] = None) -> bytes:
+        self.offsets[obj_id] = self.offset
+        parts = [f"{obj_id} 0 obj\n{body}".encode("ascii")]
+        if stream is not None:
+            parts += [b"\nstream\n", stream, b"\nendstream"]
+        parts.append(b"\nendobj\n")
+        return self._emit(b"".join(parts))
+
+    def begin(self) -> bytes:
+        return self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def add_page(self, width: int, height: int, pixels: bytes) -> bytes:
+        """FlateDecode 압축된 1비트 픽셀(행 단위 바이트 정렬, 1 = 흰색)로 페이지 한 장 추가"""
+        image_id, content_id, page_id = self._next_id, self._next_id + 1, self._next_id + 2
+        self._next_id += 3
+        self.page_ids.append(page_id)
+
+        page_w, page_h = self.page_size_pt
+        content = f"q {page_w} 0 0 {page_h} 0 0 cm /Im0 Do Q".encode("ascii")
+        return b"".join([
+            self._object(
+                image_id,
+                f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                f"/ColorSpace /DeviceGray /BitsPerComponent 1 /Filter /FlateDecode /Length {len(pixels)} >>",
+                pixels
+            ),
+            self._object(content_id, f"<< /Length {len(content)} >>", content),
+            self._object(
+                page_id,
+                f"<< /Type /Page /Parent {self.PAGES_ID} 0 R /MediaBox [0 0 {page_w} {page_h}] "
+                f"/Resources << /XObject << /Im0 {image_id} 0 R >> >> /Contents {content_id} 0 R >>"
+            ),
+        ])
+
+    def finish(self) -> bytes:
+        kids = " ".join(f"{page_id} 0 R" for page_id in self.page_ids)
+        data = self._object(self.PAGES_ID, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>")
+        data += self._object(self.CATALOG_ID, f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>")
+
+        xref_offset = self.offset
+        size = self._next_id
+        lines = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        lines += [f"{self.offsets[obj_id]:010d} 00000 n \n" for obj_id in range(1, size)]
+        lines.append(f"trailer\n<< /Size {size} /Root {self.CATALOG_ID} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n")
+        return data + self._emit("".join(lines).encode("ascii"))
+
+
+class LabelSheetRenderer:
+    """라벨 페이지를 그리는 프로세스 풀 (그리기/압축이 CPU 작업이라 스레드 대신 프로세스)"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.max_workers <= 0:
+            return
+        with self._lock:
+            if self._executor is None:
+                # 스레드가 도는 서버 프로세스를 fork하지 않도록 spawn
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+
+    def stop(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def pages(self, labels: List[Label], layout: SheetLayout, kind: str) -> Iterator[Tuple[int, int, bytes]]:
+        """페이지 순서대로 (가로, 세로, 데이터) - 풀이 없으면 현재 스레드에서 그린다"""
+        chunks = (labels[i:i + layout.per_page] for i in range(0, len(labels), layout.per_page))
+        with self._lock:
+            executor = self._executor
+        if executor is None:
+            for chunk in chunks:
+                yield render_sheet(chunk, layout, kind)
+            return
+
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(render_sheet, chunk, layout, kind))
+                if len(pending) >= self.max_workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # 클라이언트가 중간에 끊으면 남은 페이지 취소
+            for future in pending:
+                future.cancel()
+
+    def stream(self, labels: List[Label], layout: SheetLayout, kind: str) -> Iterator[bytes]:
+        """라벨 시트 파일 바이트 청크 생성기 (StreamingResponse에 그대로 전달)"""
+        if kind == "pdf":
+            writer = PDFStreamWriter(layout.page_size_pt)
+            yield writer.begin()
+            for width, height, pixels in self.pages(labels, layout, kind):
+                yield writer.add_page(width, height, pixels)
+            yield writer.finish()
+        elif len(labels) <= layout.per_page:
+            for _, _, data in self.pages(labels, layout, kind):
+                yield data
+        else:
+            yield from stream_zip(
+                ZipMember(f"labels-{number:04d}.png", data=data)
+                for number, (_, _, data) in enumerate(self.pages(labels, layout, kind), start=1)
+            )
+
+
+def sheet_layout(columns: int, rows: int, guides: bool = True) -> SheetLayout:
+    return SheetLayout(
+        columns=columns,
+        rows=rows,
+        dpi=settings.LABEL_DPI,
+        font_path=settings.LABEL_FONT_PATH,
+        guides=guides
+    )
+
+
+# 전역 렌더러 인스턴스
+label_renderer = LabelSheetRenderer(settings.LABEL_WORKERS)
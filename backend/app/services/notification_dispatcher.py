@@ -0,0 +1,481 @@
+"""
+알림 비동기 발송기
+
+요청 처리 중에는 알림을 로컬 저널 파일에 한 줄 추가만 하고,
+백그라운드 스레드가 모아서 한 번의 트랜잭션으로 일괄 INSERT 한다.
+
+- 저널: spool 디렉터리의 current.jsonl (append 전용)
+- 발송: current.jsonl → segment-*.jsonl 로 회전 후 읽어서 INSERT, 커밋되면 삭제
+- 재시작: 남아 있는 segment/current 파일을 다시 처리 (at-least-once)
+- 여러 워커: spool 디렉터리를 같이 쓰므로 segment는 claimed-<pid>-* 로 이름을 바꿔(원자적) 가져간 워커만 처리
+- 실패: DB는 살아 있는데 같은 segment가 계속 실패하면 failed/ 로 옮기고 다음 segment 진행
+- 병합: 같은 사용자/type/related_id 알림이 시간 창 안에 또 오면 기존 안 읽은 행의 count만 올림
+- 다이제스트: 지정한 type은 digest.jsonl 에 모았다가 주기마다 사용자별 1건으로 묶어서 기록
+- UnitOfWork 알림: 저널 대신 요청 트랜잭션 안에서 바로 기록(write_in_transaction), 커밋 후 publish
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import orjson
+from sqlalchemy import insert, text, update
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.notification import Notification
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class UserIdCache:
+    """username → user_id 캐시 (미스는 IN 쿼리 한 번으로 조회)"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, db, usernames: Iterable[str]) -> Dict[str, int]:
+        now = time.monotonic()
+        resolved = {}
+        missing = set()
+
+        with self._lock:
+            for username in set(usernames):
+                entry = self._entries.get(username)
+                if entry and entry[1] > now:
+                    resolved[username] = entry[0]
+                else:
+                    missing.add(username)
+
+        if missing:
+            rows = db.query(User.username, User.id).filter(User.username.in_(missing)).all()
+            with self._lock:
+                for username, user_id in rows:
+                    self._entries[username] = (user_id, now + self.ttl)
+                    resolved[username] = user_id
+
+        return resolved
+
+    def invalidate(self, username: Optional[str] = None):
+        with self._lock:
+            if username is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(username, None)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class NotificationDispatcher:
+    """저널 기반 알림 일괄 발송기"""
+
+    JOURNAL_NAME = "current.jsonl"
+    DIGEST_JOURNAL_NAME = "digest.jsonl"
+    CLAIM_PREFIX = "claimed"
+    FAILED_DIR = "failed"
+    # 다이제스트 본문에 나열할 최대 알림 수
+    DIGEST_MAX_LINES = 10
+
+    def __init__(
+        self,
+        spool_dir: str,
+        batch_size: int,
+        flush_interval: float,
+        user_cache_ttl: float,
+        coalesce_window: float = 0,
+        digest_types: Optional[Set[str]] = None,
+        max_attempts: int = 5
+    ):
+        self.spool_dir = Path(spool_dir)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.flush_interval = flush_interval
+        self.coalesce_window = coalesce_window
+        self.digest_types = set(digest_types or ())
+        self.users = UserIdCache(user_cache_ttl)
+
+        self._journal_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._segment_seq = 0
+        self._failures: Dict[str, int] = {}  # segment 이름 → 실패 횟수
+        self._listeners: List[Callable[[List[dict]], None]] = []
+
+    def add_listener(self, listener: Callable[[List[dict]], None]):
+        """
+        일괄 기록이 커밋된 뒤 호출될 콜백 등록 (인자: 기록된 알림 행 목록)
+
+        기존 안 읽은 알림에 병합된 행은 coalesced=True 로 표시된다.
+        """
+        self._listeners.append(listener)
+
+    @property
+    def journal_path(self) -> Path:
+        return self.spool_dir / self.JOURNAL_NAME
+
+    @property
+    def digest_journal_path(self) -> Path:
+        return self.spool_dir / self.DIGEST_JOURNAL_NAME
+
+    def enqueue(
+        self,
+        username: str,
+        title: str,
+        message: str,
+        notification_type: str,
+        related_id: int = None
+    ):
+        """알림 1건을 저널에 기록 (DB 접근 없음)"""
+        record = self.make_record(username, title, message, notification_type, related_id)
+        line = orjson.dumps(record) + b"\n"
+
+        if notification_type in self.digest_types:
+            self._append_digest([line])
+            return
+
+        with self._journal_lock:
+            with open(self.journal_path, "ab") as journal:
+                journal.write(line)
+            self._pending += 1
+            pending = self._pending
+
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    @staticmethod
+    def make_record(
+        username: str,
+        title: str,
+        message: str,
+        notification_type: str,
+        related_id: int = None
+    ) -> dict:
+        return {
+            "username": username,
+            "title": title,
+            "message": message,
+            "type": notification_type,
+            "related_id": related_id,
+            "created_at": datetime.now().isoformat()
+        }
+
+    def _append_digest(self, lines: List[bytes]):
+        with self._journal_lock:
+            with open(self.digest_journal_path, "ab") as journal:
+                journal.writelines(lines)
+
+    def write_in_transaction(self, db, records: List[dict]) -> List[dict]:
+        """
+        호출자의 트랜잭션 안에서 알림 행 기록 (커밋은 호출자). 기록한 행 반환
+
+        엔티티 변경과 같은 트랜잭션이라 함께 커밋되거나 함께 롤백된다.
+        커밋 후 publish(rows)로 카운터 갱신/실시간 푸시를 한다. (푸시는 커밋 후라 유실될 수 있지만 행은 남음)
+        다이제스트 type은 주기 작업이 묶어서 기록하므로 커밋 전에 다이제스트 저널에 먼저 쓴다.
+        이쪽은 at-least-once라 이후 롤백되면 실제로 반영되지 않은 변경의 알림이 다이제스트에 남을 수 있다.
+        """
+        digests = [record for record in records if record["type"] in self.digest_types]
+        if digests:
+            self._append_digest([orjson.dumps(record) + b"\n" for record in digests])
+        records = [record for record in records if record["type"] not in self.digest_types]
+        if not records:
+            return []
+        return self.write_batch(db, records)
+
+    def publish(self, rows: List[dict]):
+        """커밋된 알림 행을 등록된 콜백에 전달"""
+        for listener in self._listeners:
+            try:
+                listener(rows)
+            except Exception as e:
+                logger.error(f"알림 기록 후 처리 실패: {e}")
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="notification-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        # 종료 직전까지 쌓인 알림도 처리 (실패하면 다음 기동 시 재처리)
+        self.flush()
+
+    def _run(self):
+        # 이전 프로세스가 남긴 저널부터 처리
+        self.flush()
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """저널을 회전하고 남은 segment를 모두 DB에 기록. 기록한 건수 반환"""
+        with self._flush_lock:
+            with self._journal_lock:
+                self._rotate(self.journal_path, "segment")
+                self._pending = 0
+            return self._write_segments("segment")
+
+    def flush_digest(self) -> int:
+        """다이제스트 저널을 사용자별 1건으로 묶어 기록 (주기 작업 진입점)"""
+        with self._flush_lock:
+            with self._journal_lock:
+                self._rotate(self.digest_journal_path, "digest")
+            return self._write_segments("digest", self._build_digests)
+
+    def _rotate(self, journal_path: Path, prefix: str):
+        """저널 파일을 처리 대기 segment로 이름 변경 (_journal_lock 안에서 호출)"""
+        if not journal_path.exists() or journal_path.stat().st_size == 0:
+            return
+        self._segment_seq += 1
+        segment = self.spool_dir / f"{prefix}-{time.time_ns():020d}-{os.getpid()}-{self._segment_seq}.jsonl"
+        os.replace(journal_path, segment)
+
+    def _write_segments(self, prefix: str, transform: Callable[[List[dict]], List[dict]] = None) -> int:
+        self._release_dead_claims(prefix)
+        written = 0
+        for segment in self._claim_segments(prefix):
+            name = segment.name.split("-", 2)[2]  # 가져가기 전 이름
+            try:
+                written += self._write_segment(segment, transform)
+                self._failures.pop(name, None)
+            except Exception as e:
+                logger.error(f"알림 일괄 기록 실패 ({name}): {e}")
+                if not self._db_reachable():
+                    # DB 장애 - segment를 남겨두고 다음 주기에 재시도 (실패 횟수에 넣지 않음)
+                    break
+                # DB는 정상인데 실패 - 이 segment의 문제로 보고 다음 segment는 계속 진행
+                attempts = self._failures.get(name, 0) + 1
+                self._failures[name] = attempts
+                if attempts >= self.max_attempts:
+                    self._quarantine(segment, name, attempts)
+        return written
+
+    def _claim_segments(self, prefix: str) -> List[Path]:
+        """처리할 segment를 이 워커 이름으로 바꿔서 가져옴 (이미 가져간 것 포함, 오래된 순)"""
+        own = f"{self.CLAIM_PREFIX}-{os.getpid()}-"
+        claimed = sorted(self.spool_dir.glob(f"{own}{prefix}-*.jsonl"))
+        for segment in sorted(self.spool_dir.glob(f"{prefix}-*.jsonl")):
+            target = segment.with_name(own + segment.name)
+            try:
+                os.rename(segment, target)
+            except FileNotFoundError:
+                continue  # 다른 워커가 먼저 가져감
+            claimed.append(target)
+        return claimed
+
+    def _release_dead_claims(self, prefix: str):
+        """종료된 워커가 가져간 채 남긴 segment를 원래 이름으로 되돌림 (다음 처리 때 다시 가져감)"""
+        for segment in self.spool_dir.glob(f"{self.CLAIM_PREFIX}-*-{prefix}-*.jsonl"):
+            _, pid, name = segment.name.split("-", 2)
+            if int(pid) == os.getpid() or _pid_alive(int(pid)):
+                continue
+            try:
+                os.rename(segment, segment.with_name(name))
+            except FileNotFoundError:
+                pass  # 다른 워커가 먼저 되돌림
+
+    def _quarantine(self, segment: Path, name: str, attempts: int):
+        failed_dir = self.spool_dir / self.FAILED_DIR
+        failed_dir.mkdir(exist_ok=True)
+        try:
+            os.replace(segment, failed_dir / name)
+        except FileNotFoundError:
+            pass
+        self._failures.pop(name, None)
+        logger.error(f"알림 segment {attempts}회 실패, {failed_dir / name} 로 격리")
+
+    def _db_reachable(self) -> bool:
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            return False
+        finally:
+            db.close()
+
+    def _read_segment(self, segment: Path) -> List[dict]:
+        records = []
+        with open(segment, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    # 기록 도중 종료되어 잘린 줄
+                    logger.warning(f"손상된 알림 저널 줄 무시 ({segment.name})")
+        return records
+
+    def _write_segment(self, segment: Path, transform: Callable[[List[dict]], List[dict]] = None) -> int:
+        records = self._read_segment(segment)
+        if transform:
+            records = transform(records)
+        rows = []
+        if records:
+            db = SessionLocal()
+            try:
+                rows = self.write_batch(db, records)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        segment.unlink(missing_ok=True)
+
+        if rows:
+            self.publish(rows)
+        return len(rows)
+
+    def _build_digests(self, records: List[dict]) -> List[dict]:
+        """사용자별로 모아 다이제스트 알림 1건씩 생성 (1건뿐이면 그대로)"""
+        by_user: Dict[str, List[dict]] = {}
+        for record in records:
+            by_user.setdefault(record["username"], []).append(record)
+
+        digests = []
+        for username, items in by_user.items():
+            if len(items) == 1:
+                digests.append(items[0])
+                continue
+            lines = [f"- {item['title']}: {item['message']}" for item in items[-self.DIGEST_MAX_LINES:]]
+            if len(items) > self.DIGEST_MAX_LINES:
+                lines.append(f"외 {len(items) - self.DIGEST_MAX_LINES}건")
+            digests.append({
+                "username": username,
+                "title": f"새 알림 {len(items)}건",
+                "message": "\n".join(lines),
+                "type": "digest",
+                "related_id": None,
+                "created_at": items[-1]["created_at"],
+                "count": len(items)
+            })
+        return digests
+
+    def _merge_in_batch(self, records: List[dict]) -> Dict[object, dict]:
+        """배치 안에서 같은 (username, type, related_id) 알림을 하나로 합침"""
+        merged: Dict[object, dict] = {}
+        for record in records:
+            record = dict(record, count=record.get("count", 1))
+            if self.coalesce_window > 0 and record.get("related_id") is not None:
+                key = (record["username"], record["type"], record["related_id"])
+            else:
+                key = object()  # 병합 대상 아님
+
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = record
+            else:
+                existing["count"] += record["count"]
+                existing["title"] = record["title"]
+                existing["message"] = record["message"]
+                existing["created_at"] = record["created_at"]
+        return merged
+
+    def _find_coalesce_targets(self, db, keys: List[tuple]) -> Dict[tuple, tuple]:
+        """시간 창 안의 안 읽은 알림 중 병합할 행 조회: key → (id, count)"""
+        if not keys:
+            return {}
+        since = datetime.now() - timedelta(seconds=self.coalesce_window)
+        rows = db.query(
+            Notification.id, Notification.username, Notification.type,
+            Notification.related_id, Notification.count
+        ).filter(
+            Notification.username.in_({key[0] for key in keys}),
+            Notification.related_id.in_({key[2] for key in keys}),
+            Notification.is_read == False,
+            Notification.created_at >= since
+        ).order_by(Notification.id).all()
+
+        wanted = set(keys)
+        targets = {}
+        for notification_id, username, notification_type, related_id, count in rows:
+            key = (username, notification_type, related_id)
+            if key in wanted:
+                targets[key] = (notification_id, count or 1)  # 가장 최근 행이 남음
+        return targets
+
+    def write_batch(self, db, records: List[dict]) -> List[dict]:
+        """알림 레코드 목록을 병합 후 batch_size 단위로 INSERT/UPDATE (커밋은 호출자가 수행). 기록한 행 반환"""
+        user_ids = self.users.resolve(db, (record["username"] for record in records))
+        # 존재하지 않는 사용자 - 기존과 동일하게 무시
+        records = [record for record in records if record["username"] in user_ids]
+
+        merged = self._merge_in_batch(records)
+        targets = self._find_coalesce_targets(db, [key for key in merged if isinstance(key, tuple)])
+
+        inserts, written = [], []
+        for key, record in merged.items():
+            created_at = datetime.fromisoformat(record["created_at"])
+            row = {
+                "user_id": user_ids[record["username"]],
+                "username": record["username"],
+                "title": record["title"],
+                "message": record["message"],
+                "type": record["type"],
+                "related_id": record.get("related_id"),
+                "is_read": False,
+                "count": record["count"],
+                "created_at": created_at
+            }
+            target = targets.get(key) if isinstance(key, tuple) else None
+            if target:
+                notification_id, count = target
+                # 조회 후 사용자가 읽음 처리했을 수 있으므로 안 읽은 상태일 때만 병합
+                result = db.execute(
+                    update(Notification)
+                    .where(Notification.id == notification_id, Notification.is_read == False)
+                    .values(
+                        title=row["title"],
+                        message=row["message"],
+                        count=Notification.count + record["count"],
+                        created_at=created_at  # 목록 맨 위로
+                    )
+                )
+                if result.rowcount:
+                    written.append(dict(row, id=notification_id, count=count + record["count"], coalesced=True))
+                    continue
+            inserts.append(row)
+            written.append(dict(row, coalesced=False))
+
+        for start in range(0, len(inserts), self.batch_size):
+            db.execute(insert(Notification), inserts[start:start + self.batch_size])
+
+        return written
+
+
+# 전역 발송기 인스턴스
+notification_dispatcher = NotificationDispatcher(
+    spool_dir=settings.NOTIFICATION_SPOOL_DIR,
+    batch_size=settings.NOTIFICATION_BATCH_SIZE,
+    flush_interval=settings.NOTIFICATION_FLUSH_INTERVAL,
+    user_cache_ttl=settings.NOTIFICATION_USER_CACHE_TTL,
+    coalesce_window=settings.NOTIFICATION_COALESCE_WINDOW,
+    digest_types=settings.NOTIFICATION_DIGEST_TYPES,
+    max_attempts=settings.NOTIFICATION_SEGMENT_MAX_ATTEMPTS
+)
@@ -0,0 +1,149 @@
+"""
+알림 실시간 푸시 허브 (프로세스 내 pub/sub)
+
+- 사용자별 구독 큐에 이벤트를 전달 (SSE 엔드포인트가 소비)
+- 사용자별 최근 이벤트를 링 버퍼로 보관해 Last-Event-ID 재연결 시 이어서 전달
+- 발송기 스레드 등 이벤트 루프 밖에서도 publish 가능 (call_soon_threadsafe)
+"""
+import asyncio
+import itertools
+import logging
+import threading
+import uuid
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (event_id, event, data)
+Event = Tuple[str, str, dict]
+
+
+class NotificationHub:
+    """사용자 단위 이벤트 허브"""
+
+    def __init__(self, history_size: int = 50, queue_size: int = 100):
+        self.history_size = history_size
+        self.queue_size = queue_size
+        # 서버 재시작 후의 Last-Event-ID를 구분하기 위한 기동 ID
+        self.boot_id = uuid.uuid4().hex[:8]
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._seq = itertools.count(1)
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._history: Dict[str, Deque[Tuple[int, Event]]] = {}
+        # 링 버퍼에서 밀려난 마지막 이벤트 번호 (재연결 시 누락 판단용)
+        self._evicted_seq: Dict[str, int] = {}
+        self._connected: Set[str] = set()
+        self._connected_lock = threading.Lock()
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """앱 기동 시 이벤트 루프 연결"""
+        self._loop = loop
+
+    def is_connected(self, username: str) -> bool:
+        with self._connected_lock:
+            return username in self._connected
+
+    def connected_users(self) -> Set[str]:
+        with self._connected_lock:
+            return set(self._connected)
+
+    def publish(self, username: str, event: str, data: dict):
+        """이벤트 발행 (스레드 안전)"""
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._publish(username, event, data)
+        else:
+            self._loop.call_soon_threadsafe(self._publish, username, event, data)
+
+    def _publish(self, username: str, event: str, data: dict):
+        seq = next(self._seq)
+        item = (f"{self.boot_id}-{seq}", event, data)
+
+        history = self._history.get(username)
+        if history is None:
+            history = self._history[username] = deque(maxlen=self.history_size)
+        if len(history) == self.history_size:
+            self._evicted_seq[username] = history[0][0]
+        history.append((seq, item))
+
+        for queue in list(self._subscribers.get(username, ())):
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # 너무 느린 연결 - 끊고 Last-Event-ID로 재연결하게 한다
+                self._unsubscribe(username, queue)
+
+    def _replay(self, username: str, last_event_id: Optional[str]) -> Tuple[bool, list]:
+        """last_event_id 이후 이벤트 목록. 버퍼에서 이어갈 수 없으면 (False, [])"""
+        if not last_event_id:
+            return True, []
+        boot_id, _, seq = last_event_id.partition("-")
+        if boot_id != self.boot_id or not seq.isdigit():
+            return False, []
+
+        last_seq = int(seq)
+        if self._evicted_seq.get(username, 0) > last_seq:
+            return False, []
+        history = self._history.get(username, ())
+        return True, [item for item_seq, item in history if item_seq > last_seq]
+
+    def _unsubscribe(self, username: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(username)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[username]
+                with self._connected_lock:
+                    self._connected.discard(username)
+        # 남은 이벤트를 비우고 대기 중인 소비자에게 종료 알림
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def subscribe(
+        self,
+        username: str,
+        last_event_id: Optional[str] = None,
+        heartbeat: float = 25.0
+    ) -> AsyncIterator[Optional[Event]]:
+        """
+        이벤트 구독 (async generator)
+
+        None은 heartbeat 시점을 뜻한다. 재연결 시 버퍼에 없는 구간이면
+        ("", "resync", {}) 이벤트를 먼저 보내 클라이언트가 목록을 다시 불러오게 한다.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(username, set()).add(queue)
+        with self._connected_lock:
+            self._connected.add(username)
+
+        try:
+            complete, missed = self._replay(username, last_event_id)
+            if not complete:
+                yield ("", "resync", {})
+            for item in missed:
+                yield item
+
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if item is None:
+                    # 큐 초과로 구독 해제됨 - 클라이언트가 재연결
+                    return
+                yield item
+        finally:
+            self._unsubscribe(username, queue)
+
+
+# 전역 허브 인스턴스
+notification_hub = NotificationHub()
@@ -0,0 +1,110 @@
+"""
+알림 보관/정리 작업
+
+- 읽은 지 오래된 알림: notifications → notifications_archive 로 이동
+- 보관 기간이 더 지난 알림: notifications_archive 에서 삭제
+작은 배치 단위로 나눠 커밋하고 배치 사이에 쉬어서 알림 테이블 잠금을 짧게 유지한다.
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select, text
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.notification import Notification, NotificationArchive
+
+logger = logging.getLogger(__name__)
+
+# notifications → notifications_archive 로 복사할 컬럼 (순서 동일)
+ARCHIVE_COLUMNS = [
+    "id", "user_id", "username", "title", "message", "type",
+    "related_id", "is_read", "count", "created_at", "read_at"
+]
+
+
+def archive_read_notifications(db, cutoff: datetime, batch_size: int, pause: float = 0.0) -> int:
+    """cutoff 이전에 생성된 읽은 알림을 보관 테이블로 이동. 이동한 건수 반환"""
+    moved = 0
+    while True:
+        ids = db.execute(
+            select(Notification.id)
+            .where(Notification.is_read == True, Notification.created_at < cutoff)
+            .order_by(Notification.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+
+        source = select(*[getattr(Notification, name) for name in ARCHIVE_COLUMNS]).where(Notification.id.in_(ids))
+        db.execute(
+            insert(NotificationArchive)
+            .from_select([getattr(NotificationArchive, name) for name in ARCHIVE_COLUMNS], source)
+        )
+        db.execute(delete(Notification).where(Notification.id.in_(ids)))
+        db.commit()
+
+        moved += len(ids)
+        if len(ids) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return moved
+
+
+def purge_archived_notifications(db, cutoff: datetime, batch_size: int, pause: float = 0.0) -> int:
+    """cutoff 이전에 생성된 보관 알림을 삭제. 삭제한 건수 반환"""
+    purged = 0
+    while True:
+        ids = db.execute(
+            select(NotificationArchive.id)
+            .where(NotificationArchive.created_at < cutoff)
+            .order_by(NotificationArchive.created_at)
+            .limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+
+        db.execute(delete(NotificationArchive).where(NotificationArchive.id.in_(ids)))
+        db.commit()
+
+        purged += len(ids)
+        if len(ids) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return purged
+
+
+def compact_notification_tables(db):
+    """삭제로 생긴 빈 공간 정리 (MySQL InnoDB는 온라인으로 테이블 재구성)"""
+    if db.bind.dialect.name != "mysql":
+        return
+    db.execute(text(f"OPTIMIZE TABLE {Notification.__tablename__}"))
+    db.execute(text(f"OPTIMIZE TABLE {NotificationArchive.__tablename__}"))
+    db.commit()
+
+
+def run_notification_retention():
+    """주기 작업 진입점"""
+    now = datetime.now()
+    batch_size = settings.NOTIFICATION_RETENTION_BATCH_SIZE
+    pause = settings.NOTIFICATION_RETENTION_PAUSE
+
+    db = SessionLocal()
+    try:
+        moved = archive_read_notifications(
+            db, now - timedelta(days=settings.NOTIFICATION_ARCHIVE_AFTER_DAYS), batch_size, pause
+        )
+        purged = purge_archived_notifications(
+            db, now - timedelta(days=settings.NOTIFICATION_PURGE_AFTER_DAYS), batch_size, pause
+        )
+        if moved or purged:
+            logger.info(f"알림 보관 {moved}건, 보관 알림 삭제 {purged}건")
+
+        threshold = settings.NOTIFICATION_COMPACT_THRESHOLD
+        if threshold > 0 and moved + purged >= threshold:
+            compact_notification_tables(db)
+    finally:
+        db.close()
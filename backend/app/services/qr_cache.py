@@ -0,0 +1,110 @@
+"""
+QR 코드 이미지 캐시
+
+QR 이미지는 내용(asset_number)과 렌더링 파라미터만으로 결정되므로
+(내용 + 파라미터) 해시를 키로 한 번 그린 결과를 재사용한다.
+    1단계: 메모리 LRU (개수 제한)
+    2단계: 디스크 LRU (DiskLRUCache, 크기 제한) - 재시작 후에도 유지
+키는 그대로 강한 ETag로 쓴다.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import Tuple
+
+import segno
+
+from app.core.config import settings
+from app.services.disk_cache import DiskLRUCache
+
+# 렌더링 방식이 바뀌면 올려서 기존 캐시/ETag를 무효화
+RENDER_VERSION = 1
+
+MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+@dataclass(frozen=True)
+class QRParams:
+    data: str
+    kind: str = "png"
+    scale: int = 10
+    border: int = 2
+    dark: str = "#000000"
+    light: str = "white"
+    error: str = "h"
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.kind]
+
+    def cache_key(self) -> str:
+        payload = json.dumps({"v": RENDER_VERSION, **asdict(self)}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def asset_qr_params(asset_number: str, **options) -> QRParams:
+    return QRParams(data=f"ASSET:{asset_number}", **options)
+
+
+def render_qr(params: QRParams) -> bytes:
+    qr = segno.make(params.data, error=params.error, micro=False)
+    buffer = BytesIO()
+    qr.save(
+        buffer,
+        kind=params.kind,
+        scale=params.scale,
+        border=params.border,
+        dark=params.dark,
+        light=params.light,
+    )
+    return buffer.getvalue()
+
+
+class QRCache:
+    """메모리 LRU + 디스크 LRU 2단계 캐시"""
+
+    def __init__(self, memory_items: int, disk: DiskLRUCache):
+        self.memory_items = memory_items
+        self.disk = disk
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, data: bytes):
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def get(self, params: QRParams) -> Tuple[bytes, str]:
+        """(이미지 바이트, 캐시 키) - 없으면 그려서 두 단계에 모두 저장"""
+        key = params.cache_key()
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data, key
+
+        path = self.disk.get(key)
+        if path is not None:
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                data = None
+        if data is None:
+            data = render_qr(params)
+            self.disk.put_bytes(key, data)
+
+        self._remember(key, data)
+        return data, key
+
+
+# 전역 캐시 인스턴스
+qr_cache = QRCache(
+    settings.QR_CACHE_MEMORY_ITEMS,
+    DiskLRUCache(Path(settings.QR_CACHE_DIR), settings.QR_CACHE_MAX_BYTES)
+)
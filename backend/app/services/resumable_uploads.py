@@ -0,0 +1,215 @@
+"""
+이어받기(재개) 가능한 업로드
+
+클라이언트는 업로드 세션을 만든 뒤 offset을 붙여 조각을 보내고, 끊기면 진행 상황(offset)을
+조회해서 빠진 바이트부터 다시 보낸다. 다 받으면 완료 요청으로 첨부파일을 만든다.
+
+세션 상태는 임시 디렉터리의 파일 두 개로만 관리한다. (DB 테이블 없음)
+    <id>.json  세션 정보 (수정 시각 = 마지막 활동 시각)
+    <id>.part  지금까지 받은 바이트 (크기 = 현재 offset)
+오래 활동이 없는 세션은 주기 작업(expire)이 지운다.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.storage import CHUNK_SIZE, StoredFile, UploadTooLarge
+
+
+class UploadOffsetMismatch(Exception):
+    """보낸 조각의 offset이 서버가 받은 크기와 다름 (offset = 서버 기준 현재 위치)"""
+
+    def __init__(self, offset: int):
+        super().__init__(offset)
+        self.offset = offset
+
+
+class UploadIncomplete(Exception):
+    """아직 다 받지 못한 세션을 완료하려 함"""
+
+
+@dataclass
+class UploadSession:
+    upload_id: str
+    entity_type: str
+    entity_id: int
+    filename: str
+    size: int
+    uploaded_by: str
+    created_at: float
+    offset: int = 0
+
+
+class ResumableUploads:
+    """업로드 세션 저장소"""
+
+    def __init__(self, root: Path, ttl: float):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _meta_path(self, upload_id: str) -> Path:
+        return self.root / f"{upload_id}.json"
+
+    def _part_path(self, upload_id: str) -> Path:
+        return self.root / f"{upload_id}.part"
+
+    def create(self, entity_type: str, entity_id: int, filename: str, size: int, uploaded_by: str) -> UploadSession:
+        session = UploadSession(
+            upload_id=uuid.uuid4().hex,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            filename=filename,
+            size=size,
+            uploaded_by=uploaded_by,
+            created_at=time.time()
+        )
+        self._part_path(session.upload_id).touch()
+        meta = asdict(session)
+        meta.pop("offset")
+        self._meta_path(session.upload_id).write_text(json.dumps(meta), encoding="utf-8")
+        return session
+
+    def get(self, upload_id: str) -> Optional[UploadSession]:
+        """세션 조회 (없거나 형식이 잘못된 id면 None)"""
+        if len(upload_id) != 32 or not all(c in "0123456789abcdef" for c in upload_id):
+            return None
+        try:
+            meta = json.loads(self._meta_path(upload_id).read_text(encoding="utf-8"))
+            offset = self._part_path(upload_id).stat().st_size
+        except (FileNotFoundError, ValueError):
+            return None
+        return UploadSession(offset=offset, **meta)
+
+    def expires_at(self, session: UploadSession) -> float:
+        return self._meta_path(session.upload_id).stat().st_mtime + self.ttl
+
+    async def write_chunk(self, session: UploadSession, offset: int, body: AsyncIterator[bytes]) -> int:
+        """
+        offset 위치부터 body를 이어 붙이고 새 offset 반환
+
+        조각은 먼저 별도 임시 파일로 받은 뒤 세션 잠금 안에서 한 번에 붙인다.
+        (같은 세션에 동시에 보낸 조각이나 중간에 끊긴 조각이 .part를 망가뜨리지 않음)
+        """
+        if offset != session.offset:
+            raise UploadOffsetMismatch(session.offset)
+
+        remaining = session.size - offset
+        chunk_path = self.root / f"{session.upload_id}.{uuid.uuid4().hex}.chunk"
+        received = 0
+        f = await run_in_threadpool(open, chunk_path, "wb")
+        try:
+            try:
+                async for data in body:
+                    received += len(data)
+                    if received > remaining:
+                        raise UploadTooLarge()
+                    await run_in_threadpool(f.write, data)
+            finally:
+                await run_in_threadpool(f.close)
+            return await run_in_threadpool(self._append, session, offset, chunk_path)
+        finally:
+            try:
+                os.remove(chunk_path)
+            except OSError:
+                pass
+
+    def _append(self, session: UploadSession, offset: int, chunk_path: Path) -> int:
+        part_path = self._part_path(session.upload_id)
+        with self._lock:
+            try:
+                current = part_path.stat().st_size
+            except FileNotFoundError:
+                raise UploadOffsetMismatch(0)
+            if current != offset:
+                raise UploadOffsetMismatch(current)
+            with open(chunk_path, "rb") as src, open(part_path, "ab") as dest:
+                shutil.copyfileobj(src, dest, CHUNK_SIZE)
+            # 마지막 활동 시각 갱신 (만료 기준)
+            os.utime(self._meta_path(session.upload_id))
+            return part_path.stat().st_size
+
+    def finish(self, session: UploadSession, dest: Path) -> StoredFile:
+        """
+        다 받은 세션을 dest로 옮기고 세션 정리 (워커 스레드에서 호출)
+
+        SHA-256은 세션 중간 상태를 저장할 수 없으므로 완료 시점에 한 번 읽어서 계산한다.
+        """
+        part_path = self._part_path(session.upload_id)
+        size = part_path.stat().st_size
+        if size != session.size:
+            raise UploadIncomplete()
+
+        # 다 받은 뒤에는 더 붙을 수 없으므로 잠금 밖에서 해시 계산
+        hasher = hashlib.sha256()
+        with open(part_path, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+
+        with self._lock:
+            os.replace(part_path, dest)
+            self._remove_meta(session.upload_id)
+        return StoredFile(path=dest, size=size, sha256=hasher.hexdigest())
+
+    def abort(self, session: UploadSession):
+        with self._lock:
+            self._remove(session.upload_id)
+
+    def _remove_meta(self, upload_id: str):
+        try:
+            os.remove(self._meta_path(upload_id))
+        except FileNotFoundError:
+            pass
+
+    def _remove(self, upload_id: str):
+        self._remove_meta(upload_id)
+        try:
+            os.remove(self._part_path(upload_id))
+        except FileNotFoundError:
+            pass
+
+    def expire(self) -> int:
+        """ttl 동안 활동이 없는 세션과 남은 조각 파일 삭제, 삭제한 세션 수 반환"""
+        cutoff = time.time() - self.ttl
+        expired = 0
+        for entry in os.scandir(self.root):
+            try:
+                if entry.stat().st_mtime >= cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            upload_id, _, suffix = entry.name.partition(".")
+            if suffix == "json":
+                with self._lock:
+                    self._remove(upload_id)
+                expired += 1
+            elif suffix == "part" and not self._meta_path(upload_id).exists():
+                # 세션 정보 없이 남은 본문 (정리 도중 중단된 경우)
+                with self._lock:
+                    self._remove(upload_id)
+            elif suffix.endswith("chunk"):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+        return expired
+
+
+# 전역 세션 저장소
+resumable_uploads = ResumableUploads(
+    Path(settings.UPLOAD_DIR) / "tmp" / "resumable", settings.UPLOAD_SESSION_TTL
+)
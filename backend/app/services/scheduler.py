@@ -0,0 +1,69 @@
+"""
+주기 작업 스케줄러
+
+앱 기동 시 등록된 작업을 각각 데몬 스레드에서 interval 초마다 실행한다.
+작업 함수는 인자 없이 호출되며, 예외는 로그만 남기고 다음 주기에 다시 실행한다.
+"""
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """interval 초마다 func를 실행하는 작업"""
+
+    def __init__(self, name: str, interval: float, func: Callable[[], None], run_on_start: bool = False):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.run_on_start = run_on_start
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"job-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self):
+        try:
+            self.func()
+        except Exception as e:
+            logger.error(f"주기 작업 실패 ({self.name}): {e}")
+
+    def _run(self):
+        if self.run_on_start:
+            self.run_once()
+        while not self._stop.wait(self.interval):
+            self.run_once()
+
+
+_jobs: Dict[str, PeriodicJob] = {}
+
+
+def register_job(name: str, interval: float, func: Callable[[], None], run_on_start: bool = False) -> PeriodicJob:
+    """주기 작업 등록 (interval이 0 이하이면 등록하지 않음)"""
+    job = PeriodicJob(name, interval, func, run_on_start)
+    if interval > 0:
+        _jobs[name] = job
+    return job
+
+
+def start_jobs():
+    for job in _jobs.values():
+        job.start()
+
+
+def stop_jobs():
+    for job in _jobs.values():
+        job.stop()
@@ -0,0 +1,134 @@
+"""
+업로드 파일 저장
+
+업로드 본문을 고정 크기 청크로 읽어 워커 스레드에서 디스크에 쓰면서
+크기 제한 확인과 SHA-256 계산을 동시에 한다. (전체 파일을 메모리에 올리지 않음)
+저장된 파일은 내용 해시 기준으로 중복 없이 저장소 백엔드에 보관한다. (BlobStore)
+"""
+import hashlib
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.storage_backends import StorageBackend, storage
+
+# 한 번에 읽고 쓰는 크기
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """업로드 크기 제한 초과"""
+
+
+@dataclass
+class StoredFile:
+    path: Path
+    size: int
+    sha256: str
+
+
+def _write_chunk(f, hasher, chunk: bytes):
+    hasher.update(chunk)
+    f.write(chunk)
+
+
+async def save_upload(upload: UploadFile, dest: Path, max_size: int) -> StoredFile:
+    """
+    업로드 파일을 dest에 저장
+
+    임시 파일(.part)에 쓰고 끝까지 성공했을 때만 dest로 이름을 바꾼다.
+    max_size를 넘으면 UploadTooLarge, 그 밖의 실패는 예외를 그대로 올린다.
+    """
+    temp_path = dest.with_name(dest.name + ".part")
+    hasher = hashlib.sha256()
+    size = 0
+
+    f = await run_in_threadpool(open, temp_path, "wb")
+    try:
+        try:
+            while True:
+                chunk = await upload.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLarge()
+                await run_in_threadpool(_write_chunk, f, hasher, chunk)
+        finally:
+            await run_in_threadpool(f.close)
+        await run_in_threadpool(os.replace, temp_path, dest)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    return StoredFile(path=dest, size=size, sha256=hasher.hexdigest())
+
+
+class BlobStore:
+    """
+    내용 주소(SHA-256) 기반 파일 저장소
+
+    같은 내용의 파일은 키 <sha256> 하나로만 저장소 백엔드에 두고,
+    Attachment 행들이 같은 filepath(ref)를 참조한다. (참조 수 = 같은 filepath를 가진 행 수)
+    같은 파일에 대한 배치/삭제 판단은 lock(ref) 안에서 수행한다.
+    """
+
+    LOCK_STRIPES = 64
+
+    def __init__(self, backend: StorageBackend, temp_dir: Path):
+        self.backend = backend
+        self.temp_dir = Path(temp_dir)
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        # 경로 해시로 나눈 고정 개수 잠금 (경로마다 잠금을 만들지 않음)
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+
+    def blob_key(self, sha256: str) -> str:
+        return sha256
+
+    @contextmanager
+    def lock(self, ref):
+        with self._locks[hash(str(ref)) % self.LOCK_STRIPES]:
+            yield
+
+    def temp_path(self) -> Path:
+        return self.temp_dir / uuid.uuid4().hex
+
+    async def receive(self, upload: UploadFile, max_size: int) -> StoredFile:
+        """업로드를 임시 파일로 받으면서 SHA-256 계산"""
+        return await save_upload(upload, self.temp_path(), max_size)
+
+    def place(self, stored: StoredFile, ref: str) -> str:
+        """
+        임시 파일을 ref 위치로 (lock(ref) 안에서 호출)
+
+        ref가 이미 있으면 같은 내용이므로 임시 파일만 버린다.
+        """
+        if self.backend.exists(ref):
+            self.discard(stored)
+        else:
+            self.backend.put(stored.path, ref)
+        return ref
+
+    def discard(self, stored: StoredFile):
+        try:
+            os.remove(stored.path)
+        except OSError:
+            pass
+
+    def remove(self, ref: str):
+        """참조가 모두 없어진 파일 삭제 (lock(ref) 안에서 호출)"""
+        self.backend.delete(ref)
+
+
+# 전역 저장소 인스턴스
+blob_store = BlobStore(storage, Path(settings.UPLOAD_DIR) / "tmp")
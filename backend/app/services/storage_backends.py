@@ -0,0 +1,212 @@
+"""
+업로드 파일 저장소 백엔드
+
+라우터는 파일 위치를 직접 만들지 않고 DB에 저장된 참조(ref) 문자열로 백엔드에 접근한다.
+- 새 파일의 ref는 경로 구분자가 없는 키 (예: "<sha256>", "asset-A-0001.jpg")
+- 예전 행의 ref는 "uploads/xxx.pdf" 같은 경로 그대로 (재배치 전까지 읽기/삭제 지원)
+
+백엔드
+- ShardedDiskBackend: 키 해시 앞자리로 하위 디렉터리를 나눠 저장 (한 디렉터리에 파일이 몰리지 않음)
+- LocalObjectStoreBackend: 오브젝트 스토리지 대용 (버킷 디렉터리 + 평평한 키 공간 + 메타데이터)
+"""
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from urllib.parse import quote, unquote
+
+from app.core.config import settings
+
+
+def is_legacy_ref(ref: str) -> bool:
+    """경로 형태의 예전 ref인지 (키에는 경로 구분자가 없음)"""
+    return "/" in ref or "\\" in ref
+
+
+class StorageBackend:
+    """
+    저장소 공통 인터페이스
+
+    하위 클래스는 _locate_key(키 → 로컬 경로)만 구현하면 되고,
+    저장 방식이 다르면 put/delete/keys 를 재정의한다.
+    """
+
+    def _locate_key(self, key: str) -> Path:
+        raise NotImplementedError
+
+    def local_path(self, ref: str) -> Path:
+        """ref의 로컬 파일 경로 (FileResponse, Pillow 등에서 바로 읽기용)"""
+        if is_legacy_ref(ref):
+            return Path(ref)
+        return self._locate_key(ref)
+
+    def exists(self, ref: str) -> bool:
+        return self.local_path(ref).exists()
+
+    def size(self, ref: str) -> int:
+        return self.local_path(ref).stat().st_size
+
+    def put(self, src: Path, ref: str) -> str:
+        """로컬 파일 src를 ref 위치로 옮김 (같은 파일시스템이면 rename)"""
+        target = self.local_path(ref)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(src, target)
+        except OSError:
+            # 다른 파일시스템이면 복사 후 원본 삭제
+            temp_target = target.with_name(f"{target.name}.{uuid.uuid4().hex}.part")
+            shutil.copyfile(src, temp_target)
+            os.replace(temp_target, target)
+            os.remove(src)
+        return ref
+
+    def delete(self, ref: str):
+        """파일 삭제 (없으면 무시)"""
+        try:
+            os.remove(self.local_path(ref))
+        except FileNotFoundError:
+            pass
+
+    def keys(self) -> Iterator[str]:
+        """저장된 모든 키"""
+        raise NotImplementedError
+
+
+class ShardedDiskBackend(StorageBackend):
+    """
+    해시 분산 로컬 디스크 저장소
+
+    root/<h[0:2]>/<h[2:4]>/<key>  (h = sha256(key), depth=2 기준)
+    """
+
+    SHARD_WIDTH = 2
+
+    def __init__(self, root: Path, depth: int = 2):
+        self.root = Path(root)
+        self.depth = depth
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def shard_dirs(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        parts = [digest[i * self.SHARD_WIDTH:(i + 1) * self.SHARD_WIDTH] for i in range(self.depth)]
+        return self.root.joinpath(*parts)
+
+    def _locate_key(self, key: str) -> Path:
+        return self.shard_dirs(key) / key
+
+    def _is_shard_dir(self, name: str) -> bool:
+        return len(name) == self.SHARD_WIDTH and all(c in "0123456789abcdef" for c in name)
+
+    def _walk(self, directory: Path, level: int) -> Iterator[Path]:
+        """샤드 디렉터리 아래의 파일 (깊이가 바뀐 예전 배치도 포함)"""
+        for entry in os.scandir(directory):
+            if entry.is_dir(follow_symlinks=False):
+                if self._is_shard_dir(entry.name):
+                    yield from self._walk(Path(entry.path), level + 1)
+            elif level > 0 and not entry.name.endswith(".part"):
+                yield Path(entry.path)
+
+    def keys(self) -> Iterator[str]:
+        for path in self._walk(self.root, 0):
+            yield path.name
+
+    def reshard(self) -> int:
+        """
+        현재 depth 기준 위치가 아닌 파일을 제자리로 이동 (샤드 깊이 변경 후 실행)
+
+        이동한 파일 수를 반환한다.
+        """
+        moved = 0
+        for path in list(self._walk(self.root, 0)):
+            target = self._locate_key(path.name)
+            if path != target:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, target)
+                moved += 1
+        return moved
+
+
+class LocalObjectStoreBackend(StorageBackend):
+    """
+    오브젝트 스토리지 대용 (개발/테스트용)
+
+    root/<bucket>/objects/<URL 인코딩된 키> 에 본문을, meta/ 에 크기·해시를 저장한다.
+    실제 오브젝트 스토리지처럼 디렉터리 구조 없이 키로만 접근하고, put은 복사(업로드) 후 원본을 지운다.
+    """
+
+    def __init__(self, root: Path, bucket: str):
+        self.bucket_dir = Path(root) / bucket
+        self.object_dir = self.bucket_dir / "objects"
+        self.meta_dir = self.bucket_dir / "meta"
+        self.object_dir.mkdir(parents=True, exist_ok=True)
+        self.meta_dir.mkdir(parents=True, exist_ok=True)
+
+    def _object_name(self, key: str) -> str:
+        return quote(key, safe="")
+
+    def _locate_key(self, key: str) -> Path:
+        return self.object_dir / self._object_name(key)
+
+    def _meta_path(self, key: str) -> Path:
+        return self.meta_dir / f"{self._object_name(key)}.json"
+
+    def put(self, src: Path, ref: str) -> str:
+        if is_legacy_ref(ref):
+            return super().put(src, ref)
+
+        target = self._locate_key(ref)
+        temp_target = target.with_name(f"{target.name}.{uuid.uuid4().hex}.part")
+        hasher = hashlib.sha256()
+        size = 0
+        with open(src, "rb") as fsrc, open(temp_target, "wb") as fdst:
+            while True:
+                chunk = fsrc.read(1024 * 1024)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                size += len(chunk)
+                fdst.write(chunk)
+        os.replace(temp_target, target)
+        self._meta_path(ref).write_text(
+            json.dumps({"size": size, "sha256": hasher.hexdigest()}), encoding="utf-8"
+        )
+        os.remove(src)
+        return ref
+
+    def delete(self, ref: str):
+        super().delete(ref)
+        if not is_legacy_ref(ref):
+            try:
+                os.remove(self._meta_path(ref))
+            except FileNotFoundError:
+                pass
+
+    def head(self, key: str) -> Optional[Dict]:
+        """오브젝트 메타데이터 (없으면 None)"""
+        try:
+            return json.loads(self._meta_path(key).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def size(self, ref: str) -> int:
+        meta = None if is_legacy_ref(ref) else self.head(ref)
+        return meta["size"] if meta else super().size(ref)
+
+    def keys(self) -> Iterator[str]:
+        for entry in os.scandir(self.object_dir):
+            if entry.is_file() and not entry.name.endswith(".part"):
+                yield unquote(entry.name)
+
+
+def create_storage_backend() -> StorageBackend:
+    """설정(STORAGE_BACKEND)에 맞는 백엔드 생성"""
+    if settings.STORAGE_BACKEND == "object":
+        return LocalObjectStoreBackend(Path(settings.OBJECT_STORE_DIR), settings.OBJECT_STORE_BUCKET)
+    return ShardedDiskBackend(Path(settings.UPLOAD_DIR), settings.STORAGE_SHARD_DEPTH)
+
+
+# 전역 저장소 인스턴스
+storage = create_storage_backend()
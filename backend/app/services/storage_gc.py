@@ -0,0 +1,260 @@
+"""
+업로드 저장소 정리(GC)
+
+양쪽 방향으로 맞춘다.
+- 끊어진 첨부파일 행: 자산/장애가 삭제된 Attachment 행 → 행 삭제
+  (그 파일을 참조하는 행이 더 없으면 파일과 썸네일도 삭제)
+  파일만 없는 행은 저장소 설정 오류(마운트 누락, 재배치 전 백엔드 변경 등)일 수 있으므로
+  집계만 하고, 관리자가 delete_missing_files를 켜서 실행할 때만 삭제한다.
+- 고아 파일: 어떤 행도 참조하지 않는 저장소 파일 (첨부파일, 썸네일, 삭제된 자산의 이미지),
+  오래된 임시 파일 → 삭제
+
+행은 id 순서로, 파일은 저장소 키를 순회하면서 batch_size 단위로 확인하므로
+전체 파일 목록을 메모리에 올리지 않는다. dry_run이면 지우지 않고 회수 가능한 크기만 집계한다.
+저장소 재배치 전의 예전 경로(uploads/ 바로 아래 파일)는 건드리지 않는다.
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from sqlalchemy import func
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.asset import Asset
+from app.models.attachment import Attachment, EntityType
+from app.models.issue import Issue
+from app.services.storage import blob_store
+from app.services.storage_backends import storage
+from app.services.storage_usage import record_usage, uploader_usage
+from app.services.thumbnails import remove_thumbnails
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_KEY = re.compile(r"^(?P<ref>.+)\.thumb\d+\.jpg$")
+ASSET_IMAGE_KEY = re.compile(r"^asset-(?P<asset_number>.+)\.jpg$")
+
+ENTITY_TABLES = {
+    EntityType.asset: Asset,
+    EntityType.issue: Issue,
+}
+
+
+@dataclass
+class GCReport:
+    dry_run: bool
+    dangling_rows: int = 0  # 대상 자산/장애가 없는 행
+    missing_file_rows: int = 0  # 파일이 없는 행 (delete_missing_files일 때만 삭제)
+    orphan_files: int = 0  # 참조 없는 저장소 파일
+    temp_files: int = 0  # 오래된 임시 파일
+    reclaimable_bytes: int = 0
+    duration: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _batches(items: Iterable, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _file_size(ref: str) -> int:
+    try:
+        return storage.size(ref)
+    except OSError:
+        return 0
+
+
+def _release_file(db, ref: str):
+    """참조하는 행이 더 없으면 파일과 썸네일 삭제 (잠금 안에서 다시 확인)"""
+    with blob_store.lock(ref):
+        # 이전 조회의 스냅샷(REPEATABLE READ)을 끝내야 그사이 커밋된 업로드가 보인다
+        db.rollback()
+        references = db.query(func.count(Attachment.id)).filter(Attachment.filepath == ref).scalar()
+        if references:
+            return
+        try:
+            blob_store.remove(ref)
+            remove_thumbnails(ref)
+        except OSError as e:
+            logger.error(f"GC 파일 삭제 실패 ({ref}): {e}")
+
+
+def collect_dangling_rows(db, report: GCReport, batch_size: int, pause: float, delete_missing_files: bool = False):
+    """대상이 없는 첨부파일 행 정리 (파일이 없는 행은 delete_missing_files일 때만)"""
+    last_id = 0
+    while True:
+        rows = (
+            db.query(
+                Attachment.id, Attachment.entity_type, Attachment.entity_id, Attachment.filepath,
+                Attachment.filesize, Attachment.uploaded_by
+            )
+            .filter(Attachment.id > last_id)
+            .order_by(Attachment.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        # 대상 엔티티 존재 여부를 종류별로 한 번에 조회
+        existing: Dict[EntityType, Set[int]] = {}
+        for entity_type, model in ENTITY_TABLES.items():
+            ids = {row.entity_id for row in rows if row.entity_type == entity_type}
+            existing[entity_type] = {
+                entity_id for (entity_id,) in db.query(model.id).filter(model.id.in_(ids))
+            } if ids else set()
+
+        dangling = []
+        for row in rows:
+            if row.entity_id not in existing.get(row.entity_type, set()):
+                report.dangling_rows += 1
+                dangling.append(row)
+            elif not storage.exists(row.filepath):
+                report.missing_file_rows += 1
+                if delete_missing_files:
+                    dangling.append(row)
+        if not dangling:
+            continue
+
+        # 지울 행만 참조하는 파일은 회수 가능
+        dangling_refs = Counter(row.filepath for row in dangling)
+        total_refs = dict(
+            db.query(Attachment.filepath, func.count(Attachment.id))
+            .filter(Attachment.filepath.in_(list(dangling_refs)))
+            .group_by(Attachment.filepath)
+        )
+        released = [ref for ref, count in dangling_refs.items() if total_refs.get(ref, 0) <= count]
+
+        if report.dry_run:
+            report.reclaimable_bytes += sum(_file_size(ref) for ref in released)
+        else:
+            usage = record_usage(db, [
+                (row.entity_type, row.entity_id, row.uploaded_by, -row.filesize, -1) for row in dangling
+            ])
+            db.query(Attachment).filter(
+                Attachment.id.in_([row.id for row in dangling])
+            ).delete(synchronize_session=False)
+            db.commit()
+            uploader_usage.apply(usage)
+            for ref in released:
+                size = _file_size(ref)
+                _release_file(db, ref)
+                if not storage.exists(ref):
+                    report.reclaimable_bytes += size
+        if pause:
+            time.sleep(pause)
+
+
+def _referenced_keys(db, keys: List[str]) -> Set[str]:
+    """keys 중 DB가 참조하는 키 (썸네일은 원본 기준)"""
+    base: Dict[str, str] = {}
+    asset_numbers: Dict[str, str] = {}
+    for key in keys:
+        match = THUMBNAIL_KEY.match(key)
+        ref = match.group("ref") if match else key
+        asset_match = ASSET_IMAGE_KEY.match(ref)
+        if asset_match:
+            asset_numbers[key] = asset_match.group("asset_number")
+        else:
+            base[key] = ref
+
+    referenced = set()
+    if base:
+        found = {
+            filepath for (filepath,) in
+            db.query(Attachment.filepath).filter(Attachment.filepath.in_(set(base.values()))).distinct()
+        }
+        referenced.update(key for key, ref in base.items() if ref in found)
+    if asset_numbers:
+        found = {
+            number for (number,) in
+            db.query(Asset.asset_number).filter(Asset.asset_number.in_(set(asset_numbers.values())))
+        }
+        referenced.update(key for key, number in asset_numbers.items() if number in found)
+    return referenced
+
+
+def collect_orphan_files(db, report: GCReport, batch_size: int, grace: float, pause: float):
+    """어떤 행도 참조하지 않는 저장소 파일 정리 (grace 초 이내에 바뀐 파일은 업로드 중일 수 있어 제외)"""
+    cutoff = time.time() - grace
+    for keys in _batches(storage.keys(), batch_size):
+        referenced = _referenced_keys(db, keys)
+        for key in keys:
+            if key in referenced:
+                continue
+            try:
+                stat = storage.local_path(key).stat()
+            except OSError:
+                continue
+            if stat.st_mtime > cutoff:
+                continue
+            if not report.dry_run:
+                with blob_store.lock(THUMBNAIL_KEY.sub(r"\g<ref>", key)):
+                    # 잠금 안에서 다시 확인 (그사이 같은 내용이 다시 업로드됐을 수 있음)
+                    # 배치 조회의 스냅샷을 끝내고 새로 읽어야 그사이 커밋된 행이 보인다
+                    db.rollback()
+                    if key in _referenced_keys(db, [key]):
+                        continue
+                    storage.delete(key)
+            report.orphan_files += 1
+            report.reclaimable_bytes += stat.st_size
+        if pause:
+            time.sleep(pause)
+
+
+def collect_temp_files(report: GCReport, grace: float):
+    """중단된 업로드가 남긴 임시 파일 (이어받기 세션 디렉터리는 별도 정리)"""
+    cutoff = time.time() - grace
+    for entry in os.scandir(blob_store.temp_dir):
+        if not entry.is_file():
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        if stat.st_mtime > cutoff:
+            continue
+        report.temp_files += 1
+        report.reclaimable_bytes += stat.st_size
+        if not report.dry_run:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def run_storage_gc(
+    dry_run: bool = False,
+    batch_size: Optional[int] = None,
+    delete_missing_files: bool = False
+) -> GCReport:
+    started = time.monotonic()
+    report = GCReport(dry_run=dry_run)
+    batch_size = batch_size or settings.STORAGE_GC_BATCH_SIZE
+    pause = settings.STORAGE_GC_PAUSE
+    grace = settings.STORAGE_GC_GRACE
+
+    db = SessionLocal()
+    try:
+        collect_dangling_rows(db, report, batch_size, pause, delete_missing_files)
+        collect_orphan_files(db, report, batch_size, grace, pause)
+        collect_temp_files(report, grace)
+    finally:
+        db.close()
+
+    report.duration = round(time.monotonic() - started, 3)
+    logger.info(f"저장소 정리{' (dry-run)' if dry_run else ''}: {report.to_dict()}")
+    return report
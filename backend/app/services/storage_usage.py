@@ -0,0 +1,123 @@
+"""
+첨부파일 사용량 집계
+
+storage_usage 테이블에 대상(entity_type:entity_id)별, 업로드한 사용자별 크기/개수를 두고
+첨부파일 생성/삭제와 같은 트랜잭션에서 증감한다. (디스크를 훑지 않고 상위 N 조회)
+크기는 행 기준(filesize 합)이라 같은 내용이 중복 제거돼 있어도 각자에게 계산된다.
+
+업로드 시 용량 제한 확인은 사용자별 값을 메모리에 두고 읽는다. (처음 한 번만 DB 조회)
+동시 갱신이나 다른 프로세스에서 생긴 차이는 주기적 재집계(reconcile)로 바로잡는다.
+"""
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+from app.database import SessionLocal
+from app.models.attachment import Attachment
+from app.models.storage_usage import StorageUsage
+
+SCOPE_ENTITY = "entity"
+SCOPE_UPLOADER = "uploader"
+SCOPES = (SCOPE_ENTITY, SCOPE_UPLOADER)
+
+# (entity_type, entity_id, uploaded_by, 크기 증감, 개수 증감)
+UsageChange = Tuple[object, int, str, int, int]
+
+
+def entity_owner(entity_type, entity_id: int) -> str:
+    return f"{getattr(entity_type, 'value', entity_type)}:{entity_id}"
+
+
+def record_usage(db, changes: Iterable[UsageChange]) -> Dict[str, int]:
+    """
+    사용량 증감을 현재 트랜잭션에 반영 (커밋은 호출한 쪽에서)
+
+    커밋 후 uploader_usage.apply()에 넘길 사용자별 크기 증감을 반환한다.
+    """
+    totals: Dict[Tuple[str, str], list] = defaultdict(lambda: [0, 0])
+    for entity_type, entity_id, uploaded_by, size, files in changes:
+        for key in ((SCOPE_ENTITY, entity_owner(entity_type, entity_id)), (SCOPE_UPLOADER, uploaded_by)):
+            totals[key][0] += size
+            totals[key][1] += files
+
+    for (scope, owner), (size, files) in totals.items():
+        stmt = mysql_insert(StorageUsage).values(
+            scope=scope, owner=owner, bytes=max(size, 0), files=max(files, 0)
+        )
+        db.execute(stmt.on_duplicate_key_update(
+            bytes=func.greatest(StorageUsage.bytes + size, 0),
+            files=func.greatest(StorageUsage.files + files, 0)
+        ))
+
+    return {owner: size for (scope, owner), (size, _) in totals.items() if scope == SCOPE_UPLOADER}
+
+
+class UploaderUsage:
+    """username → 사용 중인 크기 (업로드 용량 제한 확인용)"""
+
+    def __init__(self):
+        self._bytes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db, username: str) -> int:
+        with self._lock:
+            value = self._bytes.get(username)
+        if value is not None:
+            return value
+
+        value = db.query(StorageUsage.bytes).filter(
+            StorageUsage.scope == SCOPE_UPLOADER,
+            StorageUsage.owner == username
+        ).scalar() or 0
+        with self._lock:
+            return self._bytes.setdefault(username, value)
+
+    def apply(self, deltas: Dict[str, int]):
+        """커밋된 증감 반영 (아직 적재되지 않은 사용자는 다음 조회 때 DB 값을 읽으므로 무시)"""
+        with self._lock:
+            for username, delta in deltas.items():
+                if username in self._bytes:
+                    self._bytes[username] = max(0, self._bytes[username] + delta)
+
+    def clear(self):
+        with self._lock:
+            self._bytes.clear()
+
+
+def reconcile_storage_usage():
+    """attachments 기준으로 집계 테이블 전체를 다시 계산"""
+    db = SessionLocal()
+    try:
+        db.execute(delete(StorageUsage))
+        db.execute(insert(StorageUsage).from_select(
+            ["scope", "owner", "bytes", "files"],
+            select(
+                literal(SCOPE_ENTITY),
+                func.concat(Attachment.entity_type, ":", Attachment.entity_id),
+                func.sum(Attachment.filesize),
+                func.count(Attachment.id)
+            ).group_by(Attachment.entity_type, Attachment.entity_id)
+        ))
+        db.execute(insert(StorageUsage).from_select(
+            ["scope", "owner", "bytes", "files"],
+            select(
+                literal(SCOPE_UPLOADER),
+                Attachment.uploaded_by,
+                func.sum(Attachment.filesize),
+                func.count(Attachment.id)
+            ).group_by(Attachment.uploaded_by)
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    uploader_usage.clear()
+
+
+# 전역 사용량 인스턴스
+uploader_usage = UploaderUsage()
@@ -0,0 +1,125 @@
+"""
+이미지 첨부파일 썸네일
+
+업로드가 끝나면 워커 스레드에서 고정 크기 썸네일(JPEG)을 만들어 원본과 같은 저장소에 둔다.
+    <원본 ref>.thumb<크기>.jpg
+원본이 내용 해시 기준으로 공유되므로 썸네일도 같은 내용이면 한 번만 만든다.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Set, Tuple
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+from app.services.storage import blob_store
+from app.services.storage_backends import storage
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+THUMBNAIL_QUALITY = 80
+
+
+def thumbnail_ref(ref: str, size: int) -> str:
+    return f"{ref}.thumb{size}.jpg"
+
+
+def is_thumbnailable(filename: str) -> bool:
+    return os.path.splitext(filename)[1].lower() in THUMBNAIL_EXTENSIONS
+
+
+def render_thumbnail(ref: str, size: int) -> Path:
+    """
+    썸네일 생성 후 로컬 경로 반환 (이미 있으면 그대로 반환)
+
+    긴 변이 size 이하가 되도록 줄이고 EXIF 회전을 반영한다.
+    임시 파일에 쓴 뒤 저장소로 옮기므로 동시에 만들어도 깨진 파일이 보이지 않는다.
+    """
+    target = thumbnail_ref(ref, size)
+    if storage.exists(target):
+        return storage.local_path(target)
+
+    with Image.open(storage.local_path(ref)) as img:
+        # JPEG는 디코딩 단계에서 미리 축소 (전체 해상도로 풀지 않음)
+        img.draft("RGB", (size, size))
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+        if img.mode != "RGB":
+            # 투명 배경은 흰색으로
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            rgba = img.convert("RGBA")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            img = background
+
+        temp_path = blob_store.temp_path()
+        try:
+            img.save(temp_path, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True, progressive=True)
+            storage.put(temp_path, target)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+    return storage.local_path(target)
+
+
+def remove_thumbnails(ref: str):
+    """원본 삭제 시 썸네일도 함께 삭제"""
+    for size in settings.THUMBNAIL_SIZES:
+        try:
+            storage.delete(thumbnail_ref(ref, size))
+        except OSError:
+            pass
+
+
+class ThumbnailWorker:
+    """업로드 요청과 분리해서 썸네일을 만드는 작업 스레드 풀"""
+
+    def __init__(self, sizes: Tuple[int, ...], max_workers: int):
+        self.sizes = sizes
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="thumbnail"
+                )
+
+    def stop(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def submit(self, ref: str):
+        """모든 크기의 썸네일 생성 예약 (같은 파일이 이미 대기 중이면 무시)"""
+        with self._lock:
+            if self._executor is None or ref in self._pending:
+                return
+            self._pending.add(ref)
+            self._executor.submit(self._generate, ref)
+
+    def _generate(self, ref: str):
+        try:
+            for size in self.sizes:
+                render_thumbnail(ref, size)
+        except Exception as e:
+            logger.error(f"썸네일 생성 실패 ({ref}): {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(ref)
+
+
+# 전역 워커 인스턴스
+thumbnail_worker = ThumbnailWorker(
+    tuple(settings.THUMBNAIL_SIZES), settings.THUMBNAIL_WORKERS
+)
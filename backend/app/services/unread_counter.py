@@ -0,0 +1,80 @@
+"""
+사용자별 안 읽은 알림 개수 저장소
+
+처음 조회할 때만 COUNT 쿼리로 적재하고, 이후에는 알림 생성/읽음/전체 읽음/삭제 시
+증감해서 뱃지 개수를 메모리에서 바로 돌려준다.
+동시 갱신으로 생길 수 있는 오차는 주기적 재집계(reconcile)로 바로잡는다.
+"""
+import threading
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import func
+
+from app.database import SessionLocal
+from app.models.notification import Notification
+
+
+class UnreadCounter:
+    """username → 안 읽은 알림 개수"""
+
+    RECONCILE_CHUNK = 500
+
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db, username: str) -> int:
+        with self._lock:
+            count = self._counts.get(username)
+        if count is not None:
+            return count
+
+        count = db.query(func.count(Notification.id)).filter(
+            Notification.username == username,
+            Notification.is_read == False
+        ).scalar()
+        with self._lock:
+            # 조회하는 사이 다른 곳에서 적재됐으면 그 값을 유지
+            return self._counts.setdefault(username, count)
+
+    def peek(self, username: str) -> Optional[int]:
+        """적재된 값만 조회 (없으면 None, DB 접근 없음)"""
+        with self._lock:
+            return self._counts.get(username)
+
+    def add(self, username: str, delta: int):
+        """증감 (아직 적재되지 않은 사용자는 다음 조회 때 정확한 값을 읽으므로 무시)"""
+        with self._lock:
+            if username in self._counts:
+                self._counts[username] = max(0, self._counts[username] + delta)
+
+    def reset(self, username: str):
+        with self._lock:
+            self._counts[username] = 0
+
+    def reconcile(self, usernames: Optional[Iterable[str]] = None):
+        """적재된 사용자들의 값을 DB 기준으로 다시 집계"""
+        with self._lock:
+            targets = list(usernames if usernames is not None else self._counts.keys())
+        if not targets:
+            return
+
+        db = SessionLocal()
+        try:
+            for start in range(0, len(targets), self.RECONCILE_CHUNK):
+                chunk = targets[start:start + self.RECONCILE_CHUNK]
+                counts = dict(
+                    db.query(Notification.username, func.count(Notification.id))
+                    .filter(Notification.username.in_(chunk), Notification.is_read == False)
+                    .group_by(Notification.username)
+                    .all()
+                )
+                with self._lock:
+                    for username in chunk:
+                        self._counts[username] = counts.get(username, 0)
+        finally:
+            db.close()
+
+
+# 전역 카운터 인스턴스
+unread_counter = UnreadCounter()
@@ -0,0 +1,126 @@
+"""
+ZIP 스트리밍
+
+압축 파일을 디스크나 메모리에 미리 만들지 않고, 파일을 청크 단위로 읽어 압축하면서
+만들어진 바이트를 바로 응답으로 내보낸다. (메모리 사용량은 청크 크기 수준으로 일정)
+이미 압축된 형식(이미지, zip, Office 문서 등)은 다시 압축하지 않고 저장(STORED)만 한다.
+"""
+import io
+import logging
+import os
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+
+# 다시 압축해도 거의 줄지 않는 형식
+COMPRESSED_EXTENSIONS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp",
+    ".zip", ".gz", ".7z", ".rar",
+    ".docx", ".xlsx", ".pptx", ".pdf",
+    ".mp4", ".mov", ".mp3",
+}
+
+
+@dataclass
+class ZipMember:
+    """압축 파일에 넣을 항목 (path 또는 data 중 하나)"""
+    name: str
+    path: Optional[Path] = None
+    data: Optional[bytes] = None
+    mtime: Optional[float] = None
+
+
+class _ChunkBuffer:
+    """ZipFile이 쓰는 출력 대상 (seek 불가, 쓴 만큼 모아 두었다가 drain으로 꺼냄)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+            self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, *args):
+        raise io.UnsupportedOperation("seek")
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def is_precompressed(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in COMPRESSED_EXTENSIONS
+
+
+def unique_name(name: str, used: set) -> str:
+    """압축 파일 안에서 이름이 겹치면 "이름 (2).확장자" 형태로 바꿈"""
+    if name not in used:
+        used.add(name)
+        return name
+    stem, ext = os.path.splitext(name)
+    index = 2
+    while f"{stem} ({index}){ext}" in used:
+        index += 1
+    name = f"{stem} ({index}){ext}"
+    used.add(name)
+    return name
+
+
+def stream_zip(members: Iterable[ZipMember]) -> Iterator[bytes]:
+    """
+    ZIP 바이트 청크 생성기 (StreamingResponse에 그대로 전달)
+
+    읽을 수 없는 파일은 로그만 남기고 건너뛴다.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", allowZip64=True) as zf:
+        for member in members:
+            src = None
+            if member.path is not None:
+                try:
+                    src = open(member.path, "rb")
+                except OSError as e:
+                    logger.warning(f"압축 대상 파일 없음 ({member.name}): {e}")
+                    continue
+                stat = os.fstat(src.fileno())
+                size, mtime = stat.st_size, member.mtime or stat.st_mtime
+            else:
+                size, mtime = len(member.data), member.mtime or time.time()
+
+            info = zipfile.ZipInfo(member.name, date_time=time.localtime(mtime)[:6])
+            info.compress_type = zipfile.ZIP_STORED if is_precompressed(member.name) else zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+
+            with zf.open(info, mode="w", force_zip64=size >= zipfile.ZIP64_LIMIT) as dest:
+                if src is not None:
+                    with src:
+                        while True:
+                            chunk = src.read(CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            dest.write(chunk)
+                            data = buffer.drain()
+                            if data:
+                                yield data
+                else:
+                    dest.write(member.data)
+            data = buffer.drain()
+            if data:
+                yield data
+    yield buffer.drain()
@@ -0,0 +1,7 @@
+-- 장애 목록 커서 페이지네이션 / 필터 인덱스
+-- (신규 DB는 Base.metadata.create_all 로 생성되므로 기존 DB에만 적용)
+CREATE INDEX ix_issues_created_at_id ON issues (created_at, id);
+CREATE INDEX ix_issues_status ON issues (status);
+CREATE INDEX ix_issues_priority ON issues (priority);
+CREATE INDEX ix_issues_reporter ON issues (reporter);
+CREATE INDEX ix_issues_assignee ON issues (assignee);
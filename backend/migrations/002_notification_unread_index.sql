@@ -0,0 +1,2 @@
+-- 알림 목록 / 안 읽은 개수 조회용 복합 인덱스
+CREATE INDEX ix_notifications_username_is_read_created_at ON notifications (username, is_read, created_at);
@@ -0,0 +1,16 @@
+-- 알림 보관 테이블 (앱 기동 시 create_all 로도 생성됨)
+CREATE TABLE IF NOT EXISTS notifications_archive (
+    id INT NOT NULL PRIMARY KEY,
+    user_id INT NOT NULL,
+    username VARCHAR(100) NOT NULL,
+    title VARCHAR(200) NOT NULL,
+    message TEXT NOT NULL,
+    type VARCHAR(50) NOT NULL,
+    related_id INT NULL,
+    is_read BOOL NULL,
+    created_at DATETIME NULL,
+    read_at DATETIME NULL,
+    archived_at DATETIME NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX ix_notifications_archive_created_at (created_at),
+    INDEX ix_notifications_archive_username_created_at (username, created_at)
+);
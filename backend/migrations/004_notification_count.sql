@@ -0,0 +1,3 @@
+-- 알림 병합/다이제스트 개수
+ALTER TABLE notifications ADD COLUMN count INT NOT NULL DEFAULT 1 AFTER is_read;
+ALTER TABLE notifications_archive ADD COLUMN count INT NOT NULL DEFAULT 1 AFTER is_read;
@@ -0,0 +1,2 @@
+-- 대상별 댓글 목록 / 댓글 수 조회용 복합 인덱스
+CREATE INDEX ix_comments_target_created_at ON comments (target_type, target_id, created_at);
@@ -0,0 +1,3 @@
+-- 첨부파일 SHA-256 체크섬
+ALTER TABLE attachments ADD COLUMN checksum VARCHAR(64) NULL AFTER filesize;
+CREATE INDEX ix_attachments_checksum ON attachments (checksum);
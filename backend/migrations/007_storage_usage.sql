@@ -0,0 +1,21 @@
+-- 첨부파일 사용량 집계 테이블 (앱 기동 시 create_all 로도 생성됨)
+CREATE TABLE IF NOT EXISTS storage_usage (
+    scope VARCHAR(20) NOT NULL,
+    owner VARCHAR(150) NOT NULL,
+    bytes BIGINT NOT NULL DEFAULT 0,
+    files INT NOT NULL DEFAULT 0,
+    updated_at DATETIME NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (scope, owner),
+    INDEX ix_storage_usage_scope_bytes (scope, bytes)
+);
+
+-- 기존 첨부파일로 초기값 채우기
+INSERT INTO storage_usage (scope, owner, bytes, files)
+SELECT 'entity', CONCAT(entity_type, ':', entity_id), SUM(filesize), COUNT(*)
+FROM attachments GROUP BY entity_type, entity_id
+ON DUPLICATE KEY UPDATE bytes = VALUES(bytes), files = VALUES(files);
+
+INSERT INTO storage_usage (scope, owner, bytes, files)
+SELECT 'uploader', uploaded_by, SUM(filesize), COUNT(*)
+FROM attachments GROUP BY uploaded_by
+ON DUPLICATE KEY UPDATE bytes = VALUES(bytes), files = VALUES(files);
@@ -0,0 +1,3 @@
+-- 실사 통계: 자산별(캠페인별) 최근 실사 기록 조회용 커버링 인덱스
+CREATE INDEX ix_inspections_asset_latest ON inventory_inspections (asset_id, inspection_date, id, status);
+CREATE INDEX ix_inspections_campaign_latest ON inventory_inspections (campaign_id, asset_id, inspection_date, id, status);
@@ -0,0 +1,2 @@
+-- 실사 오프라인 일괄 동기화: 단말이 붙인 멱등 키 (같은 스캔을 다시 보내도 한 번만 기록)
+ALTER TABLE inventory_inspections ADD COLUMN idempotency_key VARCHAR(64) NULL UNIQUE AFTER photo_url;
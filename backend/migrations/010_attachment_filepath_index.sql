@@ -0,0 +1,2 @@
+-- 첨부파일 삭제/저장소 정리 시 같은 파일을 참조하는 행 수 확인용
+CREATE INDEX ix_attachments_filepath ON attachments (filepath);
@@ -0,0 +1,73 @@
+"""
+목록 응답 직렬화 마이크로 벤치마크
+
+기존 경로 (ORM 객체 → Pydantic 검증 → 표준 json) 와
+신규 경로 (행 tuple → RowSerializer → orjson) 의 10,000행당 처리량 비교.
+DB 없이 동일한 모양의 데이터로 직렬화 비용만 측정한다.
+
+실행: cd backend && python -m scripts.bench_serialization
+"""
+import json
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.api.assets import ASSET_LIST_SERIALIZER
+from app.core.serialization import dumps
+from app.schemas.asset import Asset as AssetSchema
+
+ROWS = 10_000
+REPEAT = 5
+
+
+def make_rows(count: int):
+    now = datetime(2025, 1, 1, 9, 30)
+    rows = []
+    for i in range(count):
+        rows.append((
+            i, f"A-{i:06d}", f"노트북 {i}", "IT장비",
+            "Samsung", "NT950", "active", "본사 3층",
+            "홍길동", now, f"SN{i}",
+            Decimal("1250000.00"), date(2027, 1, 1),
+            date(2025, 1, 1), date(2025, 7, 1),
+            None, now, now
+        ))
+    return rows
+
+
+def bench(label: str, func) -> None:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        payload = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:8.1f} ms / {ROWS:,}행  ({ROWS / best:,.0f} rows/s, {len(payload):,} bytes)")
+
+
+def main():
+    rows = make_rows(ROWS)
+    keys = ASSET_LIST_SERIALIZER.keys
+    objects = [SimpleNamespace(**dict(zip(keys, row))) for row in rows]
+    for obj in objects:
+        obj.purchase_date = obj.purchase_date.date()
+
+    adapter = TypeAdapter(List[AssetSchema])
+
+    def before():
+        validated = adapter.validate_python(objects, from_attributes=True)
+        return json.dumps(jsonable_encoder(validated), ensure_ascii=False).encode("utf-8")
+
+    def after():
+        return dumps(ASSET_LIST_SERIALIZER.serialize(rows))
+
+    bench("before: Pydantic 검증 + json", before)
+    bench("after:  RowSerializer + orjson", after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+업로드 파일 재배치
+
+저장소 백엔드 도입 전 uploads/ 에 평평하게 (또는 uploads/blobs/ 에) 저장된 파일을
+현재 설정된 저장소 백엔드의 키 위치로 옮기고 DB의 filepath를 키로 바꾼다.
+- 첨부파일: 키 = checksum (없으면 기존 파일명), 썸네일도 함께 이동
+- 자산 이미지: uploads/<자산번호>.jpg → asset-<자산번호>.jpg
+- 해시 분산 저장소는 STORAGE_SHARD_DEPTH가 바뀐 경우 샤드 위치도 다시 맞춘다.
+같은 파일시스템 안에서는 rename으로 옮기므로 복사 공간이 필요 없고, 여러 번 실행해도 안전하다.
+
+실행: cd backend && python -m scripts.reshard_uploads [--dry-run]
+"""
+import argparse
+import os
+from pathlib import Path
+
+from sqlalchemy import func
+
+from app.api.upload import LEGACY_UPLOAD_DIR, asset_image_key
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.asset import Asset
+from app.models.attachment import Attachment
+from app.services.storage_backends import ShardedDiskBackend, is_legacy_ref, storage
+from app.services.thumbnails import thumbnail_ref
+
+BATCH_SIZE = 500
+
+
+def move_file(src: Path, key: str, dry_run: bool) -> bool:
+    """src를 key 위치로 이동 (이미 있으면 같은 내용이므로 src만 삭제)"""
+    if not src.exists():
+        return False
+    if dry_run:
+        return True
+    if storage.exists(key):
+        os.remove(src)
+    else:
+        storage.put(src, key)
+    # 비어 버린 예전 디렉터리 정리 (uploads/blobs/ab 등)
+    try:
+        if src.parent != LEGACY_UPLOAD_DIR:
+            src.parent.rmdir()
+    except OSError:
+        pass
+    return True
+
+
+def migrate_attachments(db, dry_run: bool):
+    rows = db.query(Attachment.filepath, func.max(Attachment.checksum)).group_by(Attachment.filepath).all()
+    moved = missing = 0
+    for ref, checksum in rows:
+        if not is_legacy_ref(ref):
+            continue
+        src = Path(ref)
+        key = checksum or src.name
+        if not move_file(src, key, dry_run):
+            missing += 1
+            print(f"  파일 없음: {ref}")
+            continue
+        for size in settings.THUMBNAIL_SIZES:
+            move_file(Path(thumbnail_ref(ref, size)), thumbnail_ref(key, size), dry_run)
+        if not dry_run:
+            db.query(Attachment).filter(Attachment.filepath == ref).update(
+                {Attachment.filepath: key}, synchronize_session=False
+            )
+            db.commit()
+        moved += 1
+    print(f"첨부파일: {moved}개 이동, {missing}개 파일 없음")
+
+
+def migrate_asset_images(db, dry_run: bool):
+    moved = 0
+    last_id = 0
+    while True:
+        assets = (
+            db.query(Asset.id, Asset.asset_number)
+            .filter(Asset.id > last_id)
+            .order_by(Asset.id)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+        if not assets:
+            break
+        for _, asset_number in assets:
+            if move_file(LEGACY_UPLOAD_DIR / f"{asset_number}.jpg", asset_image_key(asset_number), dry_run):
+                moved += 1
+        last_id = assets[-1][0]
+    print(f"자산 이미지: {moved}개 이동")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드 파일을 저장소 백엔드 위치로 재배치")
+    parser.add_argument("--dry-run", action="store_true", help="옮기지 않고 대상만 집계")
+    args = parser.parse_args()
+
+    print(f"저장소: {type(storage).__name__}{' (dry-run)' if args.dry_run else ''}")
+    if isinstance(storage, ShardedDiskBackend) and not args.dry_run:
+        print(f"샤드 위치 조정: {storage.reshard()}개 이동")
+
+    db = SessionLocal()
+    try:
+        migrate_attachments(db, args.dry_run)
+        migrate_asset_images(db, args.dry_run)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ function Comments({ targetType, targetId }) {
   const [editingId, setEditingId] = useState(null);
   const [editContent, setEditContent] = useState('');
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);  // 다음 페이지 커서
 
   useEffect(() => {
     fetchComments();
@@ -19,6 +20,7 @@ function Comments({ targetType, targetId }) {
     try {
       const response = await axios.get(`${API_BASE_URL}/api/comments/${targetType}/${targetId}`);
       setComments(response.data);
+      setNextCursor(response.headers['x-next-cursor'] || null);
       setLoading(false);
     } catch (error) {
       console.error('Error fetching comments:', error);
@@ -26,6 +28,18 @@ function Comments({ targetType, targetId }) {
     }
   };
 
+  const fetchMoreComments = async () => {
+    try {
+      const response = await axios.get(`${API_BASE_URL}/api/comments/${targetType}/${targetId}`, {
+        params: { cursor: nextCursor }
+      });
+      setComments((prev) => [...prev, ...response.data]);
+      setNextCursor(response.headers['x-next-cursor'] || null);
+    } catch (error) {
+      console.error('Error fetching comments:', error);
+    }
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     
@@ -205,6 +219,15 @@ function Comments({ targetType, targetId }) {
             </div>
           ))
         )}
+
+        {nextCursor && (
+          <button
+            onClick={fetchMoreComments}
+            className="w-full text-sm text-blue-600 hover:text-blue-800 dark:text-blue-400 py-2"
+          >
+            댓글 더 보기
+          </button>
+        )}
       </div>
     </div>
   );
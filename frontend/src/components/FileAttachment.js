@@ -36,29 +36,71 @@ function FileAttachment({ entityType, entityId }) {
     }
   };
 
+  // 이어받기 업로드 (조각 단위 전송, 끊기면 서버가 받은 위치부터 다시 전송)
+  const RESUMABLE_THRESHOLD = 1024 * 1024;
+  const CHUNK_SIZE = 512 * 1024;
+  const MAX_RETRIES = 5;
+
+  const uploadResumable = async (file, headers) => {
+    const { data: session } = await axios.post(
+      `${API_BASE_URL}/api/attachments/uploads`,
+      { entity_type: entityType, entity_id: entityId, filename: file.name, size: file.size },
+      { headers }
+    );
+    const uploadUrl = `${API_BASE_URL}/api/attachments/uploads/${session.upload_id}`;
+
+    let offset = session.offset;
+    let retries = 0;
+    while (offset < file.size) {
+      try {
+        const { data } = await axios.patch(
+          `${uploadUrl}?offset=${offset}`,
+          file.slice(offset, offset + CHUNK_SIZE),
+          { headers: { ...headers, 'Content-Type': 'application/octet-stream' } }
+        );
+        offset = data.offset;
+        retries = 0;
+      } catch (error) {
+        if (error.response && error.response.status !== 409) throw error;
+        if (++retries > MAX_RETRIES) throw error;
+        // 서버가 실제로 받은 위치 확인 후 빠진 부분부터 다시 전송
+        await new Promise((resolve) => setTimeout(resolve, 1000 * retries));
+        const { data } = await axios.get(uploadUrl, { headers });
+        offset = data.offset;
+      }
+    }
+
+    await axios.post(`${uploadUrl}/complete`, null, { headers });
+  };
+
   const handleUpload = async () => {
     if (!selectedFile) {
       alert('파일을 선택해주세요.');
       return;
     }
 
-    const formData = new FormData();
-    formData.append('file', selectedFile);
-
     try {
       setUploading(true);
       const token = localStorage.getItem('token');
+      const headers = { Authorization: `Bearer ${token}` };
       
-      await axios.post(
-        `${API_BASE_URL}/api/attachments?entity_type=${entityType}&entity_id=${entityId}`,
-        formData,
-        {
-          headers: {
-            Authorization: `Bearer ${token}`,
-            'Content-Type': 'multipart/form-data'
+      if (selectedFile.size > RESUMABLE_THRESHOLD) {
+        await uploadResumable(selectedFile, headers);
+      } else {
+        const formData = new FormData();
+        formData.append('file', selectedFile);
+
+        await axios.post(
+          `${API_BASE_URL}/api/attachments?entity_type=${entityType}&entity_id=${entityId}`,
+          formData,
+          {
+            headers: {
+              ...headers,
+              'Content-Type': 'multipart/form-data'
+            }
           }
-        }
-      );
+        );
+      }
 
       alert('파일이 업로드되었습니다.');
       setSelectedFile(null);
@@ -96,6 +138,29 @@ function FileAttachment({ entityType, entityId }) {
     }
   };
 
+  const handleDownloadAll = async () => {
+    try {
+      const token = localStorage.getItem('token');
+      
+      // 서버에서 ZIP으로 묶어 스트리밍
+      const response = await axios.get(
+        `${API_BASE_URL}/api/attachments/zip/${entityType}/${entityId}`,
+        {
+          headers: {
+            Authorization: `Bearer ${token}`
+          },
+          responseType: 'blob'
+        }
+      );
+
+      saveAs(response.data, `${entityType}-${entityId}-attachments.zip`);
+      
+    } catch (error) {
+      console.error('전체 다운로드 실패:', error);
+      alert('전체 다운로드에 실패했습니다.');
+    }
+  };
+
   const handleDelete = async (attachmentId, uploadedBy) => {
     if (!isAdmin && uploadedBy !== user.username) {
       alert('삭제 권한이 없습니다.');
@@ -138,9 +203,19 @@ function FileAttachment({ entityType, entityId }) {
 
   return (
     <div className="bg-white dark:bg-gray-800 rounded-lg shadow p-6">
-      <h3 className="text-lg font-semibold text-gray-800 dark:text-white mb-4">
-        📎 첨부파일 ({attachments.length})
-      </h3>
+      <div className="flex items-center justify-between mb-4">
+        <h3 className="text-lg font-semibold text-gray-800 dark:text-white">
+          📎 첨부파일 ({attachments.length})
+        </h3>
+        {attachments.length > 1 && (
+          <button
+            onClick={handleDownloadAll}
+            className="px-3 py-1 text-sm text-blue-600 hover:text-blue-800 dark:text-blue-400 dark:hover:text-blue-300"
+          >
+            전체 다운로드 (ZIP)
+          </button>
+        )}
+      </div>
 
       {/* 파일 업로드 */}
       <div className="mb-4 p-4 bg-gray-50 dark:bg-gray-700 rounded">
@@ -182,7 +257,16 @@ function FileAttachment({ entityType, entityId }) {
               className="flex items-center justify-between p-3 bg-gray-50 dark:bg-gray-700 rounded hover:bg-gray-100 dark:hover:bg-gray-600"
             >
               <div className="flex items-center gap-3 flex-1">
-                <span className="text-2xl">{getFileIcon(attachment.content_type)}</span>
+                {attachment.content_type?.startsWith('image/') ? (
+                  <img
+                    src={`${API_BASE_URL}/api/attachments/thumbnail/${attachment.id}`}
+                    alt={attachment.filename}
+                    loading="lazy"
+                    className="w-12 h-12 object-cover rounded"
+                  />
+                ) : (
+                  <span className="text-2xl">{getFileIcon(attachment.content_type)}</span>
+                )}
                 <div className="flex-1 min-w-0">
                   <p className="text-sm font-medium text-gray-900 dark:text-white truncate">
                     {attachment.filename}
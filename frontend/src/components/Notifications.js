@@ -13,13 +13,78 @@ function Notifications() {
   const { logout } = useAuth();  // logout 함수 가져오기
   const navigate = useNavigate();
   const intervalRef = useRef(null);  // interval을 저장할 ref
+  const eventSourceRef = useRef(null);  // 실시간 알림 스트림
 
   useEffect(() => {
     fetchUnreadCount();
-    // 30초마다 자동 갱신
-    intervalRef.current = setInterval(fetchUnreadCount, 30000);
+
+    // 실시간 알림 스트림 (SSE) - 연결이 안 되면 30초 폴링으로 대체
+    // URL이 로그에 남으므로 access token 대신 연결할 때마다 짧은 수명의 스트림 토큰을 받아서 사용
+    let eventSource = null;
+    let closed = false;
+    let failures = 0;
+
+    const startPolling = () => {
+      if (!intervalRef.current) {
+        fetchUnreadCount();
+        intervalRef.current = setInterval(fetchUnreadCount, 30000);
+      }
+    };
+
+    const connect = async () => {
+      const token = localStorage.getItem('token');
+      let streamToken;
+      try {
+        const response = await axios.post(
+          `${API_BASE_URL}/api/notifications/stream-token`,
+          null,
+          { headers: { Authorization: `Bearer ${token}` } }
+        );
+        streamToken = response.data.token;
+      } catch (error) {
+        startPolling();
+        return;
+      }
+      if (closed) return;
+
+      eventSource = new EventSource(
+        `${API_BASE_URL}/api/notifications/stream?token=${encodeURIComponent(streamToken)}`
+      );
+      eventSourceRef.current = eventSource;
+      eventSource.addEventListener('open', () => {
+        failures = 0;
+      });
+      eventSource.addEventListener('unread_count', (event) => {
+        setUnreadCount(JSON.parse(event.data).count);
+      });
+      eventSource.addEventListener('resync', () => {
+        fetchUnreadCount();
+      });
+      eventSource.onerror = () => {
+        // 브라우저가 자동 재연결하지 못하고 닫힌 경우 (스트림 토큰 만료 등) 새 토큰으로 재연결, 반복 실패 시 폴링
+        if (eventSource.readyState === EventSource.CLOSED && !closed) {
+          failures += 1;
+          if (failures > 3) {
+            startPolling();
+          } else {
+            setTimeout(connect, 5000 * failures);
+          }
+        }
+      };
+    };
+
+    if (window.EventSource && localStorage.getItem('token')) {
+      connect();
+    } else {
+      // 30초마다 자동 갱신
+      intervalRef.current = setInterval(fetchUnreadCount, 30000);
+    }
     
     return () => {
+      closed = true;
+      if (eventSource) {
+        eventSource.close();
+      }
       if (intervalRef.current) {
         clearInterval(intervalRef.current);
       }
@@ -33,6 +98,10 @@ function Notifications() {
       clearInterval(intervalRef.current);
       intervalRef.current = null;
     }
+    if (eventSourceRef.current) {
+      eventSourceRef.current.close();
+      eventSourceRef.current = null;
+    }
     
     // 로그아웃 처리
     logout();
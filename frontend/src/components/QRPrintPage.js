@@ -13,6 +13,7 @@ function QRPrintPage() {
     location: '전체'
   });
   const [filteredAssets, setFilteredAssets] = useState([]);
+  const [generating, setGenerating] = useState(false);
   
   // 페이지네이션
   const [currentPage, setCurrentPage] = useState(1);
@@ -100,6 +101,57 @@ function QRPrintPage() {
     }, 1000);
   };
 
+  // 선택한 자산으로 서버에서 파일을 만들어 내려받기 (라벨 시트 PDF, QR 파일 ZIP)
+  const downloadGenerated = async (path, body, filename) => {
+    if (selectedAssets.length === 0) {
+      alert('자산을 선택해주세요.');
+      return;
+    }
+
+    setGenerating(true);
+    try {
+      const token = localStorage.getItem('token');
+      const response = await axios.post(`${API_BASE_URL}${path}`, body, {
+        headers: { Authorization: `Bearer ${token}` },
+        responseType: 'blob'
+      });
+
+      const url = window.URL.createObjectURL(new Blob([response.data]));
+      const link = document.createElement('a');
+      link.href = url;
+      link.setAttribute('download', filename);
+      document.body.appendChild(link);
+      link.click();
+      link.remove();
+      window.URL.revokeObjectURL(url);
+    } catch (error) {
+      console.error('파일 생성 실패:', error);
+      alert('파일 생성에 실패했습니다.');
+    } finally {
+      setGenerating(false);
+    }
+  };
+
+  const handleDownloadLabels = () => {
+    const assetNumbers = assets
+      .filter(asset => selectedAssets.includes(asset.id))
+      .map(asset => asset.asset_number);
+    downloadGenerated(
+      '/api/qr/labels',
+      { asset_numbers: assetNumbers, format: 'pdf' },
+      `QR_labels_${assetNumbers.length}.pdf`
+    );
+  };
+
+  // 외부 라벨 프린터용: 자산별 SVG 파일 묶음
+  const handleDownloadSvgZip = () => {
+    downloadGenerated(
+      '/api/qr/export',
+      { ids: selectedAssets, format: 'svg' },
+      `QR_svg_${selectedAssets.length}.zip`
+    );
+  };
+
   const handleItemsPerPageChange = (newSize) => {
     setItemsPerPage(newSize);
     setCurrentPage(1);
@@ -126,13 +178,29 @@ function QRPrintPage() {
           <h2 className="text-2xl font-semibold text-gray-800 dark:text-white">
             QR 코드 일괄 인쇄
           </h2>
-          <button
-            onClick={handlePrintPreview}
-            disabled={selectedAssets.length === 0}
-            className="bg-blue-500 hover:bg-blue-600 text-white px-6 py-2 rounded disabled:opacity-50 disabled:cursor-not-allowed"
-          >
-            🖨️ 인쇄 미리보기 ({selectedAssets.length}개)
-          </button>
+          <div className="flex gap-2">
+            <button
+              onClick={handleDownloadSvgZip}
+              disabled={selectedAssets.length === 0 || generating}
+              className="bg-gray-500 hover:bg-gray-600 text-white px-6 py-2 rounded disabled:opacity-50 disabled:cursor-not-allowed"
+            >
+              🗜️ SVG 파일 (ZIP)
+            </button>
+            <button
+              onClick={handleDownloadLabels}
+              disabled={selectedAssets.length === 0 || generating}
+              className="bg-green-500 hover:bg-green-600 text-white px-6 py-2 rounded disabled:opacity-50 disabled:cursor-not-allowed"
+            >
+              {generating ? '생성 중...' : `📄 라벨 시트 PDF (${selectedAssets.length}개)`}
+            </button>
+            <button
+              onClick={handlePrintPreview}
+              disabled={selectedAssets.length === 0}
+              className="bg-blue-500 hover:bg-blue-600 text-white px-6 py-2 rounded disabled:opacity-50 disabled:cursor-not-allowed"
+            >
+              🖨️ 인쇄 미리보기 ({selectedAssets.length}개)
+            </button>
+          </div>
         </div>
 
         {/* 필터 */}